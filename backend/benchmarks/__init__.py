@@ -0,0 +1 @@
+# Pacote benchmarks 
\ No newline at end of file
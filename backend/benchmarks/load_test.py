@@ -0,0 +1,483 @@
+"""
+Teste de carga da API de tarefas
+Sobe o run_server em um subprocesso, popula N tarefas e dispara uma mistura
+configurável dos endpoints, em concorrência fixa (closed loop) ou em taxa de
+chegada fixa (open loop). Mede vazão e latências p50/p95/p99/p999 e grava o
+resultado em JSON para comparar commits.
+
+Uso (a partir de backend/):
+    python -m benchmarks.load_test --tasks 10000 --concurrency 32 --duration 30
+    python -m benchmarks.load_test --rate 500 --mix list=50,get=50 --output atual.json
+    python -m benchmarks.load_test --compare base.json --output atual.json
+
+O servidor usa o banco do .env; aponte para um banco local de testes com
+--env DB_NAME=agenda_bench (ou qualquer outra variável). Com --url o servidor
+não é iniciado e o teste roda contra a instância informada.
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import math
+import os
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_MIX = 'list=40,get=30,create=10,update=10,complete=5,delete=5'
+OPERATIONS = ('list', 'get', 'create', 'update', 'complete', 'delete')
+PERCENTILES = (50, 95, 99, 99.9)
+SEED_BATCH = 1000
+
+
+def parse_mix(value):
+    """
+    Converte 'list=40,get=30' em pesos por operação
+    """
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Operação desconhecida: {name}")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError('A mistura precisa de ao menos um peso positivo')
+    return mix
+
+
+def percentile(sorted_values, pct):
+    """
+    Percentil pelo método nearest-rank sobre valores já ordenados
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class ServerProcess:
+    """
+    run_server em um subprocesso, encerrado com SIGINT (drenagem normal)
+    """
+
+    def __init__(self, port, engine=None, workers=None, env=None):
+        self.port = port
+        self.engine = engine
+        self.workers = workers
+        self.env = env or {}
+        self.process = None
+
+    def start(self, timeout=30):
+        arguments = [f'{self.port}']
+        if self.workers is not None:
+            arguments.append(f'workers={self.workers}')
+        if self.engine:
+            arguments.append(f'engine={self.engine!r}')
+        code = f"import server; server.run_server({', '.join(arguments)})"
+
+        self.process = subprocess.Popen(
+            [sys.executable, '-c', code], cwd=BACKEND_DIR,
+            env=dict(os.environ, **self.env),
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError('Servidor encerrou na inicialização:\n'
+                                   + self.process.stderr.read().decode('utf-8', 'replace'))
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=1)
+                connection.request('GET', '/health')
+                if connection.getresponse().status == 200:
+                    connection.close()
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f'Servidor não respondeu em {timeout}s')
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.send_signal(signal.SIGINT)
+            try:
+                self.process.wait(30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class Client:
+    """
+    Cliente HTTP/1.1 com keep-alive, um por thread de carga
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.connection = None
+
+    def request(self, method, path, body=None):
+        """
+        Returns:
+            tuple: (status, corpo em bytes); status 0 em erro de conexão
+        """
+        headers = {'Accept-Encoding': 'gzip'}
+        if body is not None:
+            body = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            try:
+                self.connection.request(method, path, body, headers)
+                response = self.connection.getresponse()
+                data = response.read()
+                if response.getheader('Content-Encoding') == 'gzip':
+                    data = gzip.decompress(data)
+                if response.will_close:
+                    self.close()
+                return response.status, data
+            except (OSError, http.client.HTTPException):
+                # Conexão keep-alive fechada pelo servidor: tenta uma vez em outra
+                self.close()
+        return 0, b''
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+
+class Workload:
+    """
+    Escolhe a próxima operação e mantém os IDs usados por cada uma
+
+    Leituras e alterações usam as tarefas populadas; as remoções consomem uma
+    reserva separada (mais as tarefas criadas durante o teste), para que um
+    GET nunca caia em uma tarefa já removida.
+    """
+
+    def __init__(self, mix, task_ids, deletable_ids):
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.task_ids = task_ids
+        self.deletable = deque(deletable_ids)
+        self._lock = threading.Lock()
+
+    def next_operation(self, rng):
+        return rng.choices(self.operations, self.weights)[0]
+
+    def execute(self, client, operation, rng):
+        if operation == 'list':
+            return client.request('GET', f'/tasks?limit={rng.choice((20, 50, 100))}')
+        if operation == 'get':
+            return client.request('GET', f'/tasks/{rng.choice(self.task_ids)}')
+        if operation == 'create':
+            status, body = client.request('POST', '/tasks', {
+                'title': f'Carga {rng.random():.6f}', 'description': 'Criada pelo teste de carga'
+            })
+            if status == 201:
+                with self._lock:
+                    self.deletable.append(json.loads(body)['data']['id'])
+            return status, body
+        if operation == 'update':
+            return client.request('PUT', f'/tasks/{rng.choice(self.task_ids)}', {
+                'title': f'Atualizada {rng.random():.6f}', 'status': 'pendente'
+            })
+        if operation == 'complete':
+            return client.request('PATCH', f'/tasks/{rng.choice(self.task_ids)}/complete')
+        with self._lock:
+            task_id = self.deletable.popleft() if self.deletable else None
+        if task_id is None:
+            # Reserva esgotada: cria uma tarefa para então removê-la
+            status, body = client.request('POST', '/tasks', {'title': 'Carga para remoção'})
+            if status != 201:
+                return status, body
+            task_id = json.loads(body)['data']['id']
+        return client.request('DELETE', f'/tasks/{task_id}')
+
+
+class Recorder:
+    """
+    Latências e status por operação
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    def record(self, operation, status, seconds):
+        if not self.recording:
+            return
+        with self._lock:
+            self.latencies[operation].append(seconds)
+            self.statuses[operation][status] += 1
+
+    def summary(self, elapsed):
+        """
+        Returns:
+            dict: Vazão, erros e percentis (ms) no total e por operação
+        """
+        def describe(latencies, statuses):
+            values = sorted(latencies)
+            errors = sum(count for status, count in statuses.items()
+                         if not (200 <= status < 300 or status == 304))
+            result = {
+                'requests': len(values),
+                'errors': errors,
+                'throughput_rps': len(values) / elapsed if elapsed else 0.0,
+                'statuses': {str(status): count for status, count in sorted(statuses.items())},
+                'mean_ms': sum(values) * 1000 / len(values) if values else 0.0,
+                'max_ms': values[-1] * 1000 if values else 0.0
+            }
+            for pct in PERCENTILES:
+                result[f'p{pct:g}'.replace('.', '') + '_ms'] = percentile(values, pct) * 1000
+            return result
+
+        all_latencies = []
+        all_statuses = defaultdict(int)
+        for operation, values in self.latencies.items():
+            all_latencies.extend(values)
+            for status, count in self.statuses[operation].items():
+                all_statuses[status] += count
+
+        return {
+            'total': describe(all_latencies, all_statuses),
+            'operations': {
+                operation: describe(self.latencies[operation], self.statuses[operation])
+                for operation in sorted(self.latencies)
+            }
+        }
+
+
+def seed(client, count):
+    """
+    Cria `count` tarefas pelo endpoint de criação em lote
+
+    Returns:
+        list: IDs criados
+    """
+    ids = []
+    for start in range(0, count, SEED_BATCH):
+        tasks = [{
+            'title': f'Tarefa {index}',
+            'description': f'Tarefa populada para o teste de carga #{index}',
+            'status': 'pendente' if index % 4 else 'concluída',
+            'due_date': f'2030-01-{index % 28 + 1:02d}T12:00:00'
+        } for index in range(start, min(start + SEED_BATCH, count))]
+        status, body = client.request('POST', '/tasks/bulk', tasks)
+        if status != 201:
+            raise RuntimeError(f'Falha ao popular tarefas ({status}): {body[:200]!r}')
+        ids.extend(item['data']['id'] for item in json.loads(body)['data']['results'])
+    return ids
+
+
+def run_closed_loop(host, port, workload, recorder, concurrency, stop_at, seed_value):
+    """
+    `concurrency` clientes, cada um enviando a próxima requisição assim que
+    recebe a resposta anterior
+    """
+    def worker(index):
+        rng = random.Random(seed_value + index)
+        client = Client(host, port)
+        while time.monotonic() < stop_at:
+            operation = workload.next_operation(rng)
+            started = time.perf_counter()
+            status, _ = workload.execute(client, operation, rng)
+            recorder.record(operation, status, time.perf_counter() - started)
+        client.close()
+
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True)
+               for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_open_loop(host, port, workload, recorder, rate, concurrency, stop_at, seed_value):
+    """
+    Chegadas de Poisson a `rate` requisições/s, independentes das respostas
+
+    A latência é medida a partir do instante agendado, não do envio: se o
+    servidor atrasar, a espera na fila entra na medida (sem omissão coordenada).
+    """
+    schedule = deque()
+    available = threading.Condition()
+    finished = threading.Event()
+
+    def scheduler():
+        rng = random.Random(seed_value)
+        next_at = time.perf_counter()
+        deadline = next_at + max(0.0, stop_at - time.monotonic())
+        while next_at < deadline:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            with available:
+                schedule.append((next_at, workload.next_operation(rng)))
+                available.notify()
+            next_at += rng.expovariate(rate)
+        finished.set()
+        with available:
+            available.notify_all()
+
+    def worker(index):
+        rng = random.Random(seed_value + index + 1)
+        client = Client(host, port)
+        while True:
+            with available:
+                while not schedule and not finished.is_set():
+                    available.wait()
+                if not schedule:
+                    break
+                scheduled_at, operation = schedule.popleft()
+            status, _ = workload.execute(client, operation, rng)
+            recorder.record(operation, status, time.perf_counter() - scheduled_at)
+        client.close()
+
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True)
+               for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    scheduler()
+    for thread in threads:
+        thread.join()
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path):
+    """
+    Mostra a variação de vazão e percentis em relação a um resultado anterior
+    """
+    baseline = json.loads(Path(baseline_path).read_text(encoding='utf-8'))
+    print(f"\nComparação com {baseline_path} (commit {baseline.get('commit')}):")
+    for key in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'p999_ms'):
+        before = baseline['results']['total'].get(key, 0.0)
+        after = current['results']['total'][key]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"  {key:<15} {before:10.2f} → {after:10.2f}  ({change:+.1f}%)")
+
+
+def print_summary(results):
+    header = f"{'operação':<10} {'req':>8} {'erros':>6} {'req/s':>9} " + ' '.join(
+        f"{'p' + format(pct, 'g'):>8}" for pct in PERCENTILES) + '  (ms)'
+    print(header)
+    rows = list(results['operations'].items()) + [('total', results['total'])]
+    for name, data in rows:
+        print(f"{name:<10} {data['requests']:>8} {data['errors']:>6} {data['throughput_rps']:>9.1f} "
+              + ' '.join(f"{data[f'p{pct:g}'.replace('.', '') + '_ms']:>8.2f}" for pct in PERCENTILES))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Teste de carga da API de tarefas')
+    parser.add_argument('--tasks', type=int, default=10000, help='Tarefas populadas antes do teste')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'Pesos por operação ({DEFAULT_MIX})')
+    parser.add_argument('--concurrency', type=int, default=16,
+                        help='Clientes simultâneos (no open loop, máximo em andamento)')
+    parser.add_argument('--rate', type=float, help='Requisições/s em open loop (padrão: closed loop)')
+    parser.add_argument('--duration', type=float, default=30, help='Segundos medidos')
+    parser.add_argument('--warmup', type=float, default=5, help='Segundos de aquecimento, descartados')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--engine', choices=('threads', 'asyncio'), help='Motor do servidor')
+    parser.add_argument('--workers', type=int, help='Workers do servidor')
+    parser.add_argument('--env', action='append', default=[], metavar='CHAVE=VALOR',
+                        help='Variável de ambiente do servidor (repetível)')
+    parser.add_argument('--url', help='Usa um servidor já em execução em vez de iniciar um')
+    parser.add_argument('--seed', type=int, default=1, help='Semente dos geradores aleatórios')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado')
+    parser.add_argument('--compare', help='Resultado JSON anterior para comparação')
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', args.port
+        env = dict(item.split('=', 1) for item in args.env)
+        server = ServerProcess(port, args.engine, args.workers, env)
+        server.start()
+
+    try:
+        client = Client(host, port)
+        print(f"Populando {args.tasks} tarefas...")
+        ids = seed(client, args.tasks)
+        client.close()
+        # 10% das tarefas ficam reservadas para as remoções
+        reserved = max(1, len(ids) // 10) if 'delete' in args.mix else 0
+        workload = Workload(args.mix, ids[reserved:] or ids, ids[:reserved])
+
+        recorder = Recorder()
+        mode = f'open loop a {args.rate:g} req/s' if args.rate else f'closed loop com {args.concurrency} clientes'
+        print(f"Executando {mode}: {args.warmup:g}s de aquecimento + {args.duration:g}s medidos")
+
+        def start_recording():
+            recorder.recording = True
+            start_recording.started = time.monotonic()
+
+        timer = threading.Timer(args.warmup, start_recording)
+        timer.start()
+        stop_at = time.monotonic() + args.warmup + args.duration
+        if args.rate:
+            run_open_loop(host, port, workload, recorder, args.rate, args.concurrency, stop_at, args.seed)
+        else:
+            run_closed_loop(host, port, workload, recorder, args.concurrency, stop_at, args.seed)
+        timer.cancel()
+        elapsed = time.monotonic() - getattr(start_recording, 'started', time.monotonic())
+    finally:
+        if server:
+            server.stop()
+
+    results = recorder.summary(elapsed)
+    print_summary(results)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'config': {
+            'tasks': args.tasks,
+            'mix': args.mix,
+            'mode': 'open' if args.rate else 'closed',
+            'rate': args.rate,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'engine': args.engine,
+            'workers': args.workers,
+            'url': args.url
+        },
+        'elapsed_seconds': elapsed,
+        'results': results
+    }
+    if args.compare:
+        compare(report, args.compare)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\nResultado gravado em {args.output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
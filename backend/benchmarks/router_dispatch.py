@@ -0,0 +1,103 @@
+"""
+Micro-benchmark do custo de roteamento por requisição
+Compara a cadeia antiga (urlparse + re.match a cada requisição) com o Router
+
+Uso (a partir de backend/):
+    python -m benchmarks.router_dispatch [iterações]
+"""
+
+import re
+import sys
+import timeit
+from urllib.parse import urlparse
+from serving.router import Router, timing_middleware
+
+REQUESTS = [
+    ('GET', '/tasks'),
+    ('GET', '/tasks/12345'),
+    ('PUT', '/tasks/12345'),
+    ('PATCH', '/tasks/12345/complete'),
+    ('PATCH', '/tasks/bulk/complete'),
+    ('DELETE', '/tasks/bulk'),
+    ('DELETE', '/tasks/12345'),
+    ('GET', '/nao/existe')
+]
+
+
+def _handler(request, **params):
+    return 200, '', {}
+
+
+def _error(status_code, message):
+    return status_code, message, {}
+
+
+def build_router(middleware=()):
+    router = Router(_error)
+    for method, pattern in [
+        ('GET', '/favicon.ico'), ('GET', '/health'), ('GET', '/tasks'),
+        ('GET', '/tasks/<int:task_id>'), ('POST', '/tasks'), ('POST', '/tasks/bulk'),
+        ('PUT', '/tasks/<int:task_id>'), ('PATCH', '/tasks/<int:task_id>/complete'),
+        ('PATCH', '/tasks/bulk/complete'), ('DELETE', '/tasks/<int:task_id>'),
+        ('DELETE', '/tasks/bulk')
+    ]:
+        router.add(method, pattern, _handler)
+    for item in middleware:
+        router.use(item)
+    return router
+
+
+def legacy_dispatch(method, target):
+    """
+    Reproduz os ramos dos antigos do_GET/do_PUT/do_PATCH/do_DELETE
+    """
+    path = urlparse(target).path
+    if method == 'GET':
+        if path in ('/favicon.ico', '/health', '/tasks'):
+            return 200
+        if re.match(r'^/tasks/(\d+)$', path):
+            return 200
+    elif method == 'PUT':
+        if re.match(r'^/tasks/(\d+)$', target):
+            return 200
+    elif method == 'PATCH':
+        if path == '/tasks/bulk/complete':
+            return 200
+        if re.match(r'^/tasks/(\d+)/complete$', target):
+            return 200
+    elif method == 'DELETE':
+        if path == '/tasks/bulk':
+            return 200
+        if re.match(r'^/tasks/(\d+)$', target):
+            return 200
+    return 404
+
+
+class _Request:
+    __slots__ = ('method', 'path', 'route', 'params')
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+
+
+def _measure(label, function, iterations):
+    seconds = timeit.timeit(function, number=iterations)
+    per_request = seconds / (iterations * len(REQUESTS)) * 1e9
+    print(f"{label:<32} {per_request:8.0f} ns/requisição")
+
+
+def main(iterations=20000):
+    router = build_router()
+    timed_router = build_router([timing_middleware])
+    requests = [_Request(method, path) for method, path in REQUESTS]
+
+    print(f"{len(REQUESTS)} rotas x {iterations} iterações")
+    _measure('re.match por requisição', lambda: [legacy_dispatch(m, p) for m, p in REQUESTS], iterations)
+    _measure('Router.resolve', lambda: [router.resolve(m, p) for m, p in REQUESTS], iterations)
+    _measure('Router.dispatch', lambda: [router.dispatch(r) for r in requests], iterations)
+    _measure('Router.dispatch + timing', lambda: [timed_router.dispatch(r) for r in requests], iterations)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,141 @@
+"""
+Benchmark da serialização da listagem de tarefas
+Compara o caminho antigo (linha dict → Task.from_dict → to_dict → json.dumps)
+com as linhas em tupla escritas direto em bytes (biblioteca padrão e orjson)
+
+Uso (a partir de backend/):
+    python -m benchmarks.task_serialization [linhas ...]
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from models import serializers
+from models.serializers import TASK_COLUMNS, encode_task_rows
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+class _DictTask:
+    """
+    Tarefa com __dict__ por instância, como antes do __slots__
+    """
+
+    def __init__(self, id=None, title="", description="", status="pendente",
+                 created_at=None, due_date=None, updated_at=None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.status = status
+        self.created_at = created_at or datetime.now()
+        self.due_date = due_date
+        self.updated_at = updated_at
+
+
+class _SlottedTask:
+    """
+    Mesma tarefa com __slots__, como models.task.Task
+    """
+    __slots__ = TASK_COLUMNS
+    __init__ = _DictTask.__init__
+
+
+def _legacy_from_dict(data):
+    created_at = due_date = updated_at = None
+    if data.get('created_at'):
+        created_at = (datetime.fromisoformat(data['created_at'].replace('Z', '+00:00'))
+                      if isinstance(data['created_at'], str) else data['created_at'])
+    if data.get('due_date'):
+        due_date = (datetime.fromisoformat(data['due_date'].replace('Z', '+00:00'))
+                    if isinstance(data['due_date'], str) else data['due_date'])
+    if data.get('updated_at'):
+        updated_at = (datetime.fromisoformat(data['updated_at'].replace('Z', '+00:00'))
+                      if isinstance(data['updated_at'], str) else data['updated_at'])
+    return _DictTask(data.get('id'), data.get('title', ''), data.get('description', ''),
+                     data.get('status', 'pendente'), created_at, due_date, updated_at)
+
+
+def _legacy_to_dict(task):
+    return {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description,
+        'status': task.status,
+        'created_at': task.created_at.isoformat() if task.created_at else None,
+        'due_date': task.due_date.isoformat() if task.due_date else None,
+        'updated_at': task.updated_at.isoformat() if task.updated_at else None
+    }
+
+
+def make_rows(count):
+    base = datetime(2024, 1, 1, 9, 30)
+    return [
+        (index, f'Tarefa número {index}', f'Descrição da tarefa {index} com acentuação',
+         'pendente' if index % 3 else 'concluída', base + timedelta(seconds=index),
+         base + timedelta(days=index % 30) if index % 2 else None, base + timedelta(seconds=index))
+        for index in range(1, count + 1)
+    ]
+
+
+def legacy(dict_rows):
+    tasks = [_legacy_from_dict(row) for row in dict_rows]
+    return json.dumps([_legacy_to_dict(task) for task in tasks], ensure_ascii=False).encode('utf-8')
+
+
+def tuple_stdlib(rows):
+    return b'[' + serializers._encode_stdlib(rows, ',') + b']'
+
+
+def tuple_orjson(rows):
+    return b'[' + encode_task_rows(rows) + b']'
+
+
+def _timed(function, argument):
+    gc.collect()
+    started = time.perf_counter()
+    output = function(argument)
+    return time.perf_counter() - started, output
+
+
+def _object_memory(task_class, rows):
+    gc.collect()
+    tracemalloc.start()
+    objects = [task_class(*row) for row in rows]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / len(rows)
+
+
+def main(sizes=DEFAULT_SIZES):
+    print(f"orjson: {'disponível' if serializers.orjson else 'não instalado'}")
+    sample = make_rows(10_000)
+    print(f"Memória por tarefa: __dict__ {_object_memory(_DictTask, sample):.0f} B | "
+          f"__slots__ {_object_memory(_SlottedTask, sample):.0f} B")
+
+    print(f"{'linhas':>10} {'antes':>10} {'tupla+stdlib':>14} {'tupla+orjson':>14}")
+    for count in sizes:
+        rows = make_rows(count)
+        dict_rows = [dict(zip(TASK_COLUMNS, row)) for row in rows]
+
+        before, expected = _timed(legacy, dict_rows)
+        del dict_rows
+        stdlib, output = _timed(tuple_stdlib, rows)
+        assert json.loads(output) == json.loads(expected)
+        if serializers.orjson:
+            fast, fast_output = _timed(tuple_orjson, rows)
+            # Os dois caminhos produzem exatamente os mesmos bytes
+            assert fast_output == output
+            fast_label = f'{fast:13.3f}s'
+            del fast_output
+        else:
+            fast_label = f'{"-":>14}'
+        del expected, output
+        print(f"{count:>10} {before:9.3f}s {stdlib:13.3f}s {fast_label}")
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1 @@
+# Pacote cache 
\ No newline at end of file
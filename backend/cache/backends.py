@@ -0,0 +1,159 @@
+"""
+Backends de armazenamento do cache
+Definem a interface comum e a implementação em memória do processo
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+
+class CacheBackend:
+    """
+    Interface dos backends de cache
+
+    Implementações que compartilham dados entre processos (ex.: Redis) devem
+    seguir os mesmos métodos; valores são tratados como imutáveis.
+    """
+
+    def get(self, key):
+        """
+        Returns:
+            tuple: (encontrado, valor)
+        """
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def incr(self, key):
+        """
+        Incrementa um contador que nunca expira nem é despejado
+
+        Returns:
+            int: Novo valor do contador
+        """
+        raise NotImplementedError
+
+    def get_counter(self, key):
+        """
+        Returns:
+            int: Valor atual do contador (0 se nunca incrementado)
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self):
+        """
+        Returns:
+            dict: Ocupação e contadores do backend
+        """
+        raise NotImplementedError
+
+
+def estimate_size(value):
+    """
+    Estimativa barata, em bytes, da memória ocupada por um valor em cache
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return 8
+    if isinstance(value, str):
+        return 49 + len(value)
+    if isinstance(value, (datetime, date)):
+        return 48
+    if isinstance(value, dict):
+        return 64 + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(estimate_size(item) for item in value)
+    return 64
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    Cache em memória com expiração por TTL e despejo LRU
+
+    O tamanho é limitado tanto pelo número de entradas quanto por uma
+    estimativa da memória ocupada; ao passar de qualquer limite as entradas
+    usadas há mais tempo são removidas.
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=50 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+
+            value, expires_at, size = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self._expirations += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        size = estimate_size(key) + estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+
+            self._entries[key] = (value, time.monotonic() + ttl, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def incr(self, key):
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    def get_counter(self, key):
+        return self._counters.get(key, 0)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self._evictions,
+                'expirations': self._expirations
+            }
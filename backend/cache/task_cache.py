@@ -0,0 +1,156 @@
+"""
+Cache de leitura das tarefas
+Guarda tarefas individuais e páginas da listagem, invalidadas pelas escritas
+"""
+
+import os
+import threading
+from cache.backends import LRUCacheBackend
+from config import load_env_file
+
+
+def get_cache_config():
+    load_env_file()
+
+    return {
+        'enabled': os.getenv('CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes'),
+        'ttl': float(os.getenv('CACHE_TTL', '60')),
+        'max_entries': int(os.getenv('CACHE_MAX_ENTRIES', '10000')),
+        'max_bytes': int(os.getenv('CACHE_MAX_BYTES', str(50 * 1024 * 1024)))
+    }
+
+
+class TaskCache:
+    """
+    Cache read-through de tarefas sobre um CacheBackend
+
+    Tarefas são guardadas pela chave do ID e invalidadas individualmente.
+    Páginas da listagem ficam sob uma geração que é incrementada a cada
+    escrita, tornando todas as páginas anteriores inacessíveis de uma vez.
+    """
+
+    _GENERATION_KEY = 'tasks:lists:generation'
+
+    def __init__(self, backend, ttl=60, enabled=True):
+        """
+        Args:
+            backend (CacheBackend): Onde as entradas são armazenadas
+            ttl (float): Segundos de validade de cada entrada
+            enabled (bool): Quando False, toda leitura vai ao banco
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        # Incrementado a cada escrita; uma leitura do banco iniciada antes de
+        # uma escrita concorrente não é guardada, evitando repor dado antigo
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            'task_hits': 0,
+            'task_misses': 0,
+            'page_hits': 0,
+            'page_misses': 0,
+            'invalidations': 0
+        }
+
+    @classmethod
+    def from_env(cls):
+        config = get_cache_config()
+        backend = LRUCacheBackend(config['max_entries'], config['max_bytes'])
+        return cls(backend, ttl=config['ttl'], enabled=config['enabled'])
+
+    def read_token(self):
+        """
+        Marca o início de uma leitura no banco, para uso em set_task/set_page
+        """
+        return self._writes
+
+    def get_task(self, task_id):
+        """
+        Returns:
+            tuple: Linha da tarefa em cache (ordem de TASK_COLUMNS) ou None
+        """
+        if not self.enabled:
+            return None
+        found, row = self.backend.get(f'tasks:id:{task_id}')
+        self._count('task_hits' if found else 'task_misses')
+        return row
+
+    def set_task(self, task_id, row, token):
+        if not self.enabled:
+            return
+        with self._lock:
+            if token == self._writes:
+                self.backend.set(f'tasks:id:{task_id}', row, self.ttl)
+
+    def get_page(self, page_key):
+        """
+        Args:
+            page_key (tuple): Parâmetros que identificam a página
+        Returns:
+            list: Linhas da página em cache (até limit + 1, a última só indica
+                se há mais páginas) ou None
+        """
+        if not self.enabled:
+            return None
+        found, page = self.backend.get(self._page_key(page_key))
+        self._count('page_hits' if found else 'page_misses')
+        return page
+
+    def set_page(self, page_key, page, token):
+        if not self.enabled:
+            return
+        with self._lock:
+            if token == self._writes:
+                self.backend.set(self._page_key(page_key), page, self.ttl)
+
+    def invalidate_task(self, task_id):
+        """
+        Remove a tarefa do cache e invalida todas as páginas da listagem
+        """
+        with self._lock:
+            self._writes += 1
+            self._counters['invalidations'] += 1
+            if self.enabled:
+                self.backend.delete(f'tasks:id:{task_id}')
+                self.backend.incr(self._GENERATION_KEY)
+
+    def invalidate_tasks(self, task_ids):
+        """
+        Remove várias tarefas do cache, invalidando as páginas uma única vez
+        """
+        with self._lock:
+            self._writes += 1
+            self._counters['invalidations'] += 1
+            if self.enabled:
+                for task_id in task_ids:
+                    self.backend.delete(f'tasks:id:{task_id}')
+                self.backend.incr(self._GENERATION_KEY)
+
+    def clear(self):
+        with self._lock:
+            self._writes += 1
+            self.backend.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Acertos, falhas e ocupação do backend
+        """
+        with self._lock:
+            snapshot = dict(self._counters)
+        snapshot['enabled'] = self.enabled
+        snapshot['ttl'] = self.ttl
+        snapshot['backend'] = self.backend.stats()
+        return snapshot
+
+    def _page_key(self, page_key):
+        generation = self.backend.get_counter(self._GENERATION_KEY)
+        return 'tasks:page:{}:{}'.format(generation, ':'.join(map(str, page_key)))
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+
+task_cache = TaskCache.from_env()
@@ -0,0 +1,79 @@
+"""
+Configuração da aplicação
+Carrega as variáveis do arquivo .env para o ambiente do processo
+"""
+
+import os
+import threading
+from pathlib import Path
+
+ENV_PATH = Path(__file__).parent / '.env'
+
+_lock = threading.Lock()
+_loaded = False
+_reload_hooks = []
+
+
+def _read_env_file():
+    values = {}
+    if ENV_PATH.exists():
+        with open(ENV_PATH, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if '\x00' in line: # ignora linhas com caractere nulo
+                    continue
+                # Ignora linhas vazias, comentários ou mal formatadas
+                if not line or line.startswith('#') or '=' not in line:
+                    continue
+                key, value = line.split('=', 1)
+                values[key] = value
+    return values
+
+
+def load_env_file():
+    """
+    Aplica o .env ao ambiente do processo
+
+    O arquivo só é lido na primeira chamada; as seguintes não tocam o disco.
+    Para reler depois de editá-lo, use reload_env_file().
+    """
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            os.environ.update(_read_env_file())
+            _loaded = True
+
+
+def reload_env_file():
+    """
+    Relê o .env, aplica ao ambiente e avisa os ganchos de on_reload
+
+    As configurações lidas só na inicialização (workers, backend, pool...)
+    continuam valendo até reiniciar o processo.
+
+    Returns:
+        dict: Variáveis cujo valor mudou
+    """
+    global _loaded
+    with _lock:
+        values = _read_env_file()
+        changed = {key: value for key, value in values.items() if os.environ.get(key) != value}
+        os.environ.update(values)
+        _loaded = True
+        hooks = list(_reload_hooks)
+    for hook in hooks:
+        hook(changed)
+    return changed
+
+
+def on_reload(hook):
+    """
+    Registra hook(changed), chamado após cada reload_env_file()
+
+    O gancho não deve levantar exceção: os seguintes deixariam de ser chamados.
+    """
+    with _lock:
+        _reload_hooks.append(hook)
+    return hook
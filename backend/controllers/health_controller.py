@@ -0,0 +1,34 @@
+import json
+from cache.task_cache import task_cache
+from models.change_feed import change_feed
+from reminders.scheduler import reminder_scheduler
+from serving.compression import response_compressor
+from storage.task_store import task_store
+from observability.log import logger
+
+class HealthController:
+    @staticmethod
+    def get_health():
+        """
+        Retorna o estado do servidor, do armazenamento, do cache, da compressão,
+        do log, do registro de alterações e dos lembretes
+        Returns:
+            tuple: (status_code, response_body, headers)
+        """
+        response = {
+            'success': True,
+            'data': {
+                # No MySQL inclui o pool de conexões e as queries por formato
+                'storage': task_store.stats(),
+                'task_cache': task_cache.stats(),
+                'compression': response_compressor.stats.snapshot(),
+                'logging': logger.stats(),
+                'changes': change_feed.stats(),
+                'reminders': reminder_scheduler.stats()
+            },
+            'message': 'Servidor em funcionamento'
+        }
+        
+        return 200, json.dumps(response, ensure_ascii=False), {
+            'Content-Type': 'application/json'
+        }
@@ -1,41 +1,580 @@
+import base64
+import hashlib
+import itertools
 import json
-from datetime import datetime
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from models.change_feed import change_feed
 from models.task import Task
+from models.serializers import dumps, encode_task_rows, encode_tasks
+from observability.metrics import span
+
+VALID_STATUSES = ('pendente', 'concluída')
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 500
+BULK_MAX_ITEMS = 5000
+SEARCH_MAX_QUERY_LENGTH = 200
+# Relevância não permite cursor por chave: páginas profundas custam caro e são limitadas
+SEARCH_MAX_OFFSET = 10000
+# Long-polling e Server-Sent Events de GET /tasks/changes
+CHANGES_MAX_WAIT = 30
+CHANGES_STREAM_SECONDS = 300
+CHANGES_HEARTBEAT_SECONDS = 15
+CHANGES_RETRY_MS = 1000
+CHANGES_BUSY_RETRY_MS = 5000
 
 class TaskController:
     @staticmethod
-    def get_all_tasks():
+    def _encode_cursor(task):
+        """
+        Gera o cursor opaco que aponta para depois da tarefa informada
+        """
+        raw = json.dumps([task.created_at.isoformat(), task.id])
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def _decode_cursor(cursor):
+        """
+        Returns:
+            tuple: (created_at, id) codificados no cursor
+        Raises:
+            ValueError: Se o cursor estiver malformado
+        """
+        padded = cursor + '=' * (-len(cursor) % 4)
+        try:
+            created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), int(task_id)
+        except (TypeError, ValueError, json.JSONDecodeError) as e:
+            raise ValueError('Cursor inválido') from e
+    
+    @staticmethod
+    def _etag_matches(if_none_match, etag):
+        """
+        Compara o header If-None-Match com a ETag atual (aceita lista e '*')
+        """
+        if not if_none_match or not etag:
+            return False
+        candidates = [value.strip() for value in if_none_match.split(',')]
+        return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+    
+    @staticmethod
+    def _cache_headers(etag, last_modified):
+        """
+        Headers de validação: o cliente pode guardar a resposta, mas precisa
+        revalidá-la (If-None-Match) antes de reutilizá-la
+        """
+        headers = {'Cache-Control': 'private, no-cache'}
+        if etag:
+            headers['ETag'] = etag
+        if last_modified:
+            # Datas do MySQL chegam sem fuso: interpretadas no fuso local
+            headers['Last-Modified'] = format_datetime(
+                last_modified.astimezone(timezone.utc), usegmt=True
+            )
+        return headers
+    
+    @staticmethod
+    def _parse_list_params(query_params):
+        """
+        Valida os parâmetros de listagem (limit, cursor, status, due_from, due_to)
+        
+        Args:
+            query_params (dict): Query string já processada por parse_qs
+        Returns:
+            tuple: (dict com filtros e paginação, mensagem de erro ou None)
+        """
+        def first(name):
+            values = query_params.get(name)
+            return values[0] if values else None
+        
+        params = {'limit': DEFAULT_PAGE_SIZE, 'after': None, 'status': None,
+                  'due_from': None, 'due_to': None}
+        
+        if first('limit') is not None:
+            try:
+                params['limit'] = int(first('limit'))
+            except ValueError:
+                params['limit'] = 0
+            if not 1 <= params['limit'] <= MAX_PAGE_SIZE:
+                return None, f'Parâmetro limit deve estar entre 1 e {MAX_PAGE_SIZE}'
+        
+        if first('cursor'):
+            try:
+                params['after'] = TaskController._decode_cursor(first('cursor'))
+            except ValueError as e:
+                return None, str(e)
+        
+        if first('status'):
+            if first('status') not in VALID_STATUSES:
+                return None, f"Status inválido. Use: {', '.join(VALID_STATUSES)}"
+            params['status'] = first('status')
+        
+        for name in ('due_from', 'due_to'):
+            if first(name):
+                try:
+                    params[name] = datetime.fromisoformat(first(name).replace('Z', '+00:00'))
+                except ValueError:
+                    return None, f'Formato de data inválido em {name}. Use ISO 8601 (YYYY-MM-DDTHH:MM:SS)'
+        
+        return params, None
+    
+    @staticmethod
+    def get_all_tasks(query_params=None, if_none_match=None):
+        """
+        Retorna uma página de tarefas em formato JSON
+        
+        A ETag combina a versão da tabela com os parâmetros da página; quando
+        coincide com If-None-Match a resposta é 304 sem consultar as tarefas.
+        
+        Args:
+            query_params (dict): limit, cursor, status, due_from e due_to
+            if_none_match (str): Header If-None-Match da requisição
+        Returns:
+            tuple: (status_code, response_body, headers)
+        """
+        try:
+            params, error = TaskController._parse_list_params(query_params or {})
+            if error:
+                error_response = {
+                    'success': False,
+                    'message': error
+                }
+                return 400, json.dumps(error_response, ensure_ascii=False), {
+                    'Content-Type': 'application/json'
+                }
+            
+            # A versão é lida antes das tarefas: se uma escrita acontecer no
+            # meio, a ETag fica mais antiga que os dados, nunca o contrário
+            version = Task.get_table_version()
+            etag, last_modified = None, None
+            if version:
+                last_modified = version[1]
+                digest = hashlib.blake2b(repr(sorted(params.items())).encode('utf-8'),
+                                         digest_size=8).hexdigest()
+                etag = f'"l{version[0]}-{digest}"'
+            cache_headers = TaskController._cache_headers(etag, last_modified)
+            
+            if TaskController._etag_matches(if_none_match, etag):
+                return 304, '', cache_headers
+            
+            tasks, has_more = Task.get_page(**params)
+            pagination = {
+                'limit': params['limit'],
+                'has_more': has_more,
+                'next_cursor': TaskController._encode_cursor(tasks[-1]) if has_more else None
+            }
+            
+            # As tarefas vão direto para bytes JSON, sem um dict intermediário por tarefa
+            with span('serialization'):
+                response_body = b''.join([
+                    b'{"success": true, "data": [', encode_tasks(tasks),
+                    b'], "pagination": ', dumps(pagination),
+                    b', "message": ', dumps(f'Encontradas {len(tasks)} tarefas'), b'}'
+                ])
+            
+            return 200, response_body, {
+                'Content-Type': 'application/json',
+                **cache_headers
+            }
+            
+        except Exception as e:
+            error_response = {
+                'success': False,
+                'message': f'Erro ao buscar tarefas: {str(e)}'
+            }
+            return 500, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+    
+    @staticmethod
+    def search_tasks(query_params=None):
         """
-        Retorna todas as tarefas em formato JSON
+        Busca tarefas pelo texto do título e da descrição, das mais relevantes
+        para as menos
+        
+        Args:
+            query_params (dict): q (obrigatório), limit e cursor
         Returns:
             tuple: (status_code, response_body, headers)
         """
+        query_params = query_params or {}
+        
+        def first(name):
+            values = query_params.get(name)
+            return values[0] if values else None
+        
+        def bad_request(message):
+            error_response = {
+                'success': False,
+                'message': message
+            }
+            return 400, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+        
+        query = (first('q') or '').strip()
+        if not query:
+            return bad_request('Parâmetro q é obrigatório')
+        if len(query) > SEARCH_MAX_QUERY_LENGTH:
+            return bad_request(f'Parâmetro q deve ter no máximo {SEARCH_MAX_QUERY_LENGTH} caracteres')
+        
+        limit = DEFAULT_PAGE_SIZE
+        if first('limit') is not None:
+            try:
+                limit = int(first('limit'))
+            except ValueError:
+                limit = 0
+            if not 1 <= limit <= MAX_PAGE_SIZE:
+                return bad_request(f'Parâmetro limit deve estar entre 1 e {MAX_PAGE_SIZE}')
+        
+        offset = 0
+        if first('cursor'):
+            try:
+                offset = TaskController._decode_search_cursor(first('cursor'))
+            except ValueError as e:
+                return bad_request(str(e))
+        
+        try:
+            tasks, has_more = Task.search(query, limit, offset)
+            next_offset = offset + len(tasks)
+            has_more = has_more and next_offset < SEARCH_MAX_OFFSET
+            pagination = {
+                'limit': limit,
+                'has_more': has_more,
+                'next_cursor': TaskController._encode_search_cursor(next_offset) if has_more else None
+            }
+            
+            with span('serialization'):
+                response_body = b''.join([
+                    b'{"success": true, "data": [', encode_tasks(tasks),
+                    b'], "pagination": ', dumps(pagination),
+                    b', "message": ', dumps(f'Encontradas {len(tasks)} tarefas'), b'}'
+                ])
+            
+            return 200, response_body, {
+                'Content-Type': 'application/json'
+            }
+            
+        except Exception as e:
+            error_response = {
+                'success': False,
+                'message': f'Erro ao buscar tarefas: {str(e)}'
+            }
+            return 500, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+    
+    @staticmethod
+    def _encode_search_cursor(offset):
+        raw = json.dumps({'offset': offset})
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def _decode_search_cursor(cursor):
+        """
+        Returns:
+            int: Posição nos resultados codificada no cursor
+        Raises:
+            ValueError: Se o cursor estiver malformado ou além de SEARCH_MAX_OFFSET
+        """
+        padded = cursor + '=' * (-len(cursor) % 4)
         try:
-            tasks = Task.get_all()
-            tasks_data = [task.to_dict() for task in tasks]
+            offset = int(json.loads(base64.urlsafe_b64decode(padded))['offset'])
+        except (TypeError, ValueError, KeyError, json.JSONDecodeError) as e:
+            raise ValueError('Cursor inválido') from e
+        if not 0 <= offset < SEARCH_MAX_OFFSET:
+            raise ValueError('Cursor inválido')
+        return offset
+    
+    @staticmethod
+    def stream_tasks(query_params=None, ndjson=False):
+        """
+        Retorna todas as tarefas filtradas como um corpo em streaming
+        
+        As linhas saem do banco em lotes por um cursor não bufferizado e são
+        serializadas lote a lote, então a memória usada não depende do total.
+        
+        Args:
+            query_params (dict): cursor, status, due_from e due_to
+            ndjson (bool): Uma tarefa JSON por linha em vez de um array JSON
+        Returns:
+            tuple: (status_code, response_body, headers), com response_body
+                sendo um iterável de bytes
+        """
+        try:
+            params, error = TaskController._parse_list_params(query_params or {})
+            if error:
+                error_response = {
+                    'success': False,
+                    'message': error
+                }
+                return 400, json.dumps(error_response, ensure_ascii=False), {
+                    'Content-Type': 'application/json'
+                }
+            
+            del params['limit']
+            batches = Task.stream_rows(batch_size=STREAM_BATCH_SIZE, **params)
+            # Busca o primeiro lote já aqui, para que erros de banco ainda
+            # possam virar uma resposta 500 antes dos headers serem enviados
+            first_batch = next(batches, [])
+            batches = itertools.chain([first_batch], batches)
+            
+            if ndjson:
+                body = TaskController._encode_ndjson(batches)
+                content_type = 'application/x-ndjson; charset=utf-8'
+            else:
+                body = TaskController._encode_json_array(batches)
+                content_type = 'application/json'
+            
+            return 200, body, {
+                'Content-Type': content_type
+            }
             
+        except Exception as e:
+            error_response = {
+                'success': False,
+                'message': f'Erro ao buscar tarefas: {str(e)}'
+            }
+            return 500, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+    
+    @staticmethod
+    def _encode_ndjson(batches):
+        for rows in batches:
+            if rows:
+                with span('serialization'):
+                    chunk = encode_task_rows(rows, '\n') + b'\n'
+                yield chunk
+    
+    @staticmethod
+    def _encode_json_array(batches):
+        yield b'['
+        separator = b''
+        for rows in batches:
+            if rows:
+                with span('serialization'):
+                    chunk = separator + encode_task_rows(rows)
+                yield chunk
+                separator = b','
+        yield b']'
+    
+    @staticmethod
+    def get_task_stats():
+        """
+        Contagens por status, vencidas e vencendo hoje e nesta semana
+        Returns:
+            tuple: (status_code, response_body, headers)
+        """
+        try:
+            stats = Task.get_stats()
             response = {
                 'success': True,
-                'data': tasks_data,
-                'message': f'Encontradas {len(tasks_data)} tarefas'
+                'data': stats,
+                'message': 'Estatísticas das tarefas'
             }
-            
             return 200, json.dumps(response, ensure_ascii=False), {
+                'Content-Type': 'application/json',
+                'Cache-Control': 'no-store'
+            }
+            
+        except Exception as e:
+            error_response = {
+                'success': False,
+                'message': f'Erro ao calcular estatísticas: {str(e)}'
+            }
+            return 500, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+    
+    @staticmethod
+    def _parse_changes_params(query_params, last_event_id=None):
+        """
+        Valida since, limit e wait de GET /tasks/changes
+        
+        Na reconexão do EventSource o header Last-Event-ID vale mais que o
+        since da URL, que continua sendo o da primeira conexão.
+        Returns:
+            tuple: (since ou None, limit, wait, mensagem de erro ou None)
+        """
+        def first(name):
+            values = query_params.get(name)
+            return values[0] if values else None
+        
+        since = last_event_id or first('since')
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                return None, None, None, 'Parâmetro since deve ser uma versão numérica'
+        
+        limit = MAX_PAGE_SIZE
+        if first('limit') is not None:
+            try:
+                limit = int(first('limit'))
+            except ValueError:
+                limit = 0
+            if not 1 <= limit <= MAX_PAGE_SIZE:
+                return None, None, None, f'Parâmetro limit deve estar entre 1 e {MAX_PAGE_SIZE}'
+        
+        wait = 0.0
+        if first('wait') is not None:
+            try:
+                wait = float(first('wait'))
+            except ValueError:
+                wait = -1.0
+            if not 0 <= wait <= CHANGES_MAX_WAIT:
+                return None, None, None, f'Parâmetro wait deve estar entre 0 e {CHANGES_MAX_WAIT} segundos'
+        
+        return since, limit, wait, None
+    
+    @staticmethod
+    def _read_changes(since, limit):
+        """
+        Lê as alterações desde `since` e as serializa
+        
+        Sem since, ou com uma versão que o log não cobre mais, o cliente
+        recebe reset: deve recarregar GET /tasks e continuar da versão informada.
+        Returns:
+            tuple: (evento 'changes' ou 'reset', versão, objeto JSON em bytes,
+                se houve alterações)
+        """
+        # Lida antes da listagem que o cliente fará após um reset
+        current = change_feed.version
+        result = Task.changes_since(since, limit) if since is not None else None
+        if result is None:
+            payload = dumps({'reset': True, 'version': current, 'has_more': False,
+                             'data': [], 'deleted': []})
+            return 'reset', current, payload, False
+        
+        tasks, deleted, version = result
+        with span('serialization'):
+            payload = b''.join([
+                b'{"reset": false, "version": ', str(version).encode('ascii'),
+                b', "has_more": ', b'true' if version < change_feed.version else b'false',
+                b', "data": [', encode_tasks(tasks), b'], "deleted": ', dumps(deleted), b'}'
+            ])
+        return 'changes', version, payload, bool(tasks or deleted)
+    
+    @staticmethod
+    def get_changes(query_params=None):
+        """
+        Tarefas criadas, alteradas ou removidas desde a versão `since`
+        
+        Com wait > 0 e nada novo, segura a requisição até a próxima escrita
+        ou até wait segundos (long-polling).
+        
+        Args:
+            query_params (dict): since, limit e wait
+        Returns:
+            tuple: (status_code, response_body, headers)
+        """
+        since, limit, wait, error = TaskController._parse_changes_params(query_params or {})
+        if error:
+            error_response = {
+                'success': False,
+                'message': error
+            }
+            return 400, json.dumps(error_response, ensure_ascii=False), {
                 'Content-Type': 'application/json'
             }
+        
+        try:
+            event, version, payload, changed = TaskController._read_changes(since, limit)
+            if event == 'changes' and not changed and wait > 0:
+                if not change_feed.reserve():
+                    error_response = {
+                        'success': False,
+                        'message': 'Muitas requisições aguardando alterações'
+                    }
+                    return 503, json.dumps(error_response, ensure_ascii=False), {
+                        'Content-Type': 'application/json',
+                        'Retry-After': str(CHANGES_BUSY_RETRY_MS // 1000)
+                    }
+                try:
+                    change_feed.wait(since, wait)
+                finally:
+                    change_feed.release()
+                event, version, payload, changed = TaskController._read_changes(since, limit)
+            
+            # payload é um objeto JSON: os campos entram ao lado de success
+            return 200, b'{"success": true, ' + payload[1:], {
+                'Content-Type': 'application/json',
+                'Cache-Control': 'no-store'
+            }
             
         except Exception as e:
             error_response = {
                 'success': False,
-                'message': f'Erro ao buscar tarefas: {str(e)}'
+                'message': f'Erro ao buscar alterações: {str(e)}'
             }
             return 500, json.dumps(error_response, ensure_ascii=False), {
                 'Content-Type': 'application/json'
             }
     
     @staticmethod
-    def get_task_by_id(task_id):
+    def stream_changes(query_params=None, last_event_id=None):
+        """
+        Envia as alterações como Server-Sent Events enquanto a conexão durar
+        
+        Cada evento leva a versão no id, então o EventSource retoma de onde
+        parou ao reconectar. A conexão é encerrada depois de
+        CHANGES_STREAM_SECONDS para devolver o worker ao servidor.
+        
+        Args:
+            query_params (dict): since e limit
+            last_event_id (str): Header Last-Event-ID da reconexão
+        Returns:
+            tuple: (status_code, response_body, headers), com response_body
+                sendo um iterável de bytes
+        """
+        since, limit, _, error = TaskController._parse_changes_params(query_params or {}, last_event_id)
+        if error:
+            error_response = {
+                'success': False,
+                'message': error
+            }
+            return 400, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+        
+        return 200, TaskController._event_stream(since, limit), {
+            'Content-Type': 'text/event-stream; charset=utf-8',
+            'Cache-Control': 'no-store'
+        }
+    
+    @staticmethod
+    def _event_stream(since, limit):
+        # A vaga é reservada só quando o corpo começa a ser enviado: um
+        # gerador que nunca rodou não executaria o finally que a libera
+        if not change_feed.reserve():
+            # Sem vaga: o EventSource tenta de novo depois do retry
+            yield b'retry: %d\n\n' % CHANGES_BUSY_RETRY_MS
+            return
+        try:
+            yield b'retry: %d\n\n' % CHANGES_RETRY_MS
+            deadline = time.monotonic() + CHANGES_STREAM_SECONDS
+            remaining = CHANGES_STREAM_SECONDS
+            while remaining > 0 and not change_feed.closed:
+                event, version, payload, changed = TaskController._read_changes(since, limit)
+                remaining = deadline - time.monotonic()
+                if event == 'reset' or changed:
+                    yield b'id: %d\nevent: %b\ndata: %b\n\n' % (version, event.encode('ascii'), payload)
+                    since = version
+                elif remaining > 0 and not change_feed.wait(since, min(CHANGES_HEARTBEAT_SECONDS, remaining)):
+                    # Comentário SSE: mantém proxies abertos e detecta clientes que saíram
+                    yield b': keepalive\n\n'
+        finally:
+            change_feed.release()
+    
+    @staticmethod
+    def get_task_by_id(task_id, if_none_match=None):
         """
+        Args:
+            task_id (int): ID da tarefa
+            if_none_match (str): Header If-None-Match da requisição
         Returns:
             tuple: (status_code, response_body, headers)
         """
@@ -51,14 +590,22 @@ class TaskController:
                     'Content-Type': 'application/json'
                 }
             
+            etag = task.etag()
+            cache_headers = TaskController._cache_headers(etag, task.updated_at)
+            if TaskController._etag_matches(if_none_match, etag):
+                return 304, '', cache_headers
+            
             response = {
                 'success': True,
                 'data': task.to_dict(),
                 'message': 'Tarefa encontrada com sucesso'
             }
             
-            return 200, json.dumps(response, ensure_ascii=False), {
-                'Content-Type': 'application/json'
+            with span('serialization'):
+                response_body = json.dumps(response, ensure_ascii=False)
+            return 200, response_body, {
+                'Content-Type': 'application/json',
+                **cache_headers
             }
             
         except Exception as e:
@@ -70,6 +617,43 @@ class TaskController:
                 'Content-Type': 'application/json'
             }
     
+    @staticmethod
+    def _build_task(request_data):
+        """
+        Valida os dados de uma nova tarefa e monta a instância
+        
+        Args:
+            request_data (dict): Dados da requisição
+        Returns:
+            tuple: (Task ou None, mensagem de erro ou None)
+        """
+        if not isinstance(request_data, dict):
+            return None, 'Tarefa deve ser um objeto JSON'
+        
+        # Validar dados obrigatórios
+        if not request_data.get('title'):
+            return None, 'Título é obrigatório'
+        
+        status = request_data.get('status', 'pendente')
+        if status not in VALID_STATUSES:
+            return None, f"Status inválido. Use: {', '.join(VALID_STATUSES)}"
+        
+        # Converter due_date se fornecido
+        due_date = None
+        if request_data.get('due_date'):
+            try:
+                due_date = datetime.fromisoformat(request_data['due_date'].replace('Z', '+00:00'))
+            except (AttributeError, ValueError):
+                return None, 'Formato de data inválido. Use ISO 8601 (YYYY-MM-DDTHH:MM:SS)'
+        
+        task = Task(
+            title=request_data.get('title', ''),
+            description=request_data.get('description', ''),
+            status=status,
+            due_date=due_date
+        )
+        return task, None
+    
     @staticmethod
     def create_task(request_data):
         """
@@ -80,38 +664,17 @@ class TaskController:
             tuple: (status_code, response_body, headers)
         """
         try:
-            # Validar dados obrigatórios
-            if not request_data.get('title'):
+            # Validar dados e criar nova tarefa
+            task, error = TaskController._build_task(request_data)
+            if error:
                 error_response = {
                     'success': False,
-                    'message': 'Título é obrigatório'
+                    'message': error
                 }
                 return 400, json.dumps(error_response, ensure_ascii=False), {
                     'Content-Type': 'application/json'
                 }
             
-            # Converter due_date se fornecido
-            due_date = None
-            if request_data.get('due_date'):
-                try:
-                    due_date = datetime.fromisoformat(request_data['due_date'].replace('Z', '+00:00'))
-                except ValueError:
-                    error_response = {
-                        'success': False,
-                        'message': 'Formato de data inválido. Use ISO 8601 (YYYY-MM-DDTHH:MM:SS)'
-                    }
-                    return 400, json.dumps(error_response, ensure_ascii=False), {
-                        'Content-Type': 'application/json'
-                    }
-            
-            # Criar nova tarefa
-            task = Task(
-                title=request_data.get('title', ''),
-                description=request_data.get('description', ''),
-                status=request_data.get('status', 'pendente'),
-                due_date=due_date
-            )
-            
             if task.save():
                 response = {
                     'success': True,
@@ -140,36 +703,207 @@ class TaskController:
             }
     
     @staticmethod
-    def update_task(task_id, request_data):
+    def create_tasks_bulk(request_data):
         """
+        Cria várias tarefas em uma única transação
+        
+        Itens inválidos são reportados individualmente e não impedem a
+        gravação dos demais; os válidos são gravados juntos ou nenhum é.
+        
+        Args:
+            request_data (list): Lista de tarefas (mesmo formato de create_task)
         Returns:
             tuple: (status_code, response_body, headers)
         """
         try:
-            # Buscar tarefa existente
-            task = Task.get_by_id(task_id)
+            if not isinstance(request_data, list) or not request_data:
+                error_response = {
+                    'success': False,
+                    'message': 'Envie uma lista não vazia de tarefas'
+                }
+                return 400, json.dumps(error_response, ensure_ascii=False), {
+                    'Content-Type': 'application/json'
+                }
+            if len(request_data) > BULK_MAX_ITEMS:
+                error_response = {
+                    'success': False,
+                    'message': f'Máximo de {BULK_MAX_ITEMS} tarefas por requisição'
+                }
+                return 413, json.dumps(error_response, ensure_ascii=False), {
+                    'Content-Type': 'application/json'
+                }
             
-            if not task:
+            results = []
+            valid_tasks = []
+            for index, item in enumerate(request_data):
+                task, error = TaskController._build_task(item)
+                if error:
+                    results.append({'index': index, 'success': False, 'message': error})
+                else:
+                    results.append({'index': index, 'success': True, 'task': task})
+                    valid_tasks.append(task)
+            
+            if valid_tasks and not Task.save_many(valid_tasks):
                 error_response = {
                     'success': False,
-                    'message': f'Tarefa com ID {task_id} não encontrada'
+                    'message': 'Erro ao salvar tarefas no banco de dados'
                 }
-                return 404, json.dumps(error_response, ensure_ascii=False), {
+                return 500, json.dumps(error_response, ensure_ascii=False), {
+                    'Content-Type': 'application/json'
+                }
+            
+            for result in results:
+                if result['success']:
+                    result['data'] = result.pop('task').to_dict()
+            
+            created = len(valid_tasks)
+            status_code = 201 if created == len(results) else (207 if created else 400)
+            response = {
+                'success': created == len(results),
+                'data': {
+                    'results': results,
+                    'succeeded': created,
+                    'failed': len(results) - created
+                },
+                'message': f'{created} de {len(results)} tarefas criadas'
+            }
+            return status_code, json.dumps(response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+            
+        except Exception as e:
+            error_response = {
+                'success': False,
+                'message': f'Erro ao criar tarefas: {str(e)}'
+            }
+            return 500, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+    
+    @staticmethod
+    def complete_tasks_bulk(request_data):
+        """
+        Args:
+            request_data (dict): {"ids": [...]}
+        Returns:
+            tuple: (status_code, response_body, headers)
+        """
+        return TaskController._write_tasks_bulk(
+            request_data, Task.complete_many, 'concluídas', 'Erro ao concluir tarefas'
+        )
+    
+    @staticmethod
+    def delete_tasks_bulk(request_data):
+        """
+        Args:
+            request_data (dict): {"ids": [...]}
+        Returns:
+            tuple: (status_code, response_body, headers)
+        """
+        return TaskController._write_tasks_bulk(
+            request_data, Task.delete_many, 'removidas', 'Erro ao remover tarefas'
+        )
+    
+    @staticmethod
+    def _write_tasks_bulk(request_data, write, verb, error_prefix):
+        """
+        Valida a lista de IDs, aplica a escrita em lote e monta o resultado por item
+        """
+        try:
+            task_ids = request_data.get('ids') if isinstance(request_data, dict) else None
+            if (not isinstance(task_ids, list) or not task_ids
+                    or not all(isinstance(i, int) and not isinstance(i, bool) and i > 0 for i in task_ids)):
+                error_response = {
+                    'success': False,
+                    'message': 'Envie {"ids": [...]} com IDs inteiros positivos'
+                }
+                return 400, json.dumps(error_response, ensure_ascii=False), {
+                    'Content-Type': 'application/json'
+                }
+            if len(task_ids) > BULK_MAX_ITEMS:
+                error_response = {
+                    'success': False,
+                    'message': f'Máximo de {BULK_MAX_ITEMS} tarefas por requisição'
+                }
+                return 413, json.dumps(error_response, ensure_ascii=False), {
+                    'Content-Type': 'application/json'
+                }
+            
+            unique_ids = list(dict.fromkeys(task_ids))
+            found = write(unique_ids)
+            
+            results = []
+            for task_id in unique_ids:
+                if task_id in found:
+                    results.append({'id': task_id, 'success': True})
+                else:
+                    results.append({
+                        'id': task_id,
+                        'success': False,
+                        'message': f'Tarefa com ID {task_id} não encontrada'
+                    })
+            
+            status_code = 200 if len(found) == len(results) else (207 if found else 404)
+            response = {
+                'success': len(found) == len(results),
+                'data': {
+                    'results': results,
+                    'succeeded': len(found),
+                    'failed': len(results) - len(found)
+                },
+                'message': f'{len(found)} de {len(results)} tarefas {verb}'
+            }
+            return status_code, json.dumps(response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+            
+        except Exception as e:
+            error_response = {
+                'success': False,
+                'message': f'{error_prefix}: {str(e)}'
+            }
+            return 500, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+    
+    @staticmethod
+    def update_task(task_id, request_data):
+        """
+        Atualiza só os campos enviados, com um único UPDATE
+        Returns:
+            tuple: (status_code, response_body, headers)
+        """
+        try:
+            if not isinstance(request_data, dict):
+                error_response = {
+                    'success': False,
+                    'message': 'Tarefa deve ser um objeto JSON'
+                }
+                return 400, json.dumps(error_response, ensure_ascii=False), {
                     'Content-Type': 'application/json'
                 }
             
             # Atualizar campos fornecidos
+            fields = {}
             if 'title' in request_data:
-                task.title = request_data['title']
+                fields['title'] = request_data['title']
             if 'description' in request_data:
-                task.description = request_data['description']
+                fields['description'] = request_data['description']
             if 'status' in request_data:
-                task.status = request_data['status']
+                if request_data['status'] not in VALID_STATUSES:
+                    error_response = {
+                        'success': False,
+                        'message': f"Status inválido. Use: {', '.join(VALID_STATUSES)}"
+                    }
+                    return 400, json.dumps(error_response, ensure_ascii=False), {
+                        'Content-Type': 'application/json'
+                    }
+                fields['status'] = request_data['status']
             if 'due_date' in request_data:
                 if request_data['due_date']:
                     try:
-                        task.due_date = datetime.fromisoformat(request_data['due_date'].replace('Z', '+00:00'))
-                    except ValueError:
+                        fields['due_date'] = datetime.fromisoformat(request_data['due_date'].replace('Z', '+00:00'))
+                    except (AttributeError, ValueError):
                         error_response = {
                             'success': False,
                             'message': 'Formato de data inválido. Use ISO 8601 (YYYY-MM-DDTHH:MM:SS)'
@@ -178,25 +912,27 @@ class TaskController:
                             'Content-Type': 'application/json'
                         }
                 else:
-                    task.due_date = None
+                    fields['due_date'] = None
             
-            if task.save():
-                response = {
-                    'success': True,
-                    'data': task.to_dict(),
-                    'message': 'Tarefa atualizada com sucesso'
-                }
-                return 200, json.dumps(response, ensure_ascii=False), {
-                    'Content-Type': 'application/json'
-                }
-            else:
+            task = Task.update_fields(task_id, fields)
+            
+            if not task:
                 error_response = {
                     'success': False,
-                    'message': 'Erro ao atualizar tarefa no banco de dados'
+                    'message': f'Tarefa com ID {task_id} não encontrada'
                 }
-                return 500, json.dumps(error_response, ensure_ascii=False), {
+                return 404, json.dumps(error_response, ensure_ascii=False), {
                     'Content-Type': 'application/json'
                 }
+            
+            response = {
+                'success': True,
+                'data': task.to_dict(),
+                'message': 'Tarefa atualizada com sucesso'
+            }
+            return 200, json.dumps(response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
                 
         except Exception as e:
             error_response = {
@@ -214,7 +950,8 @@ class TaskController:
             tuple: (status_code, response_body, headers)
         """
         try:
-            task = Task.get_by_id(task_id)
+            # UPDATE condicional: nenhuma linha encontrada significa 404
+            task = Task.update_fields(task_id, {'status': 'concluída'})
             
             if not task:
                 error_response = {
@@ -225,23 +962,14 @@ class TaskController:
                     'Content-Type': 'application/json'
                 }
             
-            if task.mark_as_completed():
-                response = {
-                    'success': True,
-                    'data': task.to_dict(),
-                    'message': 'Tarefa marcada como concluída com sucesso'
-                }
-                return 200, json.dumps(response, ensure_ascii=False), {
-                    'Content-Type': 'application/json'
-                }
-            else:
-                error_response = {
-                    'success': False,
-                    'message': 'Erro ao marcar tarefa como concluída'
-                }
-                return 500, json.dumps(error_response, ensure_ascii=False), {
-                    'Content-Type': 'application/json'
-                }
+            response = {
+                'success': True,
+                'data': task.to_dict(),
+                'message': 'Tarefa marcada como concluída com sucesso'
+            }
+            return 200, json.dumps(response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
                 
         except Exception as e:
             error_response = {
@@ -259,9 +987,8 @@ class TaskController:
             tuple: (status_code, response_body, headers)
         """
         try:
-            task = Task.get_by_id(task_id)
-            
-            if not task:
+            # DELETE direto: nenhuma linha removida significa 404
+            if not Task.delete_by_id(task_id):
                 error_response = {
                     'success': False,
                     'message': f'Tarefa com ID {task_id} não encontrada'
@@ -270,22 +997,13 @@ class TaskController:
                     'Content-Type': 'application/json'
                 }
             
-            if task.delete():
-                response = {
-                    'success': True,
-                    'message': 'Tarefa removida com sucesso'
-                }
-                return 200, json.dumps(response, ensure_ascii=False), {
-                    'Content-Type': 'application/json'
-                }
-            else:
-                error_response = {
-                    'success': False,
-                    'message': 'Erro ao remover tarefa do banco de dados'
-                }
-                return 500, json.dumps(error_response, ensure_ascii=False), {
-                    'Content-Type': 'application/json'
-                }
+            response = {
+                'success': True,
+                'message': 'Tarefa removida com sucesso'
+            }
+            return 200, json.dumps(response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
                 
         except Exception as e:
             error_response = {
@@ -0,0 +1,321 @@
+"""
+Importação e exportação de tarefas em CSV e NDJSON
+Os arquivos são lidos e escritos em fluxo: a memória usada depende do lote,
+não do tamanho do arquivo
+"""
+
+import csv
+import io
+import itertools
+import json
+import time
+from datetime import datetime
+from controllers.task_controller import TaskController, STREAM_BATCH_SIZE
+from models.task import Task
+from models.serializers import TASK_COLUMNS
+from observability.log import logger
+from observability.metrics import span
+
+TRANSFER_FORMATS = ('csv', 'ndjson')
+IMPORT_BATCH_SIZE = 1000
+# Linhas com erro detalhadas no relatório; as demais só entram na contagem
+IMPORT_MAX_ERRORS = 100
+IMPORT_PROGRESS_EVERY = 100_000
+
+_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8'
+}
+
+
+def format_from_content_type(content_type):
+    """
+    Returns:
+        str: 'csv', 'ndjson' ou None se o Content-Type não indicar nenhum dos dois
+    """
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type in ('text/csv', 'application/csv'):
+        return 'csv'
+    if content_type in ('application/x-ndjson', 'application/jsonl', 'application/jsonlines'):
+        return 'ndjson'
+    return None
+
+
+def parse_records(stream, file_format):
+    """
+    Lê as tarefas de um arquivo binário, uma de cada vez
+
+    No CSV a primeira linha nomeia as colunas (title obrigatória; description,
+    status e due_date opcionais; outras, como as da exportação, são ignoradas)
+    e campos vazios valem como ausentes. No NDJSON cada linha é um objeto JSON.
+
+    Args:
+        stream (io.BufferedIOBase): Arquivo ou corpo da requisição
+        file_format (str): 'csv' ou 'ndjson'
+    Yields:
+        tuple: (número da linha, dict da tarefa ou None, mensagem de erro ou None)
+    Raises:
+        ValueError: Se o arquivo não puder mais ser lido (cabeçalho sem title,
+            texto fora de UTF-8, CSV malformado)
+    """
+    if file_format == 'ndjson':
+        yield from _parse_ndjson(stream)
+    else:
+        yield from _parse_csv(stream)
+
+
+def _parse_ndjson(stream):
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            yield line_number, None, 'JSON inválido'
+            continue
+        yield line_number, record, None
+
+
+def _parse_csv(stream):
+    # utf-8-sig descarta o BOM que planilhas costumam gravar
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.DictReader(text)
+        try:
+            if 'title' not in (reader.fieldnames or ()):
+                raise ValueError('CSV sem a coluna title no cabeçalho')
+            for row in reader:
+                if None in row:
+                    yield reader.line_num, None, 'Mais campos que colunas no cabeçalho'
+                    continue
+                yield reader.line_num, {name: value for name, value in row.items() if value}, None
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise ValueError(f'Arquivo ilegível na linha {reader.line_num + 1}: {e}') from e
+    finally:
+        # Sem detach, o TextIOWrapper fecharia o arquivo de quem chamou
+        text.detach()
+
+
+class _BatchError(Exception):
+    pass
+
+
+def import_records(records, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """
+    Valida cada tarefa como em POST /tasks e grava as válidas em lotes
+
+    Cada lote é uma transação com INSERTs de várias linhas (Task.save_many);
+    lotes já gravados permanecem se a importação for interrompida.
+
+    Args:
+        records (iterable): Tuplas de parse_records
+        batch_size (int): Tarefas por transação
+        progress (callable): Recebe o relatório parcial a cada
+            IMPORT_PROGRESS_EVERY linhas lidas
+    Returns:
+        dict: processed, imported, failed, errors (até IMPORT_MAX_ERRORS linhas
+            com erro), seconds e aborted ({'reason': 'file' ou 'database',
+            'message'} se a importação parou antes do fim)
+    """
+    started = time.perf_counter()
+    report = {'processed': 0, 'imported': 0, 'failed': 0, 'errors': [], 'aborted': None}
+
+    def fail(line, message):
+        report['failed'] += 1
+        if len(report['errors']) < IMPORT_MAX_ERRORS:
+            report['errors'].append({'line': line, 'message': message})
+
+    batch = []
+    next_progress = IMPORT_PROGRESS_EVERY
+    try:
+        for line, record, error in records:
+            report['processed'] += 1
+            if error is None:
+                task, error = TaskController._build_task(record)
+            if error:
+                fail(line, error)
+            else:
+                batch.append(task)
+                if len(batch) >= batch_size:
+                    _save_batch(batch, report)
+                    batch = []
+
+            if progress is not None and report['processed'] >= next_progress:
+                next_progress += IMPORT_PROGRESS_EVERY
+                report['seconds'] = round(time.perf_counter() - started, 3)
+                progress(report)
+        if batch:
+            _save_batch(batch, report)
+    except ValueError as e:
+        report['aborted'] = {'reason': 'file', 'message': str(e)}
+    except _BatchError as e:
+        report['aborted'] = {'reason': 'database', 'message': str(e)}
+
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def _save_batch(tasks, report):
+    # Um lote que falha costuma indicar banco indisponível: os seguintes falhariam igual
+    if not Task.save_many(tasks):
+        raise _BatchError(f'Erro ao salvar lote no banco de dados após '
+                          f'{report["imported"]} tarefas importadas')
+    report['imported'] += len(tasks)
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(batches):
+    """
+    Serializa lotes de linhas (ordem de TASK_COLUMNS) como CSV com cabeçalho
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(TASK_COLUMNS)
+    for rows in batches:
+        if rows:
+            with span('serialization'):
+                writer.writerows([[_csv_value(value) for value in row] for row in rows])
+        chunk = buffer.getvalue()
+        if chunk:
+            buffer.seek(0)
+            buffer.truncate()
+            yield chunk.encode('utf-8')
+
+
+def export_rows(file_format, batches):
+    """
+    Returns:
+        iterator: Bytes do arquivo exportado, lote a lote
+    """
+    if file_format == 'csv':
+        return encode_csv(batches)
+    return TaskController._encode_ndjson(batches)
+
+
+class TransferController:
+    @staticmethod
+    def import_tasks(stream, file_format):
+        """
+        Importa as tarefas do corpo da requisição
+
+        Args:
+            stream (io.BufferedIOBase): Corpo em CSV ou NDJSON, lido em fluxo
+            file_format (str): 'csv' ou 'ndjson'
+        Returns:
+            tuple: (status_code, response_body, headers)
+        """
+        if file_format not in TRANSFER_FORMATS:
+            error_response = {
+                'success': False,
+                'message': 'Formato inválido. Use format=csv ou format=ndjson '
+                           '(ou Content-Type text/csv ou application/x-ndjson)'
+            }
+            return 400, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+
+        try:
+            report = import_records(
+                parse_records(stream, file_format),
+                progress=lambda partial: logger.info(
+                    "Importação de tarefas em andamento", format=file_format,
+                    processed=partial['processed'], imported=partial['imported'],
+                    failed=partial['failed'], seconds=partial['seconds'])
+            )
+        except Exception as e:
+            error_response = {
+                'success': False,
+                'message': f'Erro ao importar tarefas: {str(e)}'
+            }
+            return 500, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+
+        logger.info("Importação de tarefas concluída", format=file_format,
+                    processed=report['processed'], imported=report['imported'],
+                    failed=report['failed'], seconds=report['seconds'],
+                    aborted=report['aborted'] and report['aborted']['message'])
+
+        imported, processed, aborted = report['imported'], report['processed'], report['aborted']
+        if aborted:
+            if imported:
+                status_code = 207
+            else:
+                status_code = 500 if aborted['reason'] == 'database' else 400
+            message = f"Importação interrompida: {aborted['message']}"
+        elif processed == 0:
+            status_code, message = 400, 'Nenhuma tarefa no arquivo'
+        else:
+            status_code = 201 if imported == processed else (207 if imported else 400)
+            message = f'{imported} de {processed} tarefas importadas'
+
+        response = {
+            'success': status_code == 201,
+            'data': report,
+            'message': message
+        }
+        return status_code, json.dumps(response, ensure_ascii=False), {
+            'Content-Type': 'application/json'
+        }
+
+    @staticmethod
+    def export_tasks(query_params=None):
+        """
+        Exporta as tarefas filtradas em streaming, como anexo
+
+        Args:
+            query_params (dict): format (csv ou ndjson, padrão ndjson), status,
+                due_from e due_to
+        Returns:
+            tuple: (status_code, response_body, headers), com response_body
+                sendo um iterável de bytes
+        """
+        query_params = query_params or {}
+        file_format = (query_params.get('format') or ['ndjson'])[0].lower()
+        if file_format not in TRANSFER_FORMATS:
+            error_response = {
+                'success': False,
+                'message': f"Formato inválido. Use: {', '.join(TRANSFER_FORMATS)}"
+            }
+            return 400, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
+
+        try:
+            params, error = TaskController._parse_list_params(query_params)
+            if error:
+                error_response = {
+                    'success': False,
+                    'message': error
+                }
+                return 400, json.dumps(error_response, ensure_ascii=False), {
+                    'Content-Type': 'application/json'
+                }
+
+            del params['limit']
+            # Cursor não bufferizado no banco; o primeiro lote é lido já aqui para
+            # que um erro ainda possa virar 500 antes dos headers
+            batches = Task.stream_rows(batch_size=STREAM_BATCH_SIZE, **params)
+            first_batch = next(batches, [])
+            batches = itertools.chain([first_batch], batches)
+
+            return 200, export_rows(file_format, batches), {
+                'Content-Type': _CONTENT_TYPES[file_format],
+                'Content-Disposition': f'attachment; filename="tarefas.{file_format}"'
+            }
+
+        except Exception as e:
+            error_response = {
+                'success': False,
+                'message': f'Erro ao exportar tarefas: {str(e)}'
+            }
+            return 500, json.dumps(error_response, ensure_ascii=False), {
+                'Content-Type': 'application/json'
+            }
@@ -5,26 +5,22 @@ Responsável por gerenciar a conexão e operações básicas do banco
 
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.constants import ClientFlag
 import json
 import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
 from datetime import datetime
-from pathlib import Path
-
-def load_env_file():
-    env_path = Path(__file__).parent.parent / '.env'
-    
-    if env_path.exists():
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if '\x00' in line: # ignora linhas com caractere nulo
-                    continue 
-                # Ignora linhas vazias, comentários ou mal formatadas
-                if not line or line.startswith('#') or '=' not in line:
-                    continue
-                key, value = line.split('=', 1)
-                os.environ[key] = value
+from config import load_env_file, on_reload
+from database.pool import ConnectionPool
+from database.queries import QueryRegistry, FETCH_ONE
+from observability.log import logger
+from observability.metrics import span
 
+# Resultado de INSERT/UPDATE/DELETE: linhas afetadas e ID gerado (se houver)
+WriteResult = namedtuple('WriteResult', ['rowcount', 'lastrowid'])
 
 def get_database_config():
     load_env_file()
@@ -35,12 +31,40 @@ def get_database_config():
         'password': os.getenv('DB_PASSWORD', ''),
         'database': os.getenv('DB_NAME', 'agenda_tarefas'),
         'charset': os.getenv('DB_CHARSET', 'utf8mb4'),
-        'collation': os.getenv('DB_COLLATION', 'utf8mb4_unicode_ci')
+        'collation': os.getenv('DB_COLLATION', 'utf8mb4_unicode_ci'),
+        # Queries fora de transação explícita são confirmadas pelo servidor,
+        # assim conexões reaproveitadas pelo pool nunca leem um snapshot antigo
+        'autocommit': True,
+        # UPDATE informa as linhas encontradas, não só as alteradas, para que
+        # rowcount 0 signifique "não existe" mesmo sem mudança de valores
+        'client_flags': [ClientFlag.FOUND_ROWS]
+    }
+
+
+def get_pool_config():
+    load_env_file()
+    
+    return {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        'checkout_timeout': float(os.getenv('DB_POOL_TIMEOUT', '5')),
+        'max_age': float(os.getenv('DB_POOL_MAX_AGE', '1800')),
+        'idle_ping_after': float(os.getenv('DB_POOL_IDLE_PING', '30')),
+        'health_check_interval': float(os.getenv('DB_POOL_HEALTH_INTERVAL', '30'))
     }
 
 class DatabaseConnection:
+    """
+    Acesso ao MySQL por um pool de conexões compartilhado entre as threads
+
+    Criar a instância não abre conexão: o pool só é criado no primeiro uso,
+    então importar o módulo é instantâneo e o servidor começa a escutar mesmo
+    com o banco lento ou fora do ar. Se a conexão falhar, o próximo uso tenta
+    de novo.
+    """
     _instance = None
-    _connection = None
+    _pool = None
+    _initialized = False
     
     def __new__(cls):
         if cls._instance is None:
@@ -48,55 +72,335 @@ class DatabaseConnection:
         return cls._instance
     
     def __init__(self):
-        if not self._connection:
-            self._connect()
+        if not self._initialized:
+            # Cada thread guarda a conexão que retirou do pool, para que
+            # chamadas aninhadas reutilizem a mesma conexão
+            self._local = threading.local()
+            self.queries = QueryRegistry()
+            self._pool_lock = threading.Lock()
+            self._config = None
+            self._initialized = True
+            # Novas conexões do pool passam a usar as credenciais relidas
+            on_reload(self._reset_config)
+    
+    @property
+    def pool(self):
+        """
+        Pool de conexões, criado (com DB_POOL_MIN_SIZE conexões) no primeiro acesso
+        """
+        pool = self._pool
+        if pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = self._connect()
+                pool = self._pool
+        return pool
     
     def _connect(self):
         try:
-            config = get_database_config()
-            
-            self._connection = mysql.connector.connect(**config)
-            print("Conexão com o banco de dados estabelecida com sucesso!")
+            with span('db_connect'):
+                pool = ConnectionPool(self._open_connection, **get_pool_config())
+            logger.info("Conexão com o banco de dados estabelecida")
+            return pool
             
         except Error as e:
-            print(f"Erro ao conectar com o banco de dados: {e}")
+            logger.error("Erro ao conectar com o banco de dados", error=str(e))
             raise
     
-    def get_connection(self):
-        if not self._connection or not self._connection.is_connected():
-            self._connect()
-        return self._connection
+    def _open_connection(self):
+        config = self._config
+        if config is None:
+            config = self._config = get_database_config()
+        return mysql.connector.connect(**config)
     
-    def execute_query(self, query, params=None):
+    def _reset_config(self, changed):
+        if any(key.startswith('DB_') for key in changed):
+            self._config = None
+    
+    @contextmanager
+    def connection(self):
+        """
+        Reserva uma conexão do pool para a thread atual
+        
+        Blocos aninhados na mesma thread recebem a mesma conexão, que só volta
+        ao pool quando o bloco mais externo termina.
+        
+        Yields:
+            MySQLConnection: Conexão reservada
+        """
+        local = self._local
+        if getattr(local, 'entry', None) is not None:
+            yield local.entry.raw
+            return
+        
+        with span('db_checkout'):
+            entry = self.pool.checkout()
+        local.entry = entry
+        discard = False
         try:
-            connection = self.get_connection()
-            cursor = connection.cursor(dictionary=True)
+            yield entry.raw
+        except (mysql.connector.errors.InterfaceError,
+                mysql.connector.errors.OperationalError):
+            # Conexão possivelmente quebrada: não volta para o pool
+            discard = True
+            raise
+        finally:
+            local.entry = None
+            self._pool.checkin(entry, discard=discard)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa as queries do bloco em uma única transação
+        
+        Todas as chamadas a execute_query/execute_many dentro do bloco usam a
+        mesma conexão; o commit acontece uma vez ao final e qualquer exceção
+        desfaz tudo. Blocos aninhados participam da transação mais externa.
+        
+        Yields:
+            MySQLConnection: Conexão da transação
+        """
+        with self.connection() as connection:
+            if getattr(self._local, 'in_transaction', False):
+                yield connection
+                return
             
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+            connection.start_transaction()
+            self._local.in_transaction = True
+            try:
+                yield connection
+                connection.commit()
+            except Exception:
+                try:
+                    connection.rollback()
+                except Error:
+                    pass
+                raise
+            finally:
+                self._local.in_transaction = False
+    
+    def get_connection(self):
+        """
+        Returns:
+            MySQLConnection: Conexão reservada pela thread atual ou None
+        """
+        entry = getattr(self._local, 'entry', None)
+        return entry.raw if entry else None
+    
+    def execute_query(self, query, params=None, dictionary=True):
+        """
+        Executa uma query; com dictionary=False as linhas do SELECT vêm como
+        tuplas, na ordem das colunas, sem criar um dict por linha
+        """
+        with self.connection() as connection:
+            cursor = None
+            try:
+                cursor = connection.cursor(dictionary=dictionary)
+                
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                
+                # Qualquer comando que produza linhas (SELECT, WITH, SHOW...)
+                if cursor.with_rows:
+                    return cursor.fetchall()
+                
+                # INSERT, UPDATE e DELETE já são confirmados pelo autocommit
+                return WriteResult(cursor.rowcount, cursor.lastrowid)
+                
+            except Error as e:
+                logger.error("Erro ao executar query", error=str(e))
+                raise
+            finally:
+                if cursor:
+                    cursor.close()
+    
+    def register_query(self, name, sql, fetch=None, dictionary=False):
+        """
+        Registra um formato de query para execute_named (veja QueryRegistry.register)
+        """
+        return self.queries.register(name, sql, fetch, dictionary)
+    
+    def execute_named(self, name, params=None):
+        """
+        Executa um formato de query registrado em um cursor preparado
+        
+        O cursor é preparado na primeira execução em cada conexão e reutilizado
+        depois: o servidor não analisa a query de novo e só os parâmetros
+        trafegam. Chamadas e latência ficam registradas por formato.
+        
+        Args:
+            name (str): Nome do formato registrado
+            params (tuple): Parâmetros da query
+        Returns:
+            list | dict | tuple | WriteResult: Conforme o fetch do formato
+        """
+        shape = self.queries.get(name)
+        with self.connection() as connection:
+            statements = self._local.entry.statements
+            cursor = statements.get(name)
+            if cursor is None:
+                cursor = connection.cursor(prepared=True, dictionary=shape.dictionary)
+                statements[name] = cursor
             
-            # Para SELECT, retorna os resultados
-            if query.strip().upper().startswith('SELECT'):
-                results = cursor.fetchall()
-                cursor.close()
-                return results
+            started = time.perf_counter()
+            try:
+                cursor.execute(shape.sql, params or ())
+                if shape.fetch is None:
+                    result = WriteResult(cursor.rowcount, cursor.lastrowid)
+                else:
+                    rows = cursor.fetchall()
+                    if shape.fetch == FETCH_ONE:
+                        result = rows[0] if rows else None
+                    else:
+                        result = rows
+            except Error as e:
+                self.queries.record(name, time.perf_counter() - started, error=True)
+                # O statement pode ter ficado inválido: prepara de novo na próxima vez
+                statements.pop(name, None)
+                try:
+                    cursor.close()
+                except Error:
+                    pass
+                logger.error("Erro ao executar query", query=name, error=str(e))
+                raise
+            
+            self.queries.record(name, time.perf_counter() - started)
+            return result
+    
+    def execute_statements(self, statements, atomic=False, dictionary=True):
+        """
+        Executa várias queries em uma única ida ao banco
+        
+        As queries seguem juntas como multi-statement. Com atomic=True elas
+        formam uma transação aberta e confirmada na mesma ida ao banco; dentro
+        de um db.transaction() participam da transação já aberta.
+        
+        Args:
+            statements (list): Pares (query, parâmetros), na ordem de execução
+            atomic (bool): Se as queries devem ser confirmadas juntas
+            dictionary (bool): False entrega as linhas dos SELECTs como tuplas
+        Returns:
+            list: Por query, as linhas (se ela produziu linhas) ou WriteResult
+        """
+        queries = [query.strip().rstrip(';') for query, _ in statements]
+        params = tuple(value for _, query_params in statements for value in query_params)
+        own_transaction = atomic and not getattr(self._local, 'in_transaction', False)
+        if own_transaction:
+            queries = ['START TRANSACTION', *queries, 'COMMIT']
+        
+        with self.connection() as connection:
+            cursor = None
+            try:
+                cursor = connection.cursor(dictionary=dictionary)
+                results = []
+                for result in cursor.execute('; '.join(queries), params, multi=True):
+                    if result.with_rows:
+                        results.append(result.fetchall())
+                    else:
+                        results.append(WriteResult(result.rowcount, result.lastrowid))
+                return results[1:-1] if own_transaction else results
+                
+            except Error as e:
+                if own_transaction:
+                    # A falha interrompe o multi-statement antes do COMMIT
+                    try:
+                        connection.rollback()
+                    except Error:
+                        pass
+                logger.error("Erro ao executar query", error=str(e))
+                raise
+            finally:
+                if cursor:
+                    cursor.close()
+    
+    def execute_many(self, query, params_seq):
+        """
+        Executa a mesma query para vários conjuntos de parâmetros
+        
+        Para INSERT ... VALUES o mysql.connector envia um único INSERT com
+        várias linhas, então o lote inteiro custa uma ida ao banco.
+        
+        Args:
+            query (str): Query INSERT, UPDATE ou DELETE
+            params_seq (list): Lista de tuplas de parâmetros
+        Returns:
+            tuple: (linhas afetadas, ID gerado para a primeira linha inserida)
+        """
+        with self.connection() as connection:
+            cursor = None
+            try:
+                cursor = connection.cursor()
+                cursor.executemany(query, params_seq)
+                return cursor.rowcount, cursor.lastrowid
+                
+            except Error as e:
+                logger.error("Erro ao executar query", error=str(e))
+                raise
+            finally:
+                if cursor:
+                    cursor.close()
+    
+    def stream_query(self, query, params=None, batch_size=500, dictionary=True):
+        """
+        Executa um SELECT com cursor não bufferizado, entregando as linhas em lotes
+        
+        A conexão fica reservada enquanto o gerador é consumido e não é
+        compartilhada com a thread; se o consumo for interrompido antes do fim,
+        ela é descartada em vez de voltar ao pool com resultados pendentes.
+        
+        Args:
+            query (str): Query SELECT
+            params (tuple): Parâmetros da query
+            batch_size (int): Quantidade de linhas por lote
+            dictionary (bool): False entrega as linhas como tuplas
+        Yields:
+            list: Lote de linhas (dicionários ou tuplas)
+        """
+        with span('db_checkout'):
+            entry = self.pool.checkout()
+        cursor = None
+        finished = False
+        try:
+            cursor = entry.raw.cursor(dictionary=dictionary, buffered=False)
+            cursor.execute(query, params or ())
+            
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
             
-            # Para INSERT, UPDATE, DELETE, faz commit
-            connection.commit()
             cursor.close()
-            return True
+            finished = True
             
         except Error as e:
-            print(f"❌ Erro ao executar query: {e}")
-            if connection:
-                connection.rollback()
+            logger.error("Erro ao executar query", error=str(e))
             raise
+        finally:
+            self._pool.checkin(entry, discard=not finished)
+    
+    def get_query_stats(self):
+        """
+        Returns:
+            dict: Chamadas e latência por formato de query registrado
+        """
+        return self.queries.stats()
+    
+    def get_pool_stats(self):
+        """
+        Returns:
+            dict: Estatísticas do pool de conexões
+        """
+        if self._pool is None:
+            # Nenhuma query ainda: consultar as estatísticas não abre o pool
+            return {'connected': False}
+        return self._pool.stats()
     
     def close_connection(self):
-        if self._connection and self._connection.is_connected():
-            self._connection.close()
-            print("Conexão com o banco de dados fechada!")
+        if self._pool:
+            self._pool.close()
+            logger.info("Conexão com o banco de dados fechada")
 
 db = DatabaseConnection() 
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""
+Pool de conexões com o banco de dados
+Mantém conexões reutilizáveis entre as threads do servidor
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeoutError(Exception):
+    """
+    Nenhuma conexão ficou disponível dentro do tempo de espera
+    """
+
+
+class PooledConnection:
+    """
+    Conexão do pool com os metadados usados para reciclagem e health check
+    """
+    __slots__ = ('raw', 'created_at', 'last_used', 'statements')
+
+    def __init__(self, raw):
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used = now
+        # Cursores preparados desta conexão, por nome do formato de query;
+        # morrem junto com a conexão, que é quem guarda o statement no servidor
+        self.statements = {}
+
+    def age(self, now):
+        return now - self.created_at
+
+    def idle_time(self, now):
+        return now - self.last_used
+
+
+class ConnectionPool:
+    """
+    Pool de conexões com tamanho mínimo/máximo, timeout de checkout,
+    reciclagem por idade e verificação de conexões ociosas
+
+    A verificação de vida (ping) só acontece para conexões que ficaram ociosas
+    por mais de `idle_ping_after` segundos e na thread de manutenção, nunca a
+    cada query.
+    """
+
+    def __init__(self, factory, min_size=1, max_size=10, checkout_timeout=5.0,
+                 max_age=1800.0, idle_ping_after=30.0, health_check_interval=30.0):
+        """
+        Args:
+            factory (callable): Função que abre uma nova conexão
+            min_size (int): Conexões mantidas abertas mesmo sem uso
+            max_size (int): Limite de conexões abertas ao mesmo tempo
+            checkout_timeout (float): Segundos aguardando uma conexão livre
+            max_age (float): Idade máxima de uma conexão antes de ser reciclada
+            idle_ping_after (float): Ociosidade a partir da qual a conexão é verificada
+            health_check_interval (float): Intervalo da thread de manutenção (0 desativa)
+        """
+        if max_size < 1 or min_size > max_size:
+            raise ValueError('Tamanho do pool inválido')
+
+        self._factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.max_age = max_age
+        self.idle_ping_after = idle_ping_after
+        self.health_check_interval = health_check_interval
+
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = {
+            'created': 0,
+            'closed': 0,
+            'checkouts': 0,
+            'timeouts': 0,
+            'recycled': 0,
+            'ping_failures': 0,
+            'wait_seconds': 0.0
+        }
+
+        self._fill_to_min()
+
+        self._maintenance_stop = threading.Event()
+        self._maintenance_thread = None
+        if health_check_interval > 0:
+            self._maintenance_thread = threading.Thread(
+                target=self._maintenance_loop,
+                name='db-pool-maintenance',
+                daemon=True
+            )
+            self._maintenance_thread.start()
+
+    def checkout(self, timeout=None):
+        """
+        Retira uma conexão do pool, abrindo uma nova se houver espaço
+
+        Args:
+            timeout (float): Segundos de espera (padrão: checkout_timeout)
+        Returns:
+            PooledConnection: Conexão reservada para o chamador
+        Raises:
+            PoolTimeoutError: Se nenhuma conexão ficar livre a tempo
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            create = False
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise PoolTimeoutError('Pool de conexões fechado')
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        # Reserva a vaga antes de abrir a conexão fora do lock
+                        self._size += 1
+                        create = True
+                        entry = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f'Nenhuma conexão livre após {timeout:.1f}s '
+                            f'({self.max_size} em uso)'
+                        )
+                    self._condition.wait(remaining)
+
+            if create:
+                entry = self._create_reserved()
+            elif not self._validate(entry):
+                continue
+
+            with self._condition:
+                self._stats['checkouts'] += 1
+                self._stats['wait_seconds'] += time.monotonic() - started
+            return entry
+
+    def checkin(self, entry, discard=False):
+        """
+        Devolve uma conexão ao pool
+
+        Args:
+            entry (PooledConnection): Conexão obtida com checkout()
+            discard (bool): Fecha a conexão em vez de reutilizá-la
+        """
+        now = time.monotonic()
+        if discard or self._closed or entry.age(now) > self.max_age:
+            if not discard and not self._closed:
+                with self._condition:
+                    self._stats['recycled'] += 1
+            self._close_entry(entry)
+            return
+
+        entry.last_used = now
+        with self._condition:
+            self._idle.append(entry)
+            self._condition.notify()
+
+    def stats(self):
+        """
+        Retorna um retrato do estado do pool
+
+        Returns:
+            dict: Tamanho, conexões em uso/livres e contadores acumulados
+        """
+        with self._condition:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size
+            })
+        return snapshot
+
+    def close(self):
+        """
+        Fecha todas as conexões livres e impede novos checkouts
+        """
+        self._maintenance_stop.set()
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for entry in idle:
+            self._close_entry(entry)
+
+    def _create_reserved(self):
+        try:
+            entry = PooledConnection(self._factory())
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._stats['created'] += 1
+        return entry
+
+    def _validate(self, entry):
+        """
+        Confere uma conexão antes de entregá-la; descarta as velhas ou mortas
+        """
+        now = time.monotonic()
+        if entry.age(now) > self.max_age:
+            with self._condition:
+                self._stats['recycled'] += 1
+            self._close_entry(entry)
+            return False
+        if entry.idle_time(now) > self.idle_ping_after and not self._ping(entry):
+            self._close_entry(entry)
+            return False
+        return True
+
+    def _ping(self, entry):
+        try:
+            entry.raw.ping(reconnect=False)
+            entry.last_used = time.monotonic()
+            return True
+        except Exception:
+            with self._condition:
+                self._stats['ping_failures'] += 1
+            return False
+
+    def _close_entry(self, entry):
+        try:
+            entry.raw.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._size -= 1
+            self._stats['closed'] += 1
+            self._condition.notify()
+
+    def _fill_to_min(self):
+        while True:
+            with self._condition:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            entry = self._create_reserved()
+            self.checkin(entry)
+
+    def _maintenance_loop(self):
+        while not self._maintenance_stop.wait(self.health_check_interval):
+            now = time.monotonic()
+            with self._condition:
+                candidates = [
+                    entry for entry in self._idle
+                    if entry.age(now) > self.max_age
+                    or entry.idle_time(now) > self.idle_ping_after
+                ]
+                for entry in candidates:
+                    self._idle.remove(entry)
+
+            for entry in candidates:
+                if self._validate(entry):
+                    self.checkin(entry)
+
+            try:
+                self._fill_to_min()
+            except Exception:
+                # Banco indisponível: tenta novamente no próximo ciclo
+                pass
@@ -0,0 +1,103 @@
+"""
+Registro de formatos de query
+Queries fixas são registradas uma vez pelo nome e executadas em cursores
+preparados, com contagem de chamadas e latência por formato
+"""
+
+import threading
+
+FETCH_ALL = 'all'
+FETCH_ONE = 'one'
+
+
+class QueryShape:
+    """
+    Query nomeada com semântica de execução fixa
+
+    `fetch` define o que a execução devolve:
+    - FETCH_ALL: lista de linhas
+    - FETCH_ONE: a primeira linha ou None
+    - None: escrita; devolve WriteResult e é confirmada pelo autocommit, ou
+      pelo db.transaction() que estiver aberto
+    """
+    __slots__ = ('name', 'sql', 'fetch', 'dictionary')
+
+    def __init__(self, name, sql, fetch=None, dictionary=False):
+        if fetch not in (None, FETCH_ALL, FETCH_ONE):
+            raise ValueError(f"fetch inválido para a query {name}: {fetch}")
+        self.name = name
+        self.sql = ' '.join(sql.split())
+        self.fetch = fetch
+        self.dictionary = dictionary
+
+
+class QueryRegistry:
+    """
+    Formatos de query registrados e suas estatísticas de execução
+    """
+
+    def __init__(self):
+        self._shapes = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def register(self, name, sql, fetch=None, dictionary=False):
+        """
+        Registra um formato de query
+
+        Args:
+            name (str): Nome único, usado em execute_named
+            sql (str): Query com placeholders %s
+            fetch (str): FETCH_ALL, FETCH_ONE ou None para escritas
+            dictionary (bool): Linhas como dict em vez de tupla
+        Returns:
+            QueryShape: O formato registrado
+        Raises:
+            ValueError: Se o nome já estiver registrado com outra query
+        """
+        shape = QueryShape(name, sql, fetch, dictionary)
+        with self._lock:
+            existing = self._shapes.get(name)
+            if existing is not None:
+                if (existing.sql, existing.fetch, existing.dictionary) != (shape.sql, fetch, dictionary):
+                    raise ValueError(f"Query {name} já registrada com outro formato")
+                return existing
+            self._shapes[name] = shape
+            self._stats[name] = {'calls': 0, 'errors': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+        return shape
+
+    def get(self, name):
+        """
+        Raises:
+            KeyError: Se o formato não foi registrado
+        """
+        try:
+            return self._shapes[name]
+        except KeyError:
+            raise KeyError(f"Query não registrada: {name}") from None
+
+    def record(self, name, seconds, error=False):
+        with self._lock:
+            entry = self._stats[name]
+            entry['calls'] += 1
+            entry['total_seconds'] += seconds
+            if seconds > entry['max_seconds']:
+                entry['max_seconds'] = seconds
+            if error:
+                entry['errors'] += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: Por formato, chamadas, erros e latência média/máxima em ms
+        """
+        with self._lock:
+            return {
+                name: {
+                    'calls': entry['calls'],
+                    'errors': entry['errors'],
+                    'avg_ms': entry['total_seconds'] * 1000 / entry['calls'] if entry['calls'] else 0.0,
+                    'max_ms': entry['max_seconds'] * 1000
+                }
+                for name, entry in self._stats.items()
+            }
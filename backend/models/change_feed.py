@@ -0,0 +1,153 @@
+"""
+Registro das alterações recentes de tarefas
+Cada escrita recebe uma versão crescente; clientes pedem só o que mudou
+desde a última versão que viram, em vez de recarregar a listagem inteira
+"""
+
+import os
+import threading
+import time
+from config import load_env_file
+
+
+def get_changes_config():
+    load_env_file()
+
+    return {
+        'max_entries': int(os.getenv('CHANGES_LOG_SIZE', '10000')),
+        'max_waiters': int(os.getenv('CHANGES_MAX_WAITERS', '4'))
+    }
+
+
+class ChangeFeed:
+    """
+    Log circular de (versão, id da tarefa, removida) com espera por novidades
+
+    As versões começam no relógio em microssegundos, então continuam
+    crescendo depois de reiniciar o servidor: uma versão de antes do reinício
+    (ou que já saiu do log) fica abaixo do piso e o cliente é avisado para
+    recarregar a listagem. As entradas de um processo só enxergam as escritas
+    feitas por ele; por isso o modo multiprocesso desliga o registro
+    (enabled = False) e GET /tasks/changes deixa de ser atendido.
+    """
+
+    def __init__(self, max_entries=10000, max_waiters=4):
+        """
+        Args:
+            max_entries (int): Alterações mantidas no log
+            max_waiters (int): Requisições que podem ficar esperando ao mesmo
+                tempo; cada uma ocupa um worker do servidor
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_waiters = max_waiters
+        self._version = time.time_ns() // 1000
+        # _entries[i] tem a versão _first_version + i
+        self._first_version = self._version + 1
+        self._entries = []
+        self._condition = threading.Condition()
+        self._waiters = threading.BoundedSemaphore(max_waiters) if max_waiters > 0 else None
+        self._closed = False
+        self.enabled = True
+
+    @classmethod
+    def from_env(cls):
+        return cls(**get_changes_config())
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def floor(self):
+        """
+        Menor versão a partir da qual o log ainda tem todas as alterações
+        """
+        return self._first_version - 1
+
+    def record(self, task_ids, deleted=False):
+        """
+        Registra alterações e acorda quem espera por elas
+
+        Args:
+            task_ids (iterable): IDs das tarefas criadas, alteradas ou removidas
+            deleted (bool): Se as tarefas foram removidas
+        """
+        if not self.enabled:
+            return
+        with self._condition:
+            entries = self._entries
+            for task_id in task_ids:
+                self._version += 1
+                entries.append((task_id, deleted))
+            if len(entries) > 2 * self.max_entries:
+                # Descarta em blocos: o custo do del fica amortizado entre as escritas
+                excess = len(entries) - self.max_entries
+                del entries[:excess]
+                self._first_version += excess
+            self._condition.notify_all()
+
+    def changes_since(self, since, limit):
+        """
+        Alterações posteriores a uma versão, a mais recente de cada tarefa
+
+        Args:
+            since (int): Última versão vista pelo cliente
+            limit (int): Máximo de tarefas distintas
+        Returns:
+            tuple: (dict id → removida, versão até onde as alterações foram lidas),
+                ou None se a versão for desconhecida e o cliente deve recarregar
+        """
+        with self._condition:
+            if since < self.floor or since > self._version:
+                return None
+            changes = {}
+            version = since
+            for task_id, deleted in self._entries[since - self.floor:]:
+                if task_id not in changes and len(changes) >= limit:
+                    break
+                changes[task_id] = deleted
+                version += 1
+            return changes, version
+
+    def reserve(self):
+        """
+        Ocupa uma das vagas de espera; quem conseguir deve chamar release()
+
+        Returns:
+            bool: False se as max_waiters vagas estiverem ocupadas
+        """
+        return self._waiters is not None and self._waiters.acquire(blocking=False)
+
+    def release(self):
+        self._waiters.release()
+
+    def wait(self, since, timeout):
+        """
+        Espera (com uma vaga reservada) por uma versão posterior a `since`
+
+        Returns:
+            bool: True se há alterações novas
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._version > since or self._closed, timeout)
+            return self._version > since
+
+    def close(self):
+        """
+        Libera as requisições em espera (encerramento do servidor)
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def stats(self):
+        with self._condition:
+            return {'enabled': self.enabled, 'version': self._version, 'floor': self.floor,
+                    'entries': len(self._entries), 'max_entries': self.max_entries}
+
+
+change_feed = ChangeFeed.from_env()
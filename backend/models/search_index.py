@@ -0,0 +1,183 @@
+"""
+Índice invertido para a busca textual de tarefas
+Usado quando o backend de armazenamento não tem busca full-text própria;
+é montado na primeira busca e mantido pelas escritas de Task
+"""
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+_WORD = re.compile(r'\w+')
+MIN_TOKEN_LENGTH = 2
+# Ocorrências no título valem mais que na descrição
+TITLE_WEIGHT = 2
+
+
+def tokenize(text):
+    """
+    Quebra o texto em termos minúsculos e sem acentos ("Reunião" → "reuniao")
+
+    Returns:
+        list: Termos com pelo menos MIN_TOKEN_LENGTH caracteres
+    """
+    if not text:
+        return []
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    plain = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return [token for token in _WORD.findall(plain) if len(token) >= MIN_TOKEN_LENGTH]
+
+
+class InvertedIndex:
+    """
+    Índice termo → {id da tarefa: frequência} com ranking BM25
+
+    Antes da primeira busca o índice está vazio e as escritas são ignoradas.
+    Durante a montagem as escritas ficam pendentes e são reaplicadas no fim,
+    então nenhuma alteração feita enquanto a tabela é lida se perde.
+
+    No modo multiprocesso o índice de um processo não veria as escritas dos
+    outros: lá o índice compartilhado fica desligado (enabled = False) e cada
+    busca monta um índice descartável com a tabela atual.
+    """
+
+    EMPTY, BUILDING, READY = 'empty', 'building', 'ready'
+
+    def __init__(self, k1=1.2, b=0.75):
+        """
+        Args:
+            k1 (float): Saturação da frequência do termo
+            b (float): Peso da normalização pelo tamanho do documento
+        """
+        self.k1 = k1
+        self.b = b
+        self.state = self.EMPTY
+        self.enabled = True
+        self._postings = {}
+        self._documents = {}
+        self._total_length = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def ensure_built(self, load_batches):
+        """
+        Monta o índice na primeira chamada
+
+        Args:
+            load_batches (callable): Devolve um iterável de lotes de linhas
+                (ordem de TASK_COLUMNS) com todas as tarefas
+        """
+        if self.state == self.READY:
+            return
+        with self._build_lock:
+            if self.state == self.READY:
+                return
+            with self._lock:
+                self.state = self.BUILDING
+                self._pending = []
+            try:
+                for rows in load_batches():
+                    with self._lock:
+                        for row in rows:
+                            self._add(row[0], row[1], row[2])
+            except BaseException:
+                with self._lock:
+                    self._clear()
+                raise
+            with self._lock:
+                for operation, args in self._pending:
+                    operation(*args)
+                self._pending = []
+                self.state = self.READY
+
+    def add(self, task_id, title, description):
+        """
+        Indexa (ou reindexa) o texto de uma tarefa
+        """
+        self._apply(self._add, (task_id, title, description))
+
+    def remove(self, task_id):
+        self._apply(self._remove, (task_id,))
+
+    def _apply(self, operation, args):
+        with self._lock:
+            if self.state == self.READY:
+                operation(*args)
+            elif self.state == self.BUILDING:
+                self._pending.append((operation, args))
+
+    def _add(self, task_id, title, description):
+        self._remove(task_id)
+        terms = Counter(tokenize(description))
+        for token in tokenize(title):
+            terms[token] += TITLE_WEIGHT
+        length = sum(terms.values())
+        self._documents[task_id] = (tuple(terms), length)
+        self._total_length += length
+        for token, frequency in terms.items():
+            self._postings.setdefault(token, {})[task_id] = frequency
+
+    def _remove(self, task_id):
+        document = self._documents.pop(task_id, None)
+        if document is None:
+            return
+        tokens, length = document
+        self._total_length -= length
+        for token in tokens:
+            postings = self._postings[token]
+            del postings[task_id]
+            if not postings:
+                del self._postings[token]
+
+    def _clear(self):
+        self._postings = {}
+        self._documents = {}
+        self._total_length = 0
+        self._pending = []
+        self.state = self.EMPTY
+
+    def search(self, query, limit, offset=0):
+        """
+        Tarefas que contêm algum dos termos, das mais relevantes para as menos
+
+        Args:
+            query (str): Texto buscado
+            limit (int): Máximo de resultados
+            offset (int): Resultados a pular
+        Returns:
+            list: Pares (id da tarefa, pontuação)
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._documents)
+            if not terms or not count:
+                return []
+            average_length = self._total_length / count
+            k1, b = self.k1, self.b
+            scores = {}
+            for token in terms:
+                postings = self._postings.get(token)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for task_id, frequency in postings.items():
+                    length = self._documents[task_id][1]
+                    weight = idf * frequency * (k1 + 1) / (
+                        frequency + k1 * (1 - b + b * length / average_length))
+                    scores[task_id] = scores.get(task_id, 0.0) + weight
+
+        # Só os primeiros offset + limit são ordenados, não todos os encontrados
+        best = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return best[offset:]
+
+    def stats(self):
+        with self._lock:
+            return {'enabled': self.enabled, 'state': self.state, 'documents': len(self._documents),
+                    'terms': len(self._postings)}
+
+
+search_index = InvertedIndex()
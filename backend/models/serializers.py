@@ -0,0 +1,87 @@
+"""
+Serialização rápida de tarefas para JSON
+Escreve as linhas do banco direto em bytes JSON, sem montar um dict por tarefa
+"""
+
+import json
+from json.encoder import encode_basestring
+from operator import attrgetter
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele, o caminho da biblioteca padrão é usado
+    orjson = None
+
+# Ordem das colunas nas linhas em tupla (SELECT id, title, ... updated_at)
+TASK_COLUMNS = ('id', 'title', 'description', 'status', 'created_at', 'due_date', 'updated_at')
+
+# Mesmos separadores do json.dumps padrão, para a saída não mudar de formato;
+# o caminho do orjson usa o mesmo molde, então os bytes não dependem dele
+_TASK_TEMPLATE = ('{"id": %d, "title": %s, "description": %s, "status": %s, '
+                  '"created_at": %s, "due_date": %s, "updated_at": %s}')
+_TASK_TEMPLATE_BYTES = _TASK_TEMPLATE.replace('%s', '%b').encode('ascii')
+
+# Extrai de uma Task a tupla na ordem de TASK_COLUMNS
+task_row = attrgetter(*TASK_COLUMNS)
+
+
+def _encode_stdlib(rows, separator):
+    # Campos resolvidos inline: uma chamada de função por campo custa mais que a formatação
+    string = encode_basestring
+    template = _TASK_TEMPLATE
+    return separator.join([
+        template % (
+            task_id, string(title),
+            'null' if description is None else string(description),
+            'null' if status is None else string(status),
+            'null' if created_at is None else f'"{created_at.isoformat()}"',
+            'null' if due_date is None else f'"{due_date.isoformat()}"',
+            'null' if updated_at is None else f'"{updated_at.isoformat()}"'
+        )
+        for task_id, title, description, status, created_at, due_date, updated_at in rows
+    ]).encode('utf-8')
+
+
+def _encode_orjson(rows, separator):
+    # orjson só escapa cada valor (strings, datas e None); o objeto vem do molde
+    value = orjson.dumps
+    template = _TASK_TEMPLATE_BYTES
+    return separator.encode('ascii').join([
+        template % (
+            task_id, value(title), value(description), value(status),
+            value(created_at), value(due_date), value(updated_at)
+        )
+        for task_id, title, description, status, created_at, due_date, updated_at in rows
+    ])
+
+
+def encode_task_rows(rows, separator=','):
+    """
+    Serializa linhas de tarefas como objetos JSON separados por `separator`
+
+    Args:
+        rows (iterable): Tuplas na ordem de TASK_COLUMNS
+        separator (str): ',' para o miolo de um array, '\\n' para NDJSON
+    Returns:
+        bytes: Objetos JSON em UTF-8, sem colchetes
+    """
+    if orjson is None:
+        return _encode_stdlib(rows, separator)
+    return _encode_orjson(rows, separator)
+
+
+def encode_tasks(tasks, separator=','):
+    """
+    Serializa instâncias de Task como encode_task_rows
+    """
+    return encode_task_rows(map(task_row, tasks), separator)
+
+
+def dumps(value):
+    """
+    json.dumps que devolve bytes UTF-8
+
+    Fica na biblioteca padrão: o orjson não tem os separadores com espaço, e
+    os valores passados aqui são pequenos (paginação, mensagens, IDs).
+    """
+    return json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
@@ -1,10 +1,28 @@
 from datetime import datetime
+import hashlib
 import json
-from database.connection import db
+from cache.task_cache import task_cache
+from models.change_feed import change_feed
+from models.search_index import InvertedIndex, search_index
+from models.task_stats import COMPLETED, task_stats
+from models.serializers import TASK_COLUMNS
+from observability.log import logger
+from reminders.scheduler import reminder_scheduler
+from observability.metrics import span
+from storage.base import UPDATABLE_COLUMNS
+from storage.task_store import task_store
+
+# Modo enqueue da escrita adiada: o cache é invalidado de novo quando o lote é gravado
+if hasattr(task_store, 'on_commit'):
+    task_store.on_commit(task_cache.invalidate_tasks)
+
 
 class Task:
+    # Sem __dict__ por instância: listas grandes de tarefas ocupam bem menos memória
+    __slots__ = TASK_COLUMNS
+    
     def __init__(self, id=None, title="", description="", status="pendente", 
-                 created_at=None, due_date=None):
+                 created_at=None, due_date=None, updated_at=None):
         """
         Inicializa uma nova tarefa
         Args:
@@ -14,6 +32,7 @@ class Task:
             status (str): Status da tarefa ('pendente' ou 'concluída')
             created_at (datetime): Data de criação
             due_date (datetime): Data de vencimento
+            updated_at (datetime): Data da última alteração no banco
         """
         self.id = id
         self.title = title
@@ -21,6 +40,7 @@ class Task:
         self.status = status
         self.created_at = created_at or datetime.now()
         self.due_date = due_date
+        self.updated_at = updated_at
     
     def to_dict(self):
         """
@@ -34,7 +54,8 @@ class Task:
             'description': self.description,
             'status': self.status,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'due_date': self.due_date.isoformat() if self.due_date else None
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
     def to_json(self):
@@ -54,121 +75,470 @@ class Task:
         Returns:
             Task: Nova instância de Task
         """
-        # Converter strings de data para datetime
-        created_at = None
-        due_date = None
-        
-        if data.get('created_at'):
-            if isinstance(data['created_at'], str):
-                created_at = datetime.fromisoformat(data['created_at'].replace('Z', '+00:00'))
-            else:
-                created_at = data['created_at']
-        
-        if data.get('due_date'):
-            if isinstance(data['due_date'], str):
-                due_date = datetime.fromisoformat(data['due_date'].replace('Z', '+00:00'))
-            else:
-                due_date = data['due_date']
-        
         return Task(
             id=data.get('id'),
             title=data.get('title', ''),
             description=data.get('description', ''),
             status=data.get('status', 'pendente'),
-            created_at=created_at,
-            due_date=due_date
+            created_at=Task._parse_datetime(data.get('created_at')),
+            due_date=Task._parse_datetime(data.get('due_date')),
+            updated_at=Task._parse_datetime(data.get('updated_at'))
         )
     
+    @staticmethod
+    def from_row(row):
+        """
+        Cria uma tarefa a partir de uma linha em tupla (ordem de TASK_COLUMNS)
+        
+        As datas já chegam do backend de armazenamento como datetime, então
+        nenhuma conversão é necessária.
+        """
+        return Task(*row)
+    
+    @staticmethod
+    def _parse_datetime(value):
+        """
+        Converte strings ISO em datetime; datetime e None seguem como estão
+        """
+        if not value or not isinstance(value, str):
+            return value or None
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    
+    def etag(self):
+        """
+        Gera a ETag forte da tarefa a partir de updated_at e dos valores da linha
+        
+        updated_at tem resolução de segundos, então os valores entram no hash
+        para diferenciar duas alterações feitas no mesmo segundo.
+        Returns:
+            str: ETag entre aspas, pronta para o header
+        """
+        values = (self.id, self.title, self.description, self.status,
+                  self.created_at, self.due_date, self.updated_at)
+        digest = hashlib.blake2b(repr(values).encode('utf-8'), digest_size=8).hexdigest()
+        return f'"t{self.id}-{digest}"'
+    
+    @staticmethod
+    def get_table_version():
+        """
+        Lê a versão da tabela de tarefas, incrementada pelo backend a cada escrita
+        
+        É uma leitura pela chave primária, bem mais barata que listar as tarefas
+        para descobrir se algo mudou.
+        Returns:
+            tuple: (versão, data da última escrita) ou None se indisponível
+        """
+        try:
+            return task_store.get_table_version()
+        except Exception as e:
+            logger.error("Erro ao buscar versão da tabela de tarefas", error=str(e))
+            return None
+    
     @staticmethod
     def get_all():
         try:
-            query = """
-                SELECT id, title, description, status, created_at, due_date
-                FROM tasks
-                ORDER BY created_at DESC
-            """
-            results = db.execute_query(query)
-            
-            tasks = []
-            for row in results:
-                task = Task.from_dict(row)
-                tasks.append(task)
-            
-            return tasks
+            return [Task.from_row(row) for batch in task_store.stream_rows() for row in batch]
             
         except Exception as e:
-            print(f"Erro ao buscar tarefas: {e}")
+            logger.error("Erro ao buscar tarefas", error=str(e))
             return []
     
+    @staticmethod
+    def get_page(limit, after=None, status=None, due_from=None, due_to=None):
+        """
+        Busca uma página de tarefas com paginação por cursor (keyset)
+        
+        Nos backends SQL a ordenação (created_at DESC, id DESC) é servida pelos
+        índices idx_tasks_created_id / idx_tasks_status_created, então o custo
+        de cada página independe do tamanho da tabela e da posição na listagem.
+        
+        Args:
+            limit (int): Quantidade máxima de tarefas na página
+            after (tuple): (created_at, id) da última tarefa da página anterior
+            status (str): Filtra pelo status
+            due_from (datetime): Vencimento a partir desta data (inclusive)
+            due_to (datetime): Vencimento antes desta data (exclusive)
+        Returns:
+            tuple: (lista de Task, há mais páginas)
+        """
+        page_key = (limit, after, status, due_from, due_to)
+        results = task_cache.get_page(page_key)
+        if results is None:
+            token = task_cache.read_token()
+            # Uma linha extra indica se existe próxima página
+            results = task_store.list_rows(limit + 1, after, status, due_from, due_to)
+            task_cache.set_page(page_key, results, token)
+        
+        with span('hydration'):
+            tasks = [Task.from_row(row) for row in results[:limit]]
+        return tasks, len(results) > limit
+    
+    @staticmethod
+    def stream(after=None, status=None, due_from=None, due_to=None, batch_size=500):
+        """
+        Percorre as tarefas filtradas em lotes, sem carregar a tabela em memória
+        
+        Args:
+            after (tuple): (created_at, id) a partir do qual continuar
+            status (str): Filtra pelo status
+            due_from (datetime): Vencimento a partir desta data (inclusive)
+            due_to (datetime): Vencimento antes desta data (exclusive)
+            batch_size (int): Tarefas por lote
+        Yields:
+            list: Lote de instâncias de Task
+        """
+        for rows in Task.stream_rows(after, status, due_from, due_to, batch_size):
+            with span('hydration'):
+                tasks = [Task.from_row(row) for row in rows]
+            yield tasks
+    
+    @staticmethod
+    def stream_rows(after=None, status=None, due_from=None, due_to=None, batch_size=500):
+        """
+        Como stream(), mas entrega as linhas cruas em tupla (ordem de TASK_COLUMNS),
+        para serialização direta sem criar objetos Task
+        Yields:
+            list: Lote de tuplas
+        """
+        yield from task_store.stream_rows(after, status, due_from, due_to, batch_size)
+    
+    @staticmethod
+    def search(query, limit, offset=0):
+        """
+        Busca textual em título e descrição, ordenada por relevância
+        
+        Usa o full-text do backend (FULLTEXT no MySQL, FTS5 no SQLite); sem ele,
+        o índice invertido em memória, montado na primeira busca, ou, com o
+        índice desligado (modo multiprocesso), um índice montado a cada busca.
+        
+        Args:
+            query (str): Texto buscado
+            limit (int): Quantidade máxima de tarefas
+            offset (int): Resultados a pular
+        Returns:
+            tuple: (lista de Task, há mais resultados)
+        """
+        if task_store.supports_search:
+            rows = [row for row, _ in task_store.search(query, limit + 1, offset)]
+        else:
+            index = search_index if search_index.enabled else InvertedIndex()
+            with span('search_index'):
+                index.ensure_built(task_store.stream_rows)
+                hits = index.search(query, limit + 1, offset)
+            rows = [row for row in (task_store.get_row(task_id) for task_id, _ in hits) if row]
+        
+        with span('hydration'):
+            tasks = [Task.from_row(row) for row in rows[:limit]]
+        return tasks, len(rows) > limit
+    
+    @staticmethod
+    def changes_since(since, limit):
+        """
+        Tarefas criadas, alteradas ou removidas depois de uma versão do change_feed
+        
+        O custo depende só de quantas tarefas mudaram: o log diz quais IDs
+        ler, e cada tarefa vem do cache ou de uma leitura pela chave primária.
+        
+        Args:
+            since (int): Última versão vista pelo cliente
+            limit (int): Máximo de tarefas distintas
+        Returns:
+            tuple: (lista de Task, IDs removidos, versão até onde as alterações
+                foram lidas) ou None se a versão for desconhecida
+        """
+        result = change_feed.changes_since(since, limit)
+        if result is None:
+            return None
+        changes, version = result
+        
+        tasks, deleted = [], []
+        for task_id, removed in changes.items():
+            row = None if removed else Task._load_row(task_id)
+            if row is None:
+                deleted.append(task_id)
+            else:
+                tasks.append(Task.from_row(row))
+        return tasks, deleted, version
+    
+    @staticmethod
+    def _load_row(task_id):
+        """
+        Lê a linha da tarefa pelo cache, recorrendo ao backend na falta
+        Raises:
+            Exception: Erros do backend propagam
+        """
+        row = task_cache.get_task(task_id)
+        if row:
+            return row
+        
+        token = task_cache.read_token()
+        row = task_store.get_row(task_id)
+        if row:
+            task_cache.set_task(task_id, row, token)
+        return row
+    
+    @staticmethod
+    def get_stats():
+        """
+        Contagens por status e por vencimento das tarefas pendentes
+        
+        A primeira chamada faz a carga inicial com um GROUP BY; depois as
+        estatísticas vêm dos contadores mantidos pelas escritas.
+        Returns:
+            dict: Estatísticas de TaskStats.snapshot()
+        """
+        task_stats.ensure_loaded(
+            task_store.count_by_status_and_due_day,
+            lambda due_from, due_to: (
+                row[5]
+                for rows in task_store.stream_rows(status='pendente', due_from=due_from, due_to=due_to)
+                for row in rows
+            )
+        )
+        return task_stats.snapshot()
+    
+    @staticmethod
+    def start_reminders():
+        """
+        Inicia o agendador de lembretes com os vencimentos futuros das tarefas
+        pendentes (nada acontece com REMINDERS_ENABLED desligado)
+        """
+        reminder_scheduler.start(
+            lambda due_from: task_store.stream_rows(status='pendente', due_from=due_from)
+        )
+    
     @staticmethod
     def get_by_id(task_id):
         try:
-            query = """
-                SELECT id, title, description, status, created_at, due_date
-                FROM tasks
-                WHERE id = %s
-            """
-            results = db.execute_query(query, (task_id,))
-            
-            if results:
-                return Task.from_dict(results[0])
-            return None
+            row = Task._load_row(task_id)
+            return Task.from_row(row) if row else None
             
         except Exception as e:
-            print(f"Erro ao buscar tarefa {task_id}: {e}")
+            logger.error("Erro ao buscar tarefa", task_id=task_id, error=str(e))
             return None
     
+    @staticmethod
+    def _after_write(task_ids, *steps):
+        """
+        Atualiza o estado derivado (cache, índice, registro de alterações,
+        estatísticas, lembretes) de uma escrita já gravada
+        
+        Cada passo roda mesmo que um anterior falhe. Uma falha aqui não torna
+        a escrita malsucedida: quem chamou receberia um erro para algo salvo e,
+        repetindo, duplicaria a tarefa. Só o log a registra; as estatísticas
+        são corrigidas na próxima reconciliação.
+        
+        Args:
+            task_ids (iterable): IDs afetados, para o log
+            steps (callable): Passos sem argumentos, na ordem
+        """
+        for step in steps:
+            try:
+                step()
+            except Exception as e:
+                logger.error("Erro ao atualizar estado derivado após escrita",
+                             task_ids=sorted(task_ids), error=str(e))
+    
     def save(self):
         try:
+            before = None
             if self.id:
-                # Atualizar tarefa existente
-                query = """
-                    UPDATE tasks 
-                    SET title = %s, description = %s, status = %s, due_date = %s
-                    WHERE id = %s
-                """
-                params = (self.title, self.description, self.status, self.due_date, self.id)
+                # Atualizar tarefa existente; o backend devolve o estado anterior
+                before = task_store.update(self.id, self.title, self.description,
+                                           self.status, self.due_date)
+                if before is None:
+                    return False
             else:
                 # Criar nova tarefa
-                query = """
-                    INSERT INTO tasks (title, description, status, due_date)
-                    VALUES (%s, %s, %s, %s)
-                """
-                params = (self.title, self.description, self.status, self.due_date)
-            
-            db.execute_query(query, params)
-            
-            # Se é uma nova tarefa, buscar o ID gerado
-            if not self.id:
-                query = "SELECT LAST_INSERT_ID() as id"
-                result = db.execute_query(query)
-                if result:
-                    self.id = result[0]['id']
+                self.id = task_store.insert(self.title, self.description,
+                                            self.status, self.due_date)
             
-            return True
+        except Exception as e:
+            logger.error("Erro ao salvar tarefa", task_id=self.id, error=str(e))
+            return False
+        
+        Task._after_write(
+            [self.id],
+            lambda: task_cache.invalidate_task(self.id),
+            lambda: search_index.add(self.id, self.title, self.description),
+            lambda: change_feed.record([self.id]),
+            lambda: task_stats.apply(before, (self.status, self.due_date)),
+            lambda: reminder_scheduler.schedule(self.id, self.title, self.status, self.due_date)
+        )
+        return True
+    
+    @staticmethod
+    def update_fields(task_id, fields):
+        """
+        Atualiza apenas as colunas informadas e devolve a tarefa resultante
+        
+        O backend altera a linha e a devolve na mesma operação, junto com o
+        estado anterior usado por task_stats; nenhuma linha encontrada
+        significa que a tarefa não existe.
+        
+        Args:
+            task_id (int): ID da tarefa
+            fields (dict): Colunas a alterar (title, description, status, due_date)
+        Returns:
+            Task: Tarefa atualizada ou None se não existir
+        Raises:
+            ValueError: Se alguma coluna não puder ser alterada
+        """
+        invalid = set(fields) - UPDATABLE_COLUMNS
+        if invalid:
+            raise ValueError(f"Colunas não atualizáveis: {', '.join(sorted(invalid))}")
+        if not fields:
+            return Task.get_by_id(task_id)
+        
+        result = task_store.update_fields(task_id, fields)
+        if result is None:
+            return None
+        row, before = result
+        
+        steps = [lambda: task_cache.invalidate_task(task_id)]
+        if 'title' in fields or 'description' in fields:
+            steps.append(lambda: search_index.add(row[0], row[1], row[2]))
+        steps.append(lambda: change_feed.record([task_id]))
+        steps.append(lambda: task_stats.apply(before, (row[3], row[5])))
+        if 'status' in fields or 'due_date' in fields or 'title' in fields:
+            steps.append(lambda: reminder_scheduler.schedule(task_id, row[1], row[3], row[5]))
+        Task._after_write([task_id], *steps)
+        return Task.from_row(row)
+    
+    @staticmethod
+    def delete_by_id(task_id):
+        """
+        Remove a tarefa com uma única operação no backend
+        Returns:
+            bool: True se a tarefa existia
+        """
+        before = task_store.delete(task_id)
+        if before is None:
+            return False
+        
+        Task._after_write(
+            [task_id],
+            lambda: task_cache.invalidate_task(task_id),
+            lambda: search_index.remove(task_id),
+            lambda: change_feed.record([task_id], deleted=True),
+            lambda: task_stats.apply(before, None),
+            lambda: reminder_scheduler.unschedule(task_id)
+        )
+        return True
+    
+    @staticmethod
+    def save_many(tasks):
+        """
+        Insere várias tarefas novas em uma única transação
+        
+        Args:
+            tasks (list): Instâncias de Task ainda sem ID
+        Returns:
+            bool: True se todas foram salvas; em caso de erro nada é gravado
+        """
+        try:
+            ids = task_store.insert_many([
+                (task.title, task.description, task.status, task.due_date) for task in tasks
+            ])
+            for task, task_id in zip(tasks, ids):
+                task.id = task_id
             
         except Exception as e:
-            print(f"Erro ao salvar tarefa: {e}")
+            for task in tasks:
+                task.id = None
+            logger.error("Erro ao salvar tarefas em lote", count=len(tasks), error=str(e))
             return False
+        
+        def index_and_schedule():
+            for task in tasks:
+                search_index.add(task.id, task.title, task.description)
+                reminder_scheduler.schedule(task.id, task.title, task.status, task.due_date)
+        
+        Task._after_write(
+            ids,
+            lambda: task_cache.invalidate_tasks(ids),
+            lambda: task_stats.apply_many([(None, (task.status, task.due_date)) for task in tasks]),
+            index_and_schedule,
+            lambda: change_feed.record(ids)
+        )
+        return True
+    
+    @staticmethod
+    def complete_many(task_ids):
+        """
+        Marca várias tarefas como concluídas em uma única transação
+        Args:
+            task_ids (list): IDs das tarefas
+        Returns:
+            set: IDs que existiam e foram concluídos
+        Raises:
+            Exception: Erros do backend propagam; a transação é desfeita
+        """
+        previous = task_store.complete_many(task_ids)
+        found = set(previous)
+        
+        def unschedule():
+            for task_id in found:
+                reminder_scheduler.unschedule(task_id)
+        
+        Task._after_write(
+            found,
+            lambda: task_cache.invalidate_tasks(found),
+            lambda: change_feed.record(found),
+            lambda: task_stats.apply_many([(before, (COMPLETED, before[1])) for before in previous.values()]),
+            unschedule
+        )
+        return found
+    
+    @staticmethod
+    def delete_many(task_ids):
+        """
+        Remove várias tarefas em uma única transação
+        Args:
+            task_ids (list): IDs das tarefas
+        Returns:
+            set: IDs que existiam e foram removidos
+        Raises:
+            Exception: Erros do backend propagam; a transação é desfeita
+        """
+        previous = task_store.delete_many(task_ids)
+        found = set(previous)
+        
+        def forget():
+            for task_id in found:
+                search_index.remove(task_id)
+                reminder_scheduler.unschedule(task_id)
+        
+        Task._after_write(
+            found,
+            lambda: task_cache.invalidate_tasks(found),
+            forget,
+            lambda: change_feed.record(found, deleted=True),
+            lambda: task_stats.apply_many([(before, None) for before in previous.values()])
+        )
+        return found
     
     def delete(self):
         try:
             if not self.id:
                 return False
             
-            query = "DELETE FROM tasks WHERE id = %s"
-            db.execute_query(query, (self.id,))
-            return True
+            return Task.delete_by_id(self.id)
             
         except Exception as e:
-            print(f"Erro ao deletar tarefa {self.id}: {e}")
+            logger.error("Erro ao deletar tarefa", task_id=self.id, error=str(e))
             return False
     
     def mark_as_completed(self):
         try:
-            self.status = 'concluída'
-            return self.save()
+            updated = Task.update_fields(self.id, {'status': 'concluída'})
+            if not updated:
+                return False
+            
+            self.status = updated.status
+            return True
             
         except Exception as e:
-            print(f"Erro ao marcar tarefa como concluída: {e}")
-            return False 
\ No newline at end of file
+            logger.error("Erro ao marcar tarefa como concluída", task_id=self.id, error=str(e))
+            return False 
+
@@ -0,0 +1,302 @@
+"""
+Estatísticas agregadas das tarefas
+Contadores mantidos pelas escritas de Task e reconciliados periodicamente
+com um GROUP BY no backend; GET /tasks/stats não percorre as tarefas
+"""
+
+import bisect
+import os
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from config import load_env_file
+from observability.log import logger
+
+PENDING = 'pendente'
+COMPLETED = 'concluída'
+
+
+def get_stats_config():
+    load_env_file()
+
+    return {
+        'reconcile_interval': float(os.getenv('TASK_STATS_RECONCILE_INTERVAL', '300'))
+    }
+
+
+def _as_local(due_date):
+    """
+    Vencimento com fuso (ex.: "...Z" no JSON) como horário local sem fuso,
+    comparável com datetime.now() e com os demais vencimentos
+    """
+    if isinstance(due_date, datetime) and due_date.tzinfo is not None:
+        return due_date.astimezone().replace(tzinfo=None)
+    return due_date
+
+
+def _due_day(due_date):
+    due_date = _as_local(due_date)
+    return due_date.date() if isinstance(due_date, datetime) else due_date
+
+
+def _due_time(due_date):
+    due_date = _as_local(due_date)
+    # Vencimento só com o dia vale a partir da meia-noite
+    return due_date if isinstance(due_date, datetime) else datetime.combine(due_date, datetime.min.time())
+
+
+class TaskStats:
+    """
+    Contagem por status e, para as pendentes, por dia de vencimento
+
+    Os contadores só começam a valer no primeiro pedido de estatísticas, que
+    faz a carga inicial; antes disso as escritas não custam nada. Cada escrita
+    informa o estado anterior da tarefa (status, vencimento), devolvido pelo
+    próprio backend na escrita, e o novo, e os contadores mudam pela diferença.
+    Escritas que correm junto com a carga ou feitas fora da aplicação podem
+    desviar a contagem, então uma thread de fundo refaz o GROUP BY a cada
+    reconcile_interval segundos e registra o desvio encontrado.
+
+    Os dias anteriores a hoje contam inteiros como vencidos; para hoje, os
+    horários exatos de vencimento ficam em uma lista ordenada, e as tarefas
+    de hoje passam de "vencem hoje" para "vencidas" quando o horário chega.
+    A lista é recarregada na reconciliação e na virada do dia.
+
+    Com incremental = False (modo multiprocesso, em que cada processo só vê
+    as próprias escritas) não há contadores mantidos nem thread: cada pedido
+    refaz o GROUP BY.
+    """
+
+    EMPTY, LOADING, READY = 'empty', 'loading', 'ready'
+
+    def __init__(self, reconcile_interval=300):
+        """
+        Args:
+            reconcile_interval (float): Segundos entre reconciliações com o backend
+        """
+        self.reconcile_interval = reconcile_interval
+        self.state = self.EMPTY
+        self.incremental = True
+        self._by_status = Counter()
+        self._pending_due = Counter()
+        # Dia acompanhado com horário exato e os vencimentos das pendentes desse dia
+        self._day = None
+        self._day_due = []
+        self._pending = []
+        self._version = 0
+        self._snapshot = None
+        self._reconciled_at = None
+        self._last_drift = 0
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._thread = None
+        self._load_counts = None
+        self._load_due_times = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(**get_stats_config())
+
+    def ensure_loaded(self, load_counts, load_due_times):
+        """
+        Faz a carga inicial na primeira chamada e inicia as reconciliações
+
+        Args:
+            load_counts (callable): Devolve tuplas (status, dia de vencimento,
+                quantidade), como StorageBackend.count_by_status_and_due_day
+            load_due_times (callable): load_due_times(início, fim) devolve os
+                vencimentos das tarefas pendentes em [início, fim)
+        """
+        if not self.incremental:
+            self._load_counts = load_counts
+            self._load_due_times = load_due_times
+            self.reconcile()
+            return
+        if self._reconciled_at is not None:
+            return
+        with self._load_lock:
+            if self._reconciled_at is not None:
+                return
+            self._load_counts = load_counts
+            self._load_due_times = load_due_times
+            self.reconcile()
+            self._thread = threading.Thread(target=self._run, name='task-stats', daemon=True)
+            self._thread.start()
+
+    def apply(self, before, after):
+        """
+        Ajusta os contadores por uma escrita
+
+        Args:
+            before (tuple): (status, vencimento) antes da escrita, ou None se a tarefa é nova
+            after (tuple): (status, vencimento) depois da escrita, ou None se foi removida
+        """
+        with self._lock:
+            if self.state == self.READY:
+                self._apply(before, after)
+            elif self.state == self.LOADING:
+                self._pending.append((before, after))
+
+    def apply_many(self, changes):
+        """
+        Como apply, para as escritas em lote
+
+        Args:
+            changes (list): Pares (antes, depois)
+        """
+        if not changes:
+            return
+        with self._lock:
+            if self.state == self.READY:
+                for before, after in changes:
+                    self._apply(before, after)
+            elif self.state == self.LOADING:
+                self._pending.extend(changes)
+
+    def _apply(self, before, after):
+        if before is not None:
+            self._count(before, -1)
+        if after is not None:
+            self._count(after, 1)
+        self._version += 1
+
+    def _count(self, state, delta):
+        status, due_date = state
+        self._by_status[status] += delta
+        if status != PENDING:
+            return
+        due_day = _due_day(due_date)
+        self._pending_due[due_day] += delta
+        if due_day is not None and due_day == self._day:
+            due_time = _due_time(due_date)
+            if delta > 0:
+                bisect.insort(self._day_due, due_time)
+            else:
+                index = bisect.bisect_left(self._day_due, due_time)
+                if index < len(self._day_due) and self._day_due[index] == due_time:
+                    del self._day_due[index]
+
+    def reconcile(self, today=None):
+        """
+        Recalcula os contadores pelo GROUP BY do backend e recarrega os
+        vencimentos de hoje
+
+        Escritas feitas durante a consulta são reaplicadas sobre o resultado.
+        """
+        today = today or date.today()
+        with self._reconcile_lock:
+            with self._lock:
+                previous_state = self.state
+                self.state = self.LOADING
+                self._pending = []
+            try:
+                rows = self._load_counts()
+                day_start = datetime.combine(today, datetime.min.time())
+                day_due = sorted(_due_time(due_date) for due_date in
+                                 self._load_due_times(day_start, day_start + timedelta(days=1)))
+            except BaseException:
+                with self._lock:
+                    self.state = previous_state
+                    self._pending = []
+                raise
+
+            by_status = Counter()
+            pending_due = Counter()
+            for status, due_day, count in rows:
+                by_status[status] += count
+                if status == PENDING:
+                    pending_due[due_day] += count
+
+            with self._lock:
+                if previous_state == self.READY and self.incremental:
+                    self._last_drift = self._drift(by_status, pending_due)
+                self._by_status = by_status
+                self._pending_due = pending_due
+                self._day = today
+                self._day_due = day_due
+                for before, after in self._pending:
+                    self._apply(before, after)
+                self._pending = []
+                self._version += 1
+                self._reconciled_at = datetime.now()
+                # Sem contadores mantidos, as escritas seguintes são ignoradas
+                self.state = self.READY if self.incremental else self.EMPTY
+
+    def _drift(self, by_status, pending_due):
+        """
+        Soma das diferenças entre os contadores mantidos e os recalculados
+        """
+        drift = 0
+        for current, fresh in ((self._by_status, by_status), (self._pending_due, pending_due)):
+            for key in set(current) | set(fresh):
+                drift += abs(current[key] - fresh[key])
+        return drift
+
+    def _run(self):
+        while True:
+            time.sleep(self.reconcile_interval)
+            started = time.perf_counter()
+            try:
+                self.reconcile()
+            except Exception as e:
+                logger.error("Erro ao reconciliar estatísticas de tarefas", error=str(e))
+                continue
+            if self._last_drift:
+                logger.warning("Estatísticas de tarefas corrigidas na reconciliação",
+                               drift=self._last_drift,
+                               seconds=round(time.perf_counter() - started, 3))
+
+    def snapshot(self, now=None):
+        """
+        Estatísticas atuais; recalculadas só quando houve escrita ou algum
+        vencimento passou
+
+        O custo depende do número de dias distintos com tarefas pendentes,
+        não do número de tarefas. Na virada do dia os contadores são
+        reconciliados antes, para carregar os vencimentos do novo dia.
+        Returns:
+            dict: Contagens por status, vencidas (vencimento antes de agora),
+                vencendo no resto de hoje e até o fim da semana
+        """
+        now = now or datetime.now()
+        today = now.date()
+        if self._day != today:
+            self.reconcile(today)
+        with self._lock:
+            passed = bisect.bisect_left(self._day_due, now)
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot[0] == (self._version, today, passed):
+                return snapshot[1]
+
+            # Semana de segunda a domingo; "nesta semana" inclui o resto de hoje
+            week_end = today + timedelta(days=6 - today.weekday())
+            due_today = len(self._day_due) - passed
+            overdue, due_this_week, without_due_date = passed, due_today, 0
+            for due_day, count in self._pending_due.items():
+                if due_day is None:
+                    without_due_date += count
+                elif due_day < today:
+                    overdue += count
+                elif today < due_day <= week_end:
+                    due_this_week += count
+
+            stats = {
+                'total': sum(self._by_status.values()),
+                'by_status': dict({PENDING: 0, COMPLETED: 0}, **{
+                    status: count for status, count in self._by_status.items() if count
+                }),
+                'overdue': overdue,
+                'due_today': due_today,
+                'due_this_week': due_this_week,
+                'pending_without_due_date': without_due_date,
+                'as_of': now.isoformat(timespec='seconds'),
+                'reconciled_at': self._reconciled_at.isoformat() if self._reconciled_at else None,
+                'last_reconcile_drift': self._last_drift
+            }
+            self._snapshot = ((self._version, today, passed), stats)
+            return stats
+
+
+task_stats = TaskStats.from_env()
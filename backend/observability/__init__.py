@@ -0,0 +1 @@
+# Pacote observability 
\ No newline at end of file
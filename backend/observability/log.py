@@ -0,0 +1,245 @@
+"""
+Log estruturado assíncrono
+As requisições só enfileiram registros em memória; uma thread de fundo os
+formata e escreve em lotes, então um stdout lento nunca segura a resposta
+"""
+
+import atexit
+import collections
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from config import load_env_file, on_reload
+
+LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+
+
+def get_logging_config():
+    load_env_file()
+
+    return {
+        'destination': os.getenv('LOG_DESTINATION', 'stdout'),
+        'log_format': os.getenv('LOG_FORMAT', 'json').lower(),
+        'level': os.getenv('LOG_LEVEL', 'info').lower(),
+        'max_queue': int(os.getenv('LOG_QUEUE_SIZE', '10000')),
+        'batch_size': int(os.getenv('LOG_BATCH_SIZE', '256')),
+        'flush_interval': float(os.getenv('LOG_FLUSH_INTERVAL', '0.5')),
+        'access_sample_rate': float(os.getenv('LOG_ACCESS_SAMPLE_RATE', '1.0'))
+    }
+
+
+class AsyncLogger:
+    """
+    Logger com fila limitada e escrita em lotes por uma thread de fundo
+
+    Com a fila cheia o registro é descartado e contado em `dropped`, em vez de
+    bloquear quem está atendendo a requisição. Logs de acesso podem ser
+    amostrados; avisos, erros e respostas 5xx não passam pela amostragem.
+    """
+
+    def __init__(self, destination='stdout', log_format='json', level='info', max_queue=10000,
+                 batch_size=256, flush_interval=0.5, access_sample_rate=1.0):
+        """
+        Args:
+            destination (str): 'stdout', 'stderr' ou caminho de um arquivo (anexado)
+            log_format (str): 'json' (um objeto por linha) ou 'text'
+            level (str): Nível mínimo: debug, info, warning ou error
+            max_queue (int): Registros aguardando escrita antes de descartar
+            batch_size (int): Registros por escrita; uma fila com um lote
+                completo acorda o escritor antes do intervalo
+            flush_interval (float): Segundos máximos entre escritas
+            access_sample_rate (float): Fração dos logs de acesso mantida (0 a 1)
+        Raises:
+            ValueError: Se o formato ou o nível forem desconhecidos
+        """
+        if log_format not in ('json', 'text'):
+            raise ValueError(f"Formato de log inválido: {log_format}")
+        if level not in LEVELS:
+            raise ValueError(f"Nível de log inválido: {level}")
+
+        self.destination = destination
+        self.log_format = log_format
+        self.level = LEVELS[level]
+        self.max_queue = max_queue
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.access_sample_rate = access_sample_rate
+
+        # append/popleft de deque são atômicos: a fila não precisa de lock
+        self._buffer = collections.deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._stream = None
+        self._owns_stream = False
+        self._counters = {
+            'written': 0,
+            'dropped': 0,
+            'sampled_out': 0,
+            'write_errors': 0
+        }
+
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls):
+        return cls(**get_logging_config())
+
+    def debug(self, event, **fields):
+        self.log('debug', event, fields)
+
+    def info(self, event, **fields):
+        self.log('info', event, fields)
+
+    def warning(self, event, **fields):
+        self.log('warning', event, fields)
+
+    def error(self, event, **fields):
+        self.log('error', event, fields)
+
+    def access(self, method, path, status, client=None, **fields):
+        """
+        Registra uma requisição atendida, sujeito à amostragem
+        """
+        if status < 500 and self.access_sample_rate < 1.0 and random.random() >= self.access_sample_rate:
+            self._count('sampled_out')
+            return
+        fields['method'] = method
+        fields['path'] = path
+        fields['status'] = status
+        if client is not None:
+            fields['client'] = client
+        self.log('info', 'request', fields)
+
+    def log(self, level, event, fields):
+        """
+        Enfileira um registro; nunca bloqueia nem levanta exceção
+        """
+        if LEVELS[level] < self.level:
+            return
+        buffer = self._buffer
+        if len(buffer) >= self.max_queue:
+            self._count('dropped')
+            return
+        buffer.append((time.time(), level, event, fields))
+        if len(buffer) >= self.batch_size:
+            self._wake.set()
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+
+    def _flush(self):
+        buffer = self._buffer
+        while buffer:
+            batch = []
+            try:
+                for _ in range(self.batch_size):
+                    batch.append(buffer.popleft())
+            except IndexError:
+                pass
+            self._write(batch)
+
+    def _write(self, batch):
+        try:
+            text = ''.join([self._format(record) for record in batch])
+            stream = self._open()
+            stream.write(text)
+            stream.flush()
+        except (OSError, ValueError, TypeError) as e:
+            with self._lock:
+                self._counters['write_errors'] += 1
+            try:
+                sys.stderr.write(f"Erro ao escrever {len(batch)} registros de log: {e}\n")
+            except (OSError, ValueError):
+                pass
+            return
+        with self._lock:
+            self._counters['written'] += len(batch)
+
+    def _open(self):
+        # stdout/stderr são lidos a cada lote: quem os redireciona (testes,
+        # contextlib.redirect_stdout) não deixa o log preso a um stream fechado
+        if self.destination == 'stdout':
+            return sys.stdout
+        if self.destination == 'stderr':
+            return sys.stderr
+        if self._stream is None:
+            self._stream = open(self.destination, 'a', encoding='utf-8')
+            self._owns_stream = True
+        return self._stream
+
+    def _format(self, record):
+        created, level, event, fields = record
+        timestamp = datetime.fromtimestamp(created).isoformat(timespec='milliseconds')
+        if self.log_format == 'json':
+            entry = {'ts': timestamp, 'level': level, 'event': event}
+            entry.update(fields)
+            return json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+        details = ' '.join(f'{name}={value}' for name, value in fields.items())
+        return f"{timestamp} {level.upper()} {event}{' ' + details if details else ''}\n"
+
+    def flush(self, timeout=5):
+        """
+        Pede a escrita imediata e espera a fila esvaziar
+        """
+        self._wake.set()
+        deadline = time.monotonic() + timeout
+        while self._buffer and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def close(self):
+        """
+        Escreve o que ainda estiver na fila e encerra a thread
+        """
+        if self._stopping:
+            return
+        self._stopping = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self._flush()
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+
+    def reconfigure(self, changed=None):
+        """
+        Aplica LOG_LEVEL e LOG_ACCESS_SAMPLE_RATE do ambiente (gancho de reload_env_file);
+        destino, formato e fila só mudam reiniciando o processo
+        """
+        try:
+            config = get_logging_config()
+            if config['level'] not in LEVELS:
+                raise ValueError(f"Nível de log inválido: {config['level']}")
+        except ValueError as e:
+            self.warning("Configuração de log recarregada ignorada", error=str(e))
+            return
+        self.level = LEVELS[config['level']]
+        self.access_sample_rate = config['access_sample_rate']
+
+    def stats(self):
+        """
+        Returns:
+            dict: Registros na fila, escritos, descartados e amostrados
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        counters['queued'] = len(self._buffer)
+        counters['max_queue'] = self.max_queue
+        counters['access_sample_rate'] = self.access_sample_rate
+        return counters
+
+
+logger = AsyncLogger.from_env()
+on_reload(logger.reconfigure)
@@ -0,0 +1,299 @@
+"""
+Métricas de latência por rota
+Spans medem as etapas de cada requisição (roteamento, checkout de conexão,
+query, hidratação, serialização, escrita no socket); os totais viram
+histogramas expostos em GET /metrics no formato texto do Prometheus
+"""
+
+import bisect
+import contextvars
+import os
+import threading
+import time
+from config import load_env_file
+
+# Limites dos buckets em segundos: de 50µs (cache, SQLite) a 10s
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = 'unmatched'
+
+# Trace da requisição em andamento na thread (ou tarefa asyncio) atual
+_current_trace = contextvars.ContextVar('request_trace', default=None)
+
+
+def get_metrics_config():
+    load_env_file()
+
+    return {
+        'enabled': os.getenv('METRICS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    }
+
+
+class Histogram:
+    """
+    Histograma de buckets fixos, cumulativo só na exposição
+    """
+    __slots__ = ('buckets', 'counts', 'total', 'count', '_lock')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # Um contador extra para o bucket +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def snapshot(self):
+        """
+        Returns:
+            tuple: (contagens cumulativas por bucket incluindo +Inf, soma, total)
+        """
+        with self._lock:
+            counts, total, count = list(self.counts), self.total, self.count
+        cumulative = []
+        running = 0
+        for value in counts:
+            running += value
+            cumulative.append(running)
+        return cumulative, total, count
+
+
+class _NullSpan:
+    """
+    Span sem efeito, devolvido quando não há requisição sendo medida
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('trace', 'name', 'started')
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.trace.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class RequestTrace:
+    """
+    Tempos acumulados por etapa durante uma requisição
+
+    Uma etapa executada várias vezes (ex.: uma query por lote no streaming)
+    soma suas durações, então o histograma mostra quanto cada requisição
+    gastou em cada etapa.
+    """
+    __slots__ = ('method', 'started', 'spans', '_lock')
+
+    def __init__(self, method):
+        self.method = method
+        self.started = time.perf_counter()
+        self.spans = {}
+        # O corpo em streaming pode ser produzido por threads diferentes
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+
+def span(name):
+    """
+    Mede um trecho da requisição atual
+
+        with span('query'):
+            ...
+
+    Sem requisição sendo medida (métricas desativadas, threads de fundo)
+    devolve um contexto vazio: o custo é uma leitura de ContextVar.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name)
+
+
+def bind_trace(trace):
+    """
+    Associa o trace ao contexto atual (None desassocia)
+    """
+    _current_trace.set(trace)
+
+
+def traced_iterator(trace, iterator):
+    """
+    Produz os itens do iterador com o trace associado a cada passo
+
+    O motor asyncio avança o corpo em streaming em threads do executor, fora
+    do contexto onde a requisição começou; assim os spans do streaming
+    continuam contando para a requisição certa.
+    """
+    try:
+        while True:
+            _current_trace.set(trace)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _current_trace.set(None)
+            yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close:
+            close()
+
+
+class MetricsRegistry:
+    """
+    Histogramas de requisições e spans por rota, e sua exposição para o Prometheus
+    """
+
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            enabled (bool): Quando False nenhuma requisição é medida
+            buckets (tuple): Limites superiores dos buckets em segundos
+        """
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # (rota, método) -> Histogram
+        self._requests = {}
+        # (rota, método, status) -> contagem
+        self._responses = {}
+        # (rota, span) -> Histogram
+        self._spans = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(**get_metrics_config())
+
+    def begin(self, request):
+        """
+        Inicia a medição de uma requisição e a associa ao contexto atual
+
+        Returns:
+            RequestTrace: Trace da requisição, ou None se desativado
+        """
+        if not self.enabled:
+            return None
+        trace = RequestTrace(request.method)
+        _current_trace.set(trace)
+        return trace
+
+    def end(self, trace, request, status_code):
+        """
+        Registra a requisição concluída (após a escrita da resposta)
+        """
+        if trace is None:
+            return
+        elapsed = time.perf_counter() - trace.started
+        route = request.route.pattern if request.route is not None else UNMATCHED_ROUTE
+
+        self._histogram(self._requests, (route, trace.method)).observe(elapsed)
+        with self._lock:
+            key = (route, trace.method, status_code)
+            self._responses[key] = self._responses.get(key, 0) + 1
+        with trace._lock:
+            spans = list(trace.spans.items())
+        for name, seconds in spans:
+            self._histogram(self._spans, (route, name)).observe(seconds)
+
+    def middleware(self, request, call_next):
+        """
+        Middleware do Router: o tempo até aqui é o roteamento; o resto, o handler
+        """
+        trace = _current_trace.get()
+        if trace is None:
+            return call_next(request)
+        started = time.perf_counter()
+        trace.add('routing', started - trace.started)
+        try:
+            return call_next(request)
+        finally:
+            trace.add('handler', time.perf_counter() - started)
+
+    def _histogram(self, table, key):
+        histogram = table.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = table.setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def render(self):
+        """
+        Returns:
+            str: Métricas no formato texto 0.0.4 do Prometheus
+        """
+        with self._lock:
+            requests = sorted(self._requests.items())
+            responses = sorted(self._responses.items())
+            spans = sorted(self._spans.items())
+
+        lines = [
+            '# HELP agenda_http_requests_total Requisições atendidas por rota, método e status.',
+            '# TYPE agenda_http_requests_total counter'
+        ]
+        for (route, method, status_code), count in responses:
+            labels = _labels(route=route, method=method, status=status_code)
+            lines.append(f'agenda_http_requests_total{{{labels}}} {count}')
+
+        lines.append('# HELP agenda_http_request_duration_seconds Duração das requisições, '
+                     'do início do atendimento ao fim da escrita da resposta.')
+        lines.append('# TYPE agenda_http_request_duration_seconds histogram')
+        for (route, method), histogram in requests:
+            self._render_histogram(lines, 'agenda_http_request_duration_seconds',
+                                   _labels(route=route, method=method), histogram)
+
+        lines.append('# HELP agenda_request_span_seconds Tempo gasto por requisição em cada etapa.')
+        lines.append('# TYPE agenda_request_span_seconds histogram')
+        for (route, name), histogram in spans:
+            self._render_histogram(lines, 'agenda_request_span_seconds',
+                                   _labels(route=route, span=name), histogram)
+
+        return '\n'.join(lines) + '\n'
+
+    def _render_histogram(self, lines, name, labels, histogram):
+        cumulative, total, count = histogram.snapshot()
+        for bound, value in zip(self.buckets, cumulative):
+            lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {value}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative[-1]}')
+        lines.append(f'{name}_sum{{{labels}}} {total:.9g}')
+        lines.append(f'{name}_count{{{labels}}} {count}')
+
+
+def _labels(**labels):
+    return ','.join(
+        f'{name}="{_escape(value)}"' for name, value in labels.items()
+    )
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = MetricsRegistry.from_env()
@@ -0,0 +1,47 @@
+"""
+Medição do tempo de inicialização
+Marca as fases desde a primeira linha de server.py até o servidor escutar;
+deve ser importado antes dos demais módulos da aplicação
+"""
+
+import time
+
+
+class StartupTimer:
+    """
+    Cronômetro de fases: cada mark() registra o tempo desde a marca anterior
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []
+        self._last = self.started
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    @property
+    def elapsed(self):
+        """
+        Segundos entre o início e a última marca
+        """
+        return self._last - self.started
+
+    def summary(self):
+        """
+        Returns:
+            dict: Milissegundos por fase e o total
+        """
+        summary = {phase: round(seconds * 1000, 1) for phase, seconds in self.phases}
+        summary['total'] = round(self.elapsed * 1000, 1)
+        return summary
+
+    def format(self):
+        lines = [f"   {phase:<12} {seconds * 1000:8.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"   {'total':<12} {self.elapsed * 1000:8.1f} ms")
+        return '\n'.join(lines)
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1 @@
+# Pacote reminders
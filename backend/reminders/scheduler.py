@@ -0,0 +1,298 @@
+"""
+Agendador de lembretes de vencimento
+Mantém os próximos disparos em um heap, atualizado pelas escritas de Task:
+cada alteração custa O(log n) e nada percorre as tarefas periodicamente
+"""
+
+import heapq
+import itertools
+import os
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from config import load_env_file
+from observability.log import logger
+from reminders.sinks import create_sink
+
+PENDING = 'pendente'
+
+UPCOMING = 'task.upcoming'
+OVERDUE = 'task.overdue'
+
+# Espera máxima entre verificações do topo do heap, para acompanhar ajustes do relógio
+MAX_SLEEP = 60.0
+
+
+def get_reminder_config():
+    load_env_file()
+
+    path = Path(os.getenv('REMINDER_FILE', 'reminders.ndjson'))
+    if not path.is_absolute():
+        # Relativo à pasta backend/, como o .env
+        path = Path(__file__).parent.parent / path
+
+    return {
+        'enabled': os.getenv('REMINDERS_ENABLED', 'false').lower() in ('1', 'true', 'yes'),
+        'lead_time': float(os.getenv('REMINDER_LEAD_MINUTES', '60')) * 60,
+        'sink': os.getenv('REMINDER_SINK', 'log').lower(),
+        'sink_options': {
+            'path': str(path),
+            'url': os.getenv('REMINDER_WEBHOOK_URL', '')
+        }
+    }
+
+
+def _as_local(due_date):
+    """
+    Vencimento como datetime local sem fuso, comparável com datetime.now()
+    """
+    if isinstance(due_date, str):
+        due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+    elif not isinstance(due_date, datetime) and isinstance(due_date, date):
+        due_date = datetime.combine(due_date, datetime.min.time())
+    if due_date.tzinfo is not None:
+        due_date = due_date.astimezone().replace(tzinfo=None)
+    return due_date
+
+
+class ReminderScheduler:
+    """
+    Dispara 'task.upcoming' lead_time segundos antes do vencimento de cada
+    tarefa pendente e 'task.overdue' quando ele chega
+
+    Cada tarefa acompanhada tem um token; reagendar troca o token e as
+    entradas antigas ficam no heap até chegarem ao topo, quando são
+    descartadas sem disparar (remoção preguiçosa). Se as entradas obsoletas
+    passarem do dobro das válidas o heap é reconstruído.
+
+    Só instantes ainda futuros geram eventos: tarefas que já venceram quando
+    são carregadas ou agendadas não disparam 'task.overdue'. Uma alteração que
+    não muda o vencimento não dispara de novo o que já foi disparado.
+    """
+
+    def __init__(self, sink=None, lead_time=3600, enabled=True):
+        """
+        Args:
+            sink (ReminderSink): Destino dos eventos
+            lead_time (float): Segundos de antecedência do 'task.upcoming'; 0 desliga
+            enabled (bool): Quando False, start() não faz nada e as escritas não custam nada
+        """
+        self.sink = sink
+        self.lead_time = lead_time
+        self.enabled = enabled
+        self.running = False
+
+        # Carga inicial em andamento: as escritas já agendam
+        self._loading = False
+        self._condition = threading.Condition()
+        self._heap = []
+        # task_id → (vencimento, título, token)
+        self._tasks = {}
+        self._tokens = itertools.count()
+        # Removidas durante a carga inicial, que não pode trazê-las de volta
+        self._removed_while_loading = None
+        self._stopping = False
+        self._thread = None
+        self._counters = {UPCOMING: 0, OVERDUE: 0, 'errors': 0}
+
+    @classmethod
+    def from_env(cls):
+        config = get_reminder_config()
+        sink = create_sink(config['sink'], **config['sink_options']) if config['enabled'] else None
+        return cls(sink, lead_time=config['lead_time'], enabled=config['enabled'])
+
+    def start(self, load_rows):
+        """
+        Carrega os vencimentos futuros uma única vez e inicia a thread de disparo
+
+        Args:
+            load_rows (callable): load_rows(due_from) devolve lotes de linhas das
+                tarefas pendentes com vencimento a partir de due_from
+        """
+        if not self.enabled:
+            return
+        with self._condition:
+            if self.running or self._loading or self._stopping:
+                return
+            # Escritas durante a carga já agendam; a carga não as sobrescreve
+            self._loading = True
+            self._removed_while_loading = set()
+
+        loaded = 0
+        try:
+            for batch in load_rows(datetime.now()):
+                with self._condition:
+                    if self._stopping:
+                        return
+                    for row in batch:
+                        task_id = row[0]
+                        if task_id in self._tasks or task_id in self._removed_while_loading:
+                            continue
+                        self._track(task_id, row[1], _as_local(row[5]), datetime.now())
+                        loaded += 1
+
+            with self._condition:
+                # close() durante a carga: a thread não chega a existir
+                if self._stopping:
+                    return
+                self._thread = threading.Thread(target=self._run, name='reminders', daemon=True)
+                self._thread.start()
+                self.running = True
+        finally:
+            with self._condition:
+                self._loading = False
+                self._removed_while_loading = None
+                if not self.running:
+                    # Carga que falhou ou foi interrompida não deixa disparos para trás
+                    self._tasks.clear()
+                    self._heap = []
+        logger.info("Agendador de lembretes iniciado", timers=loaded,
+                    sink=self.sink.name, lead_minutes=self.lead_time / 60)
+
+    def schedule(self, task_id, title, status, due_date):
+        """
+        Acompanha o vencimento da tarefa após uma escrita
+
+        Tarefas concluídas ou sem vencimento deixam de ser acompanhadas.
+        """
+        if not self.running and not self._loading:
+            return
+        if status != PENDING or due_date is None:
+            self.unschedule(task_id)
+            return
+
+        due_date = _as_local(due_date)
+        with self._condition:
+            current = self._tasks.get(task_id)
+            if current is not None and current[0] == due_date:
+                # Só o título mudou: mantém os disparos pendentes (e os já feitos)
+                self._tasks[task_id] = (due_date, title, current[2])
+                return
+            if not self._track(task_id, title, due_date, datetime.now()):
+                self._tasks.pop(task_id, None)
+            self._compact()
+            # A thread pode estar dormindo até um disparo posterior a este
+            self._condition.notify()
+
+    def unschedule(self, task_id):
+        if not self.running and not self._loading:
+            return
+        with self._condition:
+            if self._tasks.pop(task_id, None) is not None:
+                self._compact()
+            if self._removed_while_loading is not None:
+                self._removed_while_loading.add(task_id)
+
+    def _track(self, task_id, title, due_date, now):
+        """
+        Empilha os disparos futuros da tarefa; chamado com o lock
+
+        Returns:
+            bool: False se o vencimento já passou e não há o que disparar
+        """
+        if due_date <= now:
+            return False
+        token = next(self._tokens)
+        self._tasks[task_id] = (due_date, title, token)
+        if self.lead_time > 0:
+            upcoming = max(now, due_date - timedelta(seconds=self.lead_time))
+            heapq.heappush(self._heap, (upcoming, token, task_id, UPCOMING))
+        heapq.heappush(self._heap, (due_date, token, task_id, OVERDUE))
+        return True
+
+    def _compact(self):
+        # Tokens são únicos: a entrada vale se ainda é o token atual da tarefa
+        live = len(self._tasks) * (2 if self.lead_time > 0 else 1)
+        if len(self._heap) > 2 * live + 64:
+            self._heap = [entry for entry in self._heap if self._is_current(entry)]
+            heapq.heapify(self._heap)
+
+    def _is_current(self, entry):
+        current = self._tasks.get(entry[2])
+        return current is not None and current[2] == entry[1]
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due = self._pop_due()
+                if not due:
+                    if self._stopping:
+                        return
+                    timeout = MAX_SLEEP
+                    if self._heap:
+                        timeout = min(MAX_SLEEP, (self._heap[0][0] - datetime.now()).total_seconds())
+                    self._condition.wait(max(0.0, timeout))
+                    continue
+            for event in due:
+                self._emit(event)
+
+    def _pop_due(self):
+        """
+        Retira do heap os disparos vencidos; chamado com o lock
+        """
+        now = datetime.now()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, token, task_id, kind = heapq.heappop(self._heap)
+            current = self._tasks.get(task_id)
+            if current is None or current[2] != token:
+                continue
+            due_date, title, _ = current
+            if kind == OVERDUE:
+                # Último disparo da tarefa
+                del self._tasks[task_id]
+            due.append({
+                'event': kind,
+                'task_id': task_id,
+                'title': title,
+                'due_date': due_date.isoformat(),
+                'fired_at': now.isoformat(timespec='seconds')
+            })
+        return due
+
+    def _emit(self, event):
+        try:
+            self.sink.emit(event)
+        except Exception as e:
+            with self._condition:
+                self._counters['errors'] += 1
+            logger.error("Erro ao entregar lembrete", task_id=event['task_id'],
+                         event_type=event['event'], error=str(e))
+            return
+        with self._condition:
+            self._counters[event['event']] += 1
+
+    def close(self):
+        """
+        Para a thread de disparo e fecha o sink
+
+        Pode ser chamado durante a carga inicial (Ctrl+C logo ao iniciar):
+        a carga para e a thread não é criada.
+        """
+        with self._condition:
+            if not self.enabled or self._stopping:
+                return
+            self._stopping = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        self.running = False
+        self.sink.close()
+
+    def stats(self):
+        with self._condition:
+            stats = {
+                'enabled': self.enabled,
+                'running': self.running,
+                'timers': len(self._tasks),
+                'heap_entries': len(self._heap),
+                'fired': {UPCOMING: self._counters[UPCOMING], OVERDUE: self._counters[OVERDUE]},
+                'errors': self._counters['errors']
+            }
+        if self.sink is not None:
+            stats['sink'] = self.sink.name
+        return stats
+
+
+reminder_scheduler = ReminderScheduler.from_env()
@@ -0,0 +1,171 @@
+"""
+Destinos dos lembretes de vencimento
+O agendador entrega cada evento a um sink; trocar o destino não muda o agendamento
+"""
+
+import json
+import queue
+import threading
+import urllib.request
+from observability.log import logger
+
+REMINDER_SINKS = ('log', 'file', 'webhook', 'queue')
+
+
+class ReminderSink:
+    """
+    Recebe os eventos disparados pelo agendador
+
+    emit() é chamado pela thread do agendador e não deve bloquear: sinks
+    lentos (rede) entregam em uma thread própria.
+    """
+
+    name = 'base'
+
+    def emit(self, event):
+        """
+        Args:
+            event (dict): event, task_id, title, due_date, fired_at
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LogSink(ReminderSink):
+    """
+    Escreve os eventos no log da aplicação
+    """
+
+    name = 'log'
+
+    def emit(self, event):
+        logger.info("Lembrete de tarefa", **event)
+
+
+class FileSink(ReminderSink):
+    """
+    Acrescenta cada evento como uma linha JSON (NDJSON) ao arquivo
+    """
+
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stream = open(path, 'a', encoding='utf-8')
+
+    def emit(self, event):
+        line = json.dumps(event, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._stream.write(line)
+            self._stream.flush()
+
+    def close(self):
+        with self._lock:
+            self._stream.close()
+
+
+class QueueSink(ReminderSink):
+    """
+    Deixa os eventos em uma fila para consumidores no mesmo processo
+
+    Com a fila cheia o evento mais antigo é descartado, para o agendador
+    nunca esperar por um consumidor parado.
+    """
+
+    name = 'queue'
+
+    def __init__(self, maxsize=10000):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def emit(self, event):
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """
+        Returns:
+            dict: Próximo evento, ou None se o tempo acabar
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class WebhookSink(ReminderSink):
+    """
+    Envia cada evento em um POST JSON para a URL, a partir de uma thread própria
+
+    Falhas de entrega são registradas no log e o evento é descartado; a fila
+    de envio é limitada para uma URL fora do ar não acumular memória.
+    """
+
+    name = 'webhook'
+
+    def __init__(self, url, timeout=5, maxsize=1000):
+        self.url = url
+        self.timeout = timeout
+        self.failed = 0
+        self._pending = QueueSink(maxsize)
+        self._thread = threading.Thread(target=self._run, name='reminder-webhook', daemon=True)
+        self._thread.start()
+
+    def emit(self, event):
+        self._pending.emit(event)
+
+    def _run(self):
+        while True:
+            event = self._pending.get()
+            if event is None:
+                return
+            request = urllib.request.Request(
+                self.url,
+                data=json.dumps(event, ensure_ascii=False).encode('utf-8'),
+                headers={'Content-Type': 'application/json'},
+                method='POST'
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+            except Exception as e:
+                self.failed += 1
+                logger.warning("Falha ao entregar lembrete", url=self.url,
+                               task_id=event['task_id'], error=str(e))
+
+    def close(self):
+        self._pending.emit(None)
+        self._thread.join(timeout=self.timeout)
+
+
+def create_sink(name, path=None, url=None):
+    """
+    Args:
+        name (str): log, file, webhook ou queue
+        path (str): Arquivo do sink 'file'
+        url (str): Destino do sink 'webhook'
+    Raises:
+        ValueError: Se o sink não existir ou faltar a opção que ele exige
+    """
+    if name == 'log':
+        return LogSink()
+    if name == 'file':
+        return FileSink(path)
+    if name == 'webhook':
+        if not url:
+            raise ValueError("REMINDER_WEBHOOK_URL é obrigatório com REMINDER_SINK=webhook")
+        return WebhookSink(url)
+    if name == 'queue':
+        return QueueSink()
+    raise ValueError(f"Destino de lembretes inválido: {name} (use {', '.join(REMINDER_SINKS)})")
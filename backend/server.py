@@ -1,259 +1,393 @@
-import json
-import re
+import argparse
+import os
+import signal
+import socket
+import sys
+import threading
+import time
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
-from controllers.task_controller import TaskController
+# Primeiro módulo da aplicação: o cronômetro começa antes dos demais imports
+from observability.startup import startup_timer
+from config import load_env_file, reload_env_file
+from serving.application import application, BodyReader, Request
+from serving.thread_pool import BoundedThreadPoolHTTPServer
+from serving.async_engine import AsyncHTTPServer
+from serving.prefork import ProcessSupervisor, create_listener, notify_ready
+from cache.task_cache import task_cache
+from models.change_feed import change_feed
+from models.task import Task
+from models.task_stats import task_stats
+from models.search_index import search_index
+from reminders.scheduler import reminder_scheduler
+from storage.task_store import task_store
+from observability.log import logger
+
+startup_timer.mark('imports')
+
+# Espera máxima por outra requisição em uma conexão keep-alive no motor de threads
+THREADS_KEEPALIVE_TIMEOUT = 1.0
 
 class TaskAPIHandler(BaseHTTPRequestHandler):    
-    def do_GET(self):
+    # HTTP/1.1 permite keep-alive e respostas com Transfer-Encoding: chunked
+    protocol_version = 'HTTP/1.1'
+    # Tempo máximo ocioso de uma conexão keep-alive (ajustado por run_server)
+    timeout = 5
+    # Roteamento e preparo das respostas, compartilhados com o motor asyncio
+    application = application
+    
+    def _dispatch(self):
         """
-        Gerencia requisições GET
-        - GET /tasks → listar todas as tarefas
-        - GET /tasks/:id → buscar tarefa específica
+        Entrega a requisição à aplicação e escreve a resposta na conexão
         """
-        try:
-            if self.path == '/favicon.ico':
-                self.send_response(204)  # No Content
-                self.end_headers()
-                return
+        content_length = int(self.headers.get('Content-Length', 0) or 0)
+        request = Request(self.command, self.path, self.headers,
+                          BodyReader(self.rfile.read, content_length), self.request_version)
+        response = self.application.handle(request)
+        write_started = time.perf_counter()
         
-            # Parse da URL
-            parsed_url = urlparse(self.path)
-            path = parsed_url.path
-            
-            # Rota para listar todas as tarefas
-            if path == '/tasks':
-                status_code, response_body, headers = TaskController.get_all_tasks()
-                self._send_response(status_code, response_body, headers)
-                return
-            
-            # Rota para buscar tarefa específica
-            match = re.match(r'^/tasks/(\d+)$', path)
-            if match:
-                task_id = int(match.group(1))
-                status_code, response_body, headers = TaskController.get_task_by_id(task_id)
-                self._send_response(status_code, response_body, headers)
-                return
-            
-            # Rota não encontrada
-            self._send_404()
-            
-        except Exception as e:
-            self._send_500(f"Erro interno do servidor: {str(e)}")
+        self.send_response(response.status)
+        
+        # Corpo da requisição não lido deixaria lixo na conexão keep-alive, e
+        # uma conexão mantida aberta seguraria o worker enquanto outras esperam
+        if request.body_pending or getattr(self.server, 'waiting', False):
+            self.send_header('Connection', 'close')
+        
+        for header, value in response.headers:
+            self.send_header(header, value)
+        
+        if response.streaming:
+            write_seconds = self._send_stream(response.body)
+        else:
+            self.end_headers()
+            if response.body:
+                self.wfile.write(response.body)
+            write_seconds = time.perf_counter() - write_started
+        
+        if request.trace is not None:
+            self.application.complete(request, response, write_seconds)
     
-    def do_POST(self):
-        """
-        Gerencia requisições POST
-        - POST /tasks → criar nova tarefa
-        """
-        try:
-            if self.path == '/tasks':
-                # Ler dados da requisição
-                content_length = int(self.headers.get('Content-Length', 0))
-                post_data = self.rfile.read(content_length)
-                
-                # Parse do JSON
-                try:
-                    request_data = json.loads(post_data.decode('utf-8'))
-                except json.JSONDecodeError:
-                    self._send_400("JSON inválido")
-                    return
-                
-                # Criar tarefa
-                status_code, response_body, headers = TaskController.create_task(request_data)
-                self._send_response(status_code, response_body, headers)
-                return
-            
-            # Rota não encontrada
-            self._send_404()
-            
-        except Exception as e:
-            self._send_500(f"Erro interno do servidor: {str(e)}")
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _dispatch
     
-    def do_PUT(self):
+    def _send_stream(self, chunks):
         """
-        Gerencia requisições PUT
-        - PUT /tasks/:id → atualizar tarefa
+        Envia um corpo em streaming, um chunk HTTP por bloco de bytes
+        
+        Clientes HTTP/1.0 não entendem chunked: recebem o corpo cru e a conexão
+        é fechada ao final. Um erro no meio do envio não pode mais virar 500,
+        então a conexão é encerrada sem o chunk final para sinalizar a falha.
+        
+        Returns:
+            float: Segundos gastos nas escritas, sem a produção dos chunks
         """
+        chunked = self.request_version != 'HTTP/1.0'
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            self.send_header('Connection', 'close')
+        started = time.perf_counter()
+        self.end_headers()
+        write_seconds = time.perf_counter() - started
+        
         try:
-            # Parse da URL para extrair ID
-            match = re.match(r'^/tasks/(\d+)$', self.path)
-            if match:
-                task_id = int(match.group(1))
-                
-                # Ler dados da requisição
-                content_length = int(self.headers.get('Content-Length', 0))
-                put_data = self.rfile.read(content_length)
-                
-                # Parse do JSON
-                try:
-                    request_data = json.loads(put_data.decode('utf-8'))
-                except json.JSONDecodeError:
-                    self._send_400("JSON inválido")
-                    return
-                
-                # Atualizar tarefa
-                status_code, response_body, headers = TaskController.update_task(task_id, request_data)
-                self._send_response(status_code, response_body, headers)
-                return
-            
-            # Rota não encontrada
-            self._send_404()
-            
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if chunked:
+                    chunk = b'%x\r\n%b\r\n' % (len(chunk), chunk)
+                started = time.perf_counter()
+                self.wfile.write(chunk)
+                write_seconds += time.perf_counter() - started
+            if chunked:
+                self.wfile.write(b'0\r\n\r\n')
         except Exception as e:
-            self._send_500(f"Erro interno do servidor: {str(e)}")
+            self.close_connection = True
+            logger.error("Erro durante o envio em streaming", path=self.path, error=str(e))
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close:
+                close()
+        return write_seconds
     
-    def do_PATCH(self):
+    def log_request(self, code='-', size='-'):
         """
-        Gerencia requisições PATCH
-        - PATCH /tasks/:id/complete → marcar como concluída
+        Registra a requisição no log de acesso, sem escrever durante o atendimento
         """
-        try:
-            # Parse da URL para extrair ID
-            match = re.match(r'^/tasks/(\d+)/complete$', self.path)
-            if match:
-                task_id = int(match.group(1))
-                
-                # Marcar como concluída
-                status_code, response_body, headers = TaskController.mark_task_as_completed(task_id)
-                self._send_response(status_code, response_body, headers)
-                return
-            
-            # Rota não encontrada
-            self._send_404()
-            
-        except Exception as e:
-            self._send_500(f"Erro interno do servidor: {str(e)}")
+        # code pode ser HTTPStatus, int ou '-' quando o status não é conhecido
+        logger.access(self.command, self.path, int(code) if isinstance(code, int) else 0,
+                      client=self.client_address[0])
     
-    def do_DELETE(self):
+    def log_message(self, format, *args):
         """
-        Gerencia requisições DELETE
-        - DELETE /tasks/:id → deletar tarefa
+        Mensagens de erro do http.server (requisição malformada, timeout...)
         """
-        try:
-            # Parse da URL para extrair ID
-            match = re.match(r'^/tasks/(\d+)$', self.path)
-            if match:
-                task_id = int(match.group(1))
-                
-                # Deletar tarefa
-                status_code, response_body, headers = TaskController.delete_task(task_id)
-                self._send_response(status_code, response_body, headers)
-                return
-            
-            # Rota não encontrada
-            self._send_404()
-            
-        except Exception as e:
-            self._send_500(f"Erro interno do servidor: {str(e)}")
+        logger.warning(format % args, client=self.client_address[0])
+
+def get_server_config():
+    load_env_file()
     
-    def do_OPTIONS(self):
-        """
-        Gerencia requisições OPTIONS para CORS
-        """
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
-        self.send_header('Access-Control-Max-Age', '86400')
-        self.end_headers()
+    return {
+        'workers': int(os.getenv('SERVER_WORKERS', '8')),
+        'queue_size': int(os.getenv('SERVER_QUEUE_SIZE', '64')),
+        'retry_after': int(os.getenv('SERVER_RETRY_AFTER', '1')),
+        'drain_timeout': float(os.getenv('SERVER_DRAIN_TIMEOUT', '30')),
+        'keepalive_timeout': float(os.getenv('SERVER_KEEPALIVE_TIMEOUT', '5')),
+        'engine': os.getenv('SERVER_ENGINE', 'threads').lower(),
+        'processes': int(os.getenv('SERVER_PROCESSES', '1')),
+        'reuse_port': os.getenv('SERVER_REUSE_PORT', 'false').lower() in ('1', 'true', 'yes')
+    }
+
+def _resolve_config(workers, queue_size, engine):
+    """
+    Configuração do .env com os argumentos explícitos por cima
     
-    def _send_response(self, status_code, response_body, headers):
-        """
-        Envia resposta HTTP com headers personalizados
-        
-        Args:
-            status_code (int): Código de status HTTP
-            response_body (str): Corpo da resposta
-            headers (dict): Headers da resposta
-        """
-        self.send_response(status_code)
-        
-        # Adicionar headers CORS para todas as respostas
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
-        
-        # Enviar headers
-        for header, value in headers.items():
-            self.send_header(header, value)
-        
-        self.end_headers()
-        self.wfile.write(response_body.encode('utf-8'))
+    Returns:
+        tuple: (config dos servidores, motor, processos, SO_REUSEPORT)
+    """
+    config = get_server_config()
+    if workers is not None:
+        config['workers'] = workers
+    if queue_size is not None:
+        config['queue_size'] = queue_size
+    default_engine = config.pop('engine')
+    engine = (engine or default_engine).lower()
+    if engine not in ('threads', 'asyncio'):
+        raise ValueError(f"Motor de servidor inválido: {engine}")
+    return config, engine, config.pop('processes'), config.pop('reuse_port')
+
+def _create_server(server_address, engine, config, sock=None):
+    if engine == 'asyncio':
+        # Conexões ociosas custam só uma corrotina; workers executam a aplicação
+        return AsyncHTTPServer(server_address, application, sock=sock, **config)
     
-    def _send_404(self):
-        """
-        Envia resposta 404 - Rota não encontrada
-        """
-        error_response = {
-            'success': False,
-            'message': 'Rota não encontrada'
-        }
-        self._send_response(404, json.dumps(error_response, ensure_ascii=False), {
-            'Content-Type': 'application/json'
-        })
+    # Conexões keep-alive ociosas ocupam um worker até este timeout, então
+    # aqui ele fica limitado a THREADS_KEEPALIVE_TIMEOUT
+    config = dict(config)
+    TaskAPIHandler.timeout = min(config.pop('keepalive_timeout'), THREADS_KEEPALIVE_TIMEOUT)
+    if config['workers'] > 0:
+        return BoundedThreadPoolHTTPServer(server_address, TaskAPIHandler, sock=sock, **config)
+    httpd = HTTPServer(server_address, TaskAPIHandler, bind_and_activate=sock is None)
+    if sock is not None:
+        httpd.socket.close()
+        httpd.socket = sock
+        httpd.server_address = sock.getsockname()
+    return httpd
+
+def _close_server(httpd):
+    # Long-polls e streams SSE em espera respondem já, sem segurar o encerramento
+    change_feed.close()
+    httpd.server_close()
+    reminder_scheduler.close()
+    task_store.close()
+    logger.close()
+
+def _start_background_work():
+    """
+    Trabalho de inicialização que depende do banco, feito depois de escutar
+    """
+    if not reminder_scheduler.enabled:
+        return
     
-    def _send_400(self, message):
-        """
-        Envia resposta 400 - Bad Request
-        
-        Args:
-            message (str): Mensagem de erro
-        """
-        error_response = {
-            'success': False,
-            'message': message
-        }
-        self._send_response(400, json.dumps(error_response, ensure_ascii=False), {
-            'Content-Type': 'application/json'
-        })
+    def start_reminders():
+        try:
+            Task.start_reminders()
+        except Exception as e:
+            logger.error("Erro ao iniciar o agendador de lembretes", error=str(e))
     
-    def _send_500(self, message):
-        """
-        Envia resposta 500 - Internal Server Error
-        
-        Args:
-            message (str): Mensagem de erro
-        """
-        error_response = {
-            'success': False,
-            'message': message
-        }
-        self._send_response(500, json.dumps(error_response, ensure_ascii=False), {
-            'Content-Type': 'application/json'
-        })
+    threading.Thread(target=start_reminders, name='startup', daemon=True).start()
+
+def _install_reload_signal():
+    """
+    SIGHUP relê o .env: nível de log e credenciais do banco para as novas conexões
+    """
+    def reload_config():
+        changed = reload_env_file()
+        logger.info("Configuração recarregada do .env", changed=sorted(changed))
     
-    def log_message(self, format, *args):
-        """
-        Personaliza o log de mensagens do servidor
-        """
-        print(f"{self.address_string()} - {format % args}")
+    # O gancho roda fora do handler de sinal, que interrompe o loop do servidor
+    signal.signal(signal.SIGHUP, lambda signum, frame: threading.Thread(
+        target=reload_config, daemon=True
+    ).start())
 
-def run_server(port=8000):
+def run_server(port=8000, workers=None, queue_size=None, engine=None, processes=None,
+               startup_timing=False):
     """
     Inicia o servidor HTTP
     
     Args:
         port (int): Porta onde o servidor será executado
+        workers (int): Número de workers (padrão: SERVER_WORKERS do .env);
+            0 usa o servidor single-thread original
+        queue_size (int): Requisições aguardando worker antes de responder 503
+        engine (str): 'threads' (http.server) ou 'asyncio' (padrão: SERVER_ENGINE)
+        processes (int): Processos de servidor (padrão: SERVER_PROCESSES); acima
+            de 1 um supervisor mantém os processos atendendo na mesma porta
+        startup_timing (bool): Mostra o tempo de cada fase até o servidor
+            escutar e encerra, sem atender requisições (só com um processo)
     """
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, TaskAPIHandler)
+    config, engine, default_processes, reuse_port = _resolve_config(workers, queue_size, engine)
+    processes = default_processes if processes is None else processes
+    if processes > 1 and not startup_timing:
+        _run_supervisor(port, processes, reuse_port, engine, config)
+        return
+    startup_timer.mark('config')
+    
+    httpd = _create_server(('', port), engine, config)
+    startup_timer.mark('listening')
+    logger.info("Servidor escutando", port=port, startup_ms=startup_timer.summary())
+    if startup_timing:
+        print(f"Inicialização até escutar em http://localhost:{port}:")
+        print(startup_timer.format())
+        _close_server(httpd)
+        return
+    _start_background_work()
+    if hasattr(signal, 'SIGHUP'):
+        _install_reload_signal()
     
     print(f"Servidor iniciado em http://localhost:{port}")
+    if engine == 'asyncio':
+        print(f"Motor: asyncio | Workers: {httpd.workers} | Fila: {config['queue_size']} requisições")
+    elif config['workers'] > 0:
+        print(f"Workers: {config['workers']} | Fila: {config['queue_size']} conexões")
+    _print_endpoints()
+    
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServidor parado! Concluindo requisições pendentes...")
+        _close_server(httpd)
+
+def _print_endpoints():
     print("Endpoints disponíveis:")
-    print("   GET    /tasks              - Listar todas as tarefas")
+    print("   GET    /tasks              - Listar tarefas (limit, cursor, status, due_from, due_to)")
+    print("   GET    /tasks/search?q=    - Buscar tarefas por texto (limit, cursor)")
+    print("   GET    /tasks/changes?since= - Alterações desde uma versão (wait=, ou SSE)")
+    print("   GET    /tasks/stats        - Contagens por status e vencimento")
+    print("   GET    /tasks/export       - Exportar tarefas em CSV ou NDJSON (format=)")
     print("   GET    /tasks/:id          - Buscar tarefa específica")
     print("   POST   /tasks              - Criar nova tarefa")
+    print("   POST   /tasks/bulk         - Criar várias tarefas")
+    print("   POST   /tasks/import       - Importar tarefas de CSV ou NDJSON (format=)")
     print("   PUT    /tasks/:id          - Atualizar tarefa")
     print("   PATCH  /tasks/:id/complete - Marcar como concluída")
     print("   DELETE /tasks/:id          - Deletar tarefa")
+    print("   PATCH  /tasks/bulk/complete - Concluir várias tarefas")
+    print("   DELETE /tasks/bulk         - Deletar várias tarefas")
+    print("   GET    /health             - Estado do servidor e do armazenamento")
+    print("   GET    /metrics            - Métricas por rota (Prometheus)")
     print("\nPressione Ctrl+C para parar o servidor")
+
+def _run_supervisor(port, processes, reuse_port, engine, config):
+    """
+    Modo multiprocesso: abre a porta e mantém `processes` workers atendendo nela
+    
+    Os workers são novos interpretadores (server.py --worker), não cópias deste
+    processo: o pool do banco, as conexões SQLite e as threads de fundo criados
+    na importação não são seguros para herdar por fork, e cada worker cria os
+    seus. Com SO_REUSEPORT cada worker abre seu próprio socket e o kernel
+    distribui as conexões; sem ele, todos herdam o socket aberto aqui.
+    """
+    if os.name != 'posix':
+        raise ValueError("O modo multiprocesso (SERVER_PROCESSES > 1) exige um sistema POSIX")
+    if task_store.name == 'memory':
+        raise ValueError("STORAGE_BACKEND=memory não é compartilhado entre processos; "
+                         "use SERVER_PROCESSES=1")
+    # O supervisor não atende requisições: o banco fica só com os workers
+    task_store.close()
+    
+    server_address = ('', port)
+    # Com SO_REUSEPORT este socket só reserva a porta e confirma que ela está livre
+    listener = create_listener(server_address, reuse_port=reuse_port, listen=not reuse_port)
+    script = os.path.abspath(__file__)
+    
+    def command(slot, ready_fd, listen_fd):
+        argv = [sys.executable, script, '--worker', str(slot), '--port', str(port),
+                '--ready-fd', str(ready_fd), '--engine', engine,
+                '--workers', str(config['workers']), '--queue-size', str(config['queue_size'])]
+        if not reuse_port:
+            argv += ['--listen-fd', str(listen_fd)]
+        return argv
+    
+    supervisor = ProcessSupervisor(
+        command, processes,
+        listener=None if reuse_port else listener,
+        graceful_timeout=config['drain_timeout'] + 5
+    )
+    
+    print(f"Servidor iniciado em http://localhost:{port}")
+    print(f"Processos: {processes} ({'SO_REUSEPORT' if reuse_port else 'socket compartilhado'}) | "
+          f"Motor: {engine} | Workers por processo: {config['workers']}")
+    print(f"Supervisor: PID {os.getpid()} (kill -HUP para reinício gradual)")
+    _print_endpoints()
     
     try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
+        supervisor.run()
+    finally:
+        listener.close()
         print("\nServidor parado!")
-        httpd.server_close()
+        logger.close()
+
+def run_worker(slot, port, ready_fd, listen_fd=None, workers=None, queue_size=None, engine=None):
+    """
+    Processo worker do modo multiprocesso, iniciado pelo supervisor
+    
+    Args:
+        slot (int): Posição do worker no supervisor
+        port (int): Porta, usada quando o worker abre o socket com SO_REUSEPORT
+        ready_fd (int): Pipe onde o worker avisa que está aceitando conexões
+        listen_fd (int): Socket herdado do supervisor
+    """
+    config, engine, _, _ = _resolve_config(workers, queue_size, engine)
+    if listen_fd is not None:
+        sock = socket.socket(fileno=listen_fd)
+    else:
+        sock = create_listener(('', port), reuse_port=True)
+    
+    # O cache, o registro de alterações, os contadores de estatísticas e o
+    # índice de busca em memória são deste processo: escritas atendidas por
+    # outro worker não chegariam a eles
+    task_cache.enabled = False
+    change_feed.enabled = False
+    task_stats.incremental = False
+    search_index.enabled = False
+    if reminder_scheduler.enabled:
+        # Cada worker só vê as próprias escritas e todos disparariam os mesmos lembretes
+        logger.warning("Lembretes de vencimento não rodam no modo multiprocesso",
+                       slot=slot, pid=os.getpid())
+    httpd = _create_server(None, engine, config, sock=sock)
+    startup_timer.mark('listening')
+    
+    # Ctrl+C chega a todo o grupo; quem encerra os workers é o supervisor, com SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(
+        target=httpd.shutdown, daemon=True
+    ).start())
+    
+    _install_reload_signal()
+    
+    notify_ready(ready_fd)
+    logger.info("Worker pronto", slot=slot, pid=os.getpid(), engine=engine,
+                startup_ms=startup_timer.summary())
+    httpd.serve_forever()
+    _close_server(httpd)
 
 if __name__ == '__main__':
-    run_server() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Servidor da Agenda de Tarefas')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--processes', type=int, help='Processos de servidor (padrão: SERVER_PROCESSES)')
+    parser.add_argument('--startup-timing', action='store_true',
+                        help='Mede o tempo até o servidor escutar e encerra')
+    # Usados pelo supervisor ao iniciar cada worker
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--ready-fd', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--listen-fd', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--engine', help=argparse.SUPPRESS)
+    parser.add_argument('--workers', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--queue-size', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker is not None:
+        run_worker(args.worker, args.port, args.ready_fd, args.listen_fd,
+                   args.workers, args.queue_size, args.engine)
+    else:
+        run_server(args.port, args.workers, args.queue_size, args.engine, args.processes,
+                   args.startup_timing)
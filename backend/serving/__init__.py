@@ -0,0 +1 @@
+# Pacote serving 
\ No newline at end of file
@@ -0,0 +1,340 @@
+"""
+Aplicação HTTP independente do transporte
+Roteia as requisições para os controllers e monta a resposta final (CORS, ETag,
+compressão), usada tanto pelo servidor de threads quanto pelo motor asyncio
+"""
+
+import io
+import json
+from urllib.parse import urlsplit, parse_qs
+from controllers.task_controller import TaskController
+from controllers.health_controller import HealthController
+from controllers.transfer_controller import TransferController, format_from_content_type
+from models.change_feed import change_feed
+from observability.metrics import metrics, span, bind_trace, traced_iterator
+from serving.compression import response_compressor, tag_etag, untag_if_none_match
+from serving.router import Router
+
+CORS_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, DELETE, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type, Authorization, If-None-Match'),
+    ('Access-Control-Expose-Headers', 'ETag, Last-Modified')
+)
+
+
+class BodyReader(io.RawIOBase):
+    """
+    Lê o corpo da requisição sem ultrapassar o Content-Length
+
+    `remaining` indica quantos bytes ainda não saíram da conexão; se sobrar algo
+    ao final da resposta, a conexão keep-alive não pode ser reaproveitada.
+    """
+
+    def __init__(self, read, length):
+        """
+        Args:
+            read (callable): Função read(n) da conexão; b'' indica fim
+            length (int): Content-Length da requisição
+        """
+        super().__init__()
+        self._read = read
+        self.remaining = length
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.remaining <= 0:
+            return 0
+        data = self._read(min(len(buffer), self.remaining))
+        if not data:
+            # Cliente fechou a conexão antes de enviar o corpo inteiro
+            self.remaining = 0
+            return 0
+        size = len(data)
+        buffer[:size] = data
+        self.remaining -= size
+        return size
+
+
+class Headers(dict):
+    """
+    Headers da requisição com busca sem diferenciar maiúsculas de minúsculas
+    """
+
+    def get(self, name, default=None):
+        return dict.get(self, name.lower(), default)
+
+    def __getitem__(self, name):
+        return dict.__getitem__(self, name.lower())
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name.lower())
+
+
+class Request:
+    """
+    Requisição recebida por qualquer um dos motores de servidor
+    """
+
+    def __init__(self, method, target, headers, body=None, version='HTTP/1.1'):
+        """
+        Args:
+            method (str): Método HTTP
+            target (str): Caminho com query string, como veio na linha de requisição
+            headers (Mapping): Headers com get() sem diferenciar maiúsculas
+            body (BodyReader): Leitor do corpo (padrão: corpo vazio)
+            version (str): Versão HTTP da requisição
+        """
+        parts = urlsplit(target)
+        self.method = method
+        self.target = target
+        self.path = parts.path
+        self.query_string = parts.query
+        self.headers = headers
+        self.version = version
+        self.body_reader = body if body is not None else BodyReader(None, 0)
+        self.body = io.BufferedReader(self.body_reader)
+        # Preenchidos pelo roteador
+        self.route = None
+        self.params = {}
+        # Medição da requisição, quando as métricas estão ativas
+        self.trace = None
+        self._query = None
+
+    @property
+    def query(self):
+        if self._query is None:
+            self._query = parse_qs(self.query_string)
+        return self._query
+
+    @property
+    def body_pending(self):
+        """
+        Indica se parte do corpo ainda não foi lida da conexão
+        """
+        return self.body_reader.remaining > 0
+
+    def read_body(self):
+        return self.body.read()
+
+
+class Response:
+    """
+    Resposta pronta para o transporte: headers finais e corpo em bytes,
+    iterável de bytes (streaming) ou None (204/304)
+    """
+    __slots__ = ('status', 'headers', 'body')
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def streaming(self):
+        return self.body is not None and not isinstance(self.body, bytes)
+
+
+def _error(status_code, message):
+    error_response = {
+        'success': False,
+        'message': message
+    }
+    return status_code, json.dumps(error_response, ensure_ascii=False), {
+        'Content-Type': 'application/json'
+    }
+
+
+class TaskApplication:
+    """
+    Rotas da API e preparação das respostas
+    """
+
+    def __init__(self, compressor=response_compressor, metrics=metrics):
+        self.compressor = compressor
+        self.metrics = metrics
+        self.router = Router(_error)
+        if metrics.enabled:
+            # Desativadas, as métricas não acrescentam nada à cadeia das rotas
+            self.router.use(metrics.middleware)
+        self._register_routes()
+
+    def _register_routes(self):
+        add = self.router.add
+        add('GET', '/favicon.ico', lambda request: (204, None, {}))
+        add('GET', '/health', lambda request: HealthController.get_health())
+        add('GET', '/metrics', self._metrics)
+        add('GET', '/tasks', self._list_tasks)
+        add('GET', '/tasks/search', lambda request: TaskController.search_tasks(request.query))
+        add('GET', '/tasks/changes', self._changes)
+        add('GET', '/tasks/stats', lambda request: TaskController.get_task_stats())
+        add('GET', '/tasks/export', lambda request: TransferController.export_tasks(request.query))
+        add('GET', '/tasks/<int:task_id>', self._get_task)
+        add('POST', '/tasks', self._with_json(TaskController.create_task))
+        add('POST', '/tasks/bulk', self._with_json(TaskController.create_tasks_bulk))
+        add('POST', '/tasks/import', self._import_tasks)
+        add('PUT', '/tasks/<int:task_id>', self._with_json(TaskController.update_task))
+        add('PATCH', '/tasks/<int:task_id>/complete',
+            lambda request, task_id: TaskController.mark_task_as_completed(task_id))
+        add('PATCH', '/tasks/bulk/complete', self._with_json(TaskController.complete_tasks_bulk))
+        add('DELETE', '/tasks/<int:task_id>', lambda request, task_id: TaskController.delete_task(task_id))
+        add('DELETE', '/tasks/bulk', self._with_json(TaskController.delete_tasks_bulk))
+
+    def handle(self, request):
+        """
+        Atende uma requisição; nunca levanta exceção
+
+        Returns:
+            Response: Resposta com headers e corpo já codificados
+        """
+        request.trace = self.metrics.begin(request)
+        try:
+            if request.method == 'OPTIONS':
+                # Preflight de CORS vale para qualquer caminho
+                status_code, response_body, headers = 200, '', {'Access-Control-Max-Age': '86400'}
+            else:
+                status_code, response_body, headers = self.router.dispatch(request)
+        except Exception as e:
+            status_code, response_body, headers = _error(500, f"Erro interno do servidor: {str(e)}")
+        response = self.finalize(request, status_code, response_body, headers)
+
+        if request.trace is not None:
+            if response.streaming:
+                response.body = traced_iterator(request.trace, iter(response.body))
+            # A escrita pode acontecer em outra thread; o span dela é informado em complete()
+            bind_trace(None)
+        return response
+
+    def complete(self, request, response, write_seconds):
+        """
+        Chamado pelo transporte depois de escrever a resposta medida
+
+        Args:
+            request (Request): Requisição com trace
+            response (Response): Resposta enviada
+            write_seconds (float): Tempo gasto escrevendo no socket
+        """
+        request.trace.add('socket_write', write_seconds)
+        self.metrics.end(request.trace, request, response.status)
+
+    def finalize(self, request, status_code, response_body, headers):
+        """
+        Aplica CORS, negociação de compressão e ETag por codificação
+
+        Args:
+            request (Request): Requisição original
+            status_code (int): Código de status HTTP
+            response_body (str | bytes | iterable | None): Corpo; um iterável de bytes
+                é mantido para envio em streaming
+            headers (dict): Headers devolvidos pelo controller
+        Returns:
+            Response: Resposta pronta para o transporte
+        """
+        # 304 não traz Content-Type, mas representa o mesmo JSON do 200
+        content_type = headers.get('Content-Type', 'application/json' if status_code == 304 else None)
+        encoding = self.compressor.negotiate(request.headers.get('Accept-Encoding'), content_type)
+        if encoding and 'ETag' in headers:
+            # Cada codificação é uma representação diferente com sua própria ETag
+            headers = dict(headers, ETag=tag_etag(headers['ETag'], encoding))
+
+        response_headers = list(CORS_HEADERS)
+        response_headers.extend(headers.items())
+        if self.compressor.enabled:
+            response_headers.append(('Vary', 'Accept-Encoding'))
+
+        # 304 e 204 não têm corpo nem Content-Length próprio
+        if status_code in (204, 304):
+            return Response(status_code, response_headers, None)
+
+        if response_body is None or isinstance(response_body, (str, bytes)):
+            body = response_body or b''
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            if encoding:
+                with span('compression'):
+                    compressed = self.compressor.compress(body, encoding)
+                if compressed is not None:
+                    body = compressed
+                    response_headers.append(('Content-Encoding', encoding))
+            response_headers.append(('Content-Length', str(len(body))))
+            return Response(status_code, response_headers, body)
+
+        if encoding:
+            response_headers.append(('Content-Encoding', encoding))
+            response_body = self.compressor.compress_stream(response_body, encoding)
+        return Response(status_code, response_headers, response_body)
+
+    @staticmethod
+    def _with_json(controller_method):
+        """
+        Adapta um método do controller que recebe o corpo JSON (após os
+        parâmetros da rota), respondendo 400 se o corpo for inválido
+        """
+        def handler(request, **params):
+            try:
+                request_data = json.loads(request.read_body().decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return _error(400, "JSON inválido")
+            return controller_method(*params.values(), request_data)
+        return handler
+
+    def _wants_stream(self, request):
+        """
+        Indica se a listagem deve ser enviada em streaming e em qual formato
+        Returns:
+            tuple: (streaming, ndjson)
+        """
+        accept = request.headers.get('Accept', '')
+        ndjson = 'application/x-ndjson' in accept
+        stream = request.query.get('stream', [''])[0].lower() in ('1', 'true')
+        return stream or ndjson, ndjson
+
+    def _list_tasks(self, request):
+        """
+        - GET /tasks?limit=&cursor=&status=&due_from=&due_to= → listar tarefas paginadas
+        - GET /tasks?stream=true → todas as tarefas em streaming (array JSON,
+          ou NDJSON com Accept: application/x-ndjson)
+        """
+        stream, ndjson = self._wants_stream(request)
+        if stream:
+            return TaskController.stream_tasks(request.query, ndjson)
+        return TaskController.get_all_tasks(
+            request.query, untag_if_none_match(request.headers.get('If-None-Match')))
+
+    def _changes(self, request):
+        """
+        - GET /tasks/changes?since=&wait= → alterações desde a versão (long-polling)
+        - Com Accept: text/event-stream → alterações como Server-Sent Events
+        """
+        if not change_feed.enabled:
+            return _error(501, 'Alterações indisponíveis no modo multiprocesso: '
+                               'cada processo só enxerga as próprias escritas')
+        if 'text/event-stream' in request.headers.get('Accept', ''):
+            return TaskController.stream_changes(request.query, request.headers.get('Last-Event-ID'))
+        return TaskController.get_changes(request.query)
+
+    def _import_tasks(self, request):
+        """
+        - POST /tasks/import?format=csv|ndjson → importa o corpo em fluxo (o formato
+          também pode vir do Content-Type: text/csv ou application/x-ndjson)
+        """
+        file_format = request.query.get('format', [''])[0].lower() \
+            or format_from_content_type(request.headers.get('Content-Type'))
+        return TransferController.import_tasks(request.body, file_format)
+
+    def _metrics(self, request):
+        """
+        - GET /metrics → histogramas por rota no formato texto do Prometheus
+        """
+        if not self.metrics.enabled:
+            return _error(404, 'Métricas desativadas (METRICS_ENABLED)')
+        return 200, self.metrics.render(), {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+    def _get_task(self, request, task_id):
+        return TaskController.get_task_by_id(
+            task_id, untag_if_none_match(request.headers.get('If-None-Match')))
+
+
+application = TaskApplication()
@@ -0,0 +1,315 @@
+"""
+Servidor HTTP/1.1 sobre asyncio
+Mantém milhares de conexões keep-alive ociosas com poucas threads: só as chamadas
+bloqueantes (controllers e banco) vão para um pool de threads
+"""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http import HTTPStatus
+from serving.application import BodyReader, Headers, Request
+from observability.log import logger
+
+# Tamanho máximo da linha de requisição somada aos headers
+MAX_HEADER_SIZE = 64 * 1024
+
+
+class AsyncHTTPServer:
+    """
+    Servidor HTTP/1.1 com keep-alive e pipelining sobre um único event loop
+
+    Cada conexão é uma corrotina que lê as requisições em sequência: requisições
+    enviadas em pipeline ficam no buffer do StreamReader e são respondidas na
+    ordem de chegada. A aplicação roda em um ThreadPoolExecutor com `workers`
+    threads; acima de `workers + queue_size` requisições em andamento o servidor
+    responde 503 com Retry-After, como o servidor de threads.
+
+    Expõe serve_forever() e server_close() com a mesma semântica do HTTPServer,
+    para ser intercambiável em run_server.
+    """
+
+    def __init__(self, server_address, application, workers=8, queue_size=64,
+                 retry_after=1, drain_timeout=30, keepalive_timeout=5, sock=None):
+        """
+        Args:
+            server_address (tuple): Endereço (host, porta)
+            application (TaskApplication): Aplicação que atende as requisições
+            workers (int): Threads que executam a aplicação
+            queue_size (int): Requisições que podem aguardar por uma thread
+            retry_after (int): Segundos sugeridos ao cliente no 503
+            drain_timeout (float): Tempo máximo para concluir as requisições ao parar
+            keepalive_timeout (float): Segundos que uma conexão pode ficar ociosa
+            sock (socket.socket): Socket já escutando (modo multiprocesso);
+                quando informado, server_address é ignorado
+        """
+        self.server_address = server_address
+        self.application = application
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self.drain_timeout = drain_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.rejected_requests = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='http-worker')
+        self._max_in_flight = self.workers + queue_size
+        self._in_flight = 0
+        self._closing = False
+        self._idle = set()
+        self._connections = set()
+        if sock is not None:
+            start = asyncio.start_server(self._handle_connection, sock=sock, limit=MAX_HEADER_SIZE)
+        else:
+            start = asyncio.start_server(
+                self._handle_connection, server_address[0] or None, server_address[1],
+                limit=MAX_HEADER_SIZE, reuse_address=True
+            )
+        self._server = self._loop.run_until_complete(start)
+
+    def serve_forever(self):
+        """
+        Atende conexões até um KeyboardInterrupt ou shutdown()
+        """
+        self._stopped = self._loop.create_future()
+        self._loop.run_until_complete(self._stopped)
+
+    def shutdown(self):
+        """
+        Interrompe serve_forever() a partir de outra thread
+        """
+        self._loop.call_soon_threadsafe(self._stop)
+
+    def server_close(self):
+        """
+        Para de aceitar conexões e aguarda as requisições em andamento
+        """
+        self._loop.run_until_complete(self._drain())
+        self._executor.shutdown(wait=True)
+        self._loop.close()
+
+    def _stop(self):
+        stopped = getattr(self, '_stopped', None)
+        if stopped is not None and not stopped.done():
+            stopped.set_result(None)
+
+    async def _drain(self):
+        self._closing = True
+        self._server.close()
+        await self._server.wait_closed()
+
+        # Conexões ociosas não têm o que concluir; as ocupadas fecham após responder
+        for writer in list(self._idle):
+            writer.close()
+
+        if self._connections:
+            await asyncio.wait(list(self._connections), timeout=self.drain_timeout)
+
+    async def _handle_connection(self, reader, writer):
+        self._connections.add(asyncio.current_task())
+        try:
+            keep_alive = True
+            while keep_alive and not self._closing:
+                self._idle.add(writer)
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.keepalive_timeout)
+                except asyncio.LimitOverrunError:
+                    await self._send_error(writer, 431, 'Headers muito grandes')
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                finally:
+                    self._idle.discard(writer)
+
+                keep_alive = await self._handle_request(reader, writer, head)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self._connections.discard(asyncio.current_task())
+
+    async def _handle_request(self, reader, writer, head):
+        """
+        Atende uma requisição já com os headers lidos
+
+        Returns:
+            bool: Se a conexão pode ser reutilizada
+        """
+        parsed = self._parse_head(head)
+        if parsed is None:
+            await self._send_error(writer, 400, 'Requisição inválida')
+            return False
+        method, target, version, headers = parsed
+
+        if 'chunked' in headers.get('Transfer-Encoding', '').lower():
+            await self._send_error(writer, 411, 'Content-Length obrigatório')
+            return False
+        try:
+            content_length = int(headers.get('Content-Length', 0) or 0)
+        except ValueError:
+            await self._send_error(writer, 400, 'Content-Length inválido')
+            return False
+
+        if self._in_flight >= self._max_in_flight:
+            self.rejected_requests += 1
+            await self._send_error(writer, 503, 'Servidor sobrecarregado, tente novamente em instantes',
+                                   [('Retry-After', str(self.retry_after))])
+            return False
+
+        connection = headers.get('Connection', '').lower()
+        if version == 'HTTP/1.0':
+            keep_alive = 'keep-alive' in connection
+        else:
+            keep_alive = 'close' not in connection
+
+        if content_length and headers.get('Expect', '').lower() == '100-continue':
+            writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+
+        body = BodyReader(self._blocking_reader(reader), content_length)
+        request = Request(method, target, headers, body, version)
+
+        self._in_flight += 1
+        try:
+            response = await self._loop.run_in_executor(self._executor, self.application.handle, request)
+            # Corpo não lido deixaria lixo na conexão keep-alive
+            keep_alive = keep_alive and not request.body_pending and not self._closing
+            keep_alive = await self._send_response(writer, request, response, keep_alive)
+            logger.access(method, target, response.status, client=self._client(writer))
+            return keep_alive
+        finally:
+            self._in_flight -= 1
+
+    @staticmethod
+    def _client(writer):
+        peer = writer.get_extra_info('peername')
+        return peer[0] if peer else None
+
+    def _parse_head(self, head):
+        """
+        Returns:
+            tuple: (método, alvo, versão, Headers) ou None se malformada
+        """
+        try:
+            lines = head.decode('latin-1').split('\r\n')
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            return None
+        if not version.startswith('HTTP/1.'):
+            return None
+
+        headers = Headers()
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, separator, value = line.partition(':')
+            if not separator:
+                return None
+            name = name.strip().lower()
+            value = value.strip()
+            if name in headers:
+                value = f'{dict.__getitem__(headers, name)}, {value}'
+            dict.__setitem__(headers, name, value)
+        return method, target, version, headers
+
+    def _blocking_reader(self, reader):
+        """
+        Cria uma função read(n) para as threads da aplicação lerem o corpo
+        diretamente do StreamReader, sem carregá-lo inteiro em memória
+        """
+        def read(size):
+            future = asyncio.run_coroutine_threadsafe(
+                asyncio.wait_for(reader.read(size), self.keepalive_timeout), self._loop)
+            try:
+                return future.result()
+            except (asyncio.TimeoutError, ConnectionError):
+                return b''
+        return read
+
+    async def _send_response(self, writer, request, response, keep_alive):
+        """
+        Escreve a resposta; corpos em streaming são gerados no executor
+
+        Returns:
+            bool: Se a conexão pode ser reutilizada
+        """
+        chunked = response.streaming and request.version != 'HTTP/1.0'
+        if response.streaming and not chunked:
+            # Clientes HTTP/1.0 recebem o corpo cru, delimitado pelo fechamento
+            keep_alive = False
+
+        lines = [f'HTTP/1.1 {response.status} {self._reason(response.status)}',
+                 f'Date: {formatdate(usegmt=True)}']
+        lines.extend(f'{header}: {value}' for header, value in response.headers)
+        if chunked:
+            lines.append('Transfer-Encoding: chunked')
+        if not keep_alive:
+            lines.append('Connection: close')
+        elif request.version == 'HTTP/1.0':
+            lines.append('Connection: keep-alive')
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        if not response.streaming:
+            started = time.perf_counter()
+            writer.write(head + response.body if response.body else head)
+            await writer.drain()
+            if request.trace is not None:
+                self.application.complete(request, response, time.perf_counter() - started)
+            return keep_alive
+
+        started = time.perf_counter()
+        writer.write(head)
+        write_seconds = time.perf_counter() - started
+        chunks = iter(response.body)
+        try:
+            while True:
+                chunk = await self._loop.run_in_executor(self._executor, next, chunks, None)
+                if chunk is None:
+                    break
+                if not chunk:
+                    continue
+                started = time.perf_counter()
+                writer.write(b'%x\r\n%b\r\n' % (len(chunk), chunk) if chunked else chunk)
+                await writer.drain()
+                write_seconds += time.perf_counter() - started
+            if chunked:
+                writer.write(b'0\r\n\r\n')
+                await writer.drain()
+        except Exception as e:
+            # Sem o chunk final o cliente percebe que a resposta ficou incompleta
+            logger.error("Erro durante o envio em streaming", path=request.target, error=str(e))
+            keep_alive = False
+        finally:
+            close = getattr(response.body, 'close', None)
+            if close:
+                await self._loop.run_in_executor(self._executor, close)
+        if request.trace is not None:
+            self.application.complete(request, response, write_seconds)
+        return keep_alive
+
+    async def _send_error(self, writer, status_code, message, extra_headers=()):
+        body = json.dumps({
+            'success': False,
+            'message': message
+        }, ensure_ascii=False).encode('utf-8')
+
+        lines = [f'HTTP/1.1 {status_code} {self._reason(status_code)}',
+                 'Content-Type: application/json',
+                 f'Content-Length: {len(body)}',
+                 'Access-Control-Allow-Origin: *',
+                 'Connection: close']
+        lines.extend(f'{header}: {value}' for header, value in extra_headers)
+        try:
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    @staticmethod
+    def _reason(status_code):
+        try:
+            return HTTPStatus(status_code).phrase
+        except ValueError:
+            return ''
@@ -0,0 +1,213 @@
+"""
+Compressão das respostas HTTP
+Negocia Accept-Encoding, comprime corpos completos ou em streaming e mede o ganho
+"""
+
+import os
+import threading
+import time
+import zlib
+from config import load_env_file
+
+try:
+    import brotli
+except ImportError:  # Brotli é opcional: sem ele, gzip/deflate são oferecidos
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+# O compressor acumula blocos antes de emitir: eventos SSE chegariam atrasados
+UNCOMPRESSED_TYPES = ('text/event-stream',)
+
+
+def get_compression_config():
+    load_env_file()
+
+    return {
+        'enabled': os.getenv('COMPRESSION_ENABLED', 'true').lower() in ('1', 'true', 'yes'),
+        'min_size': int(os.getenv('COMPRESSION_MIN_SIZE', '1024')),
+        'level': int(os.getenv('COMPRESSION_LEVEL', '6')),
+        'brotli_quality': int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+    }
+
+
+class CompressionStats:
+    """
+    Contadores de bytes economizados e CPU gasta por codificação
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_encoding = {}
+        self.skipped_small = 0
+
+    def record(self, encoding, bytes_in, bytes_out, cpu_seconds):
+        with self._lock:
+            entry = self._by_encoding.setdefault(encoding, {
+                'responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'cpu_seconds': 0.0
+            })
+            entry['responses'] += 1
+            entry['bytes_in'] += bytes_in
+            entry['bytes_out'] += bytes_out
+            entry['cpu_seconds'] += cpu_seconds
+
+    def record_skipped(self):
+        with self._lock:
+            self.skipped_small += 1
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Por codificação, bytes de entrada/saída, economia e CPU
+        """
+        with self._lock:
+            encodings = {}
+            for encoding, entry in self._by_encoding.items():
+                saved = entry['bytes_in'] - entry['bytes_out']
+                encodings[encoding] = dict(entry, **{
+                    'bytes_saved': saved,
+                    'ratio': entry['bytes_out'] / entry['bytes_in'] if entry['bytes_in'] else 1.0,
+                    'bytes_saved_per_cpu_ms': (saved / (entry['cpu_seconds'] * 1000)
+                                               if entry['cpu_seconds'] else 0.0)
+                })
+            return {'skipped_small': self.skipped_small, 'encodings': encodings}
+
+
+class ResponseCompressor:
+    """
+    Escolhe a codificação para cada requisição e comprime o corpo
+    """
+
+    def __init__(self, enabled=True, min_size=1024, level=6, brotli_quality=5):
+        """
+        Args:
+            enabled (bool): Desliga a compressão por completo quando False
+            min_size (int): Corpos menores que isso seguem sem compressão
+            level (int): Nível do gzip/deflate (1 = rápido, 9 = menor)
+            brotli_quality (int): Qualidade do brotli (0 a 11)
+        """
+        self.enabled = enabled
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.stats = CompressionStats()
+        self.available = (('br',) if brotli else ()) + ('gzip', 'deflate')
+
+    @classmethod
+    def from_env(cls):
+        return cls(**get_compression_config())
+
+    def negotiate(self, accept_encoding, content_type):
+        """
+        Escolhe a codificação aceita pelo cliente, em ordem de preferência do servidor
+
+        Args:
+            accept_encoding (str): Header Accept-Encoding da requisição
+            content_type (str): Content-Type da resposta
+        Returns:
+            str: 'br', 'gzip', 'deflate' ou None para enviar sem compressão
+        """
+        if not self.enabled or not accept_encoding or not content_type:
+            return None
+        if not content_type.startswith(COMPRESSIBLE_TYPES) or content_type.startswith(UNCOMPRESSED_TYPES):
+            return None
+
+        accepted = {}
+        for item in accept_encoding.split(','):
+            name, _, params = item.strip().partition(';')
+            quality = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+
+        for encoding in self.available:
+            if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+                return encoding
+        return None
+
+    def compress(self, body, encoding):
+        """
+        Comprime um corpo completo; abaixo de min_size devolve None
+
+        Returns:
+            bytes: Corpo comprimido ou None se não compensar comprimir
+        """
+        if len(body) < self.min_size:
+            self.stats.record_skipped()
+            return None
+
+        started = time.thread_time()
+        compressor = self._compressor(encoding)
+        compressed = compressor[0](body) + compressor[1]()
+        self.stats.record(encoding, len(body), len(compressed), time.thread_time() - started)
+        return compressed
+
+    def compress_stream(self, chunks, encoding):
+        """
+        Comprime um corpo em streaming, mantendo só o estado do compressor em memória
+
+        Yields:
+            bytes: Blocos comprimidos (pode pular blocos enquanto o compressor acumula)
+        """
+        process, finish = self._compressor(encoding)
+        bytes_in = bytes_out = 0
+        cpu_seconds = 0.0
+        try:
+            for chunk in chunks:
+                started = time.thread_time()
+                output = process(chunk)
+                cpu_seconds += time.thread_time() - started
+                bytes_in += len(chunk)
+                if output:
+                    bytes_out += len(output)
+                    yield output
+
+            started = time.thread_time()
+            output = finish()
+            cpu_seconds += time.thread_time() - started
+            bytes_out += len(output)
+            yield output
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close:
+                close()
+            self.stats.record(encoding, bytes_in, bytes_out, cpu_seconds)
+
+    def _compressor(self, encoding):
+        """
+        Returns:
+            tuple: (função que processa um bloco, função que finaliza o fluxo)
+        """
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            return compressor.process, compressor.finish
+        # wbits 31 gera o formato gzip; 15 gera zlib, que é o "deflate" do HTTP
+        wbits = 31 if encoding == 'gzip' else 15
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, wbits)
+        return compressor.compress, compressor.flush
+
+
+def tag_etag(etag, encoding):
+    """
+    Diferencia a ETag por codificação: "abc" vira "abc-gzip"
+    """
+    if not etag or not encoding or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def untag_if_none_match(if_none_match):
+    """
+    Remove os sufixos de codificação do If-None-Match antes da comparação
+    """
+    if not if_none_match:
+        return if_none_match
+    for encoding in ('br', 'gzip', 'deflate'):
+        if_none_match = if_none_match.replace(f'-{encoding}"', '"')
+    return if_none_match
+
+
+response_compressor = ResponseCompressor.from_env()
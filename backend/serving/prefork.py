@@ -0,0 +1,238 @@
+"""
+Modo multiprocesso
+Um supervisor abre a porta e mantém N processos de servidor atendendo no mesmo
+endereço: cada um tem seu próprio GIL, pool de conexões e threads
+"""
+
+import os
+import select
+import signal
+import socket
+import subprocess
+import threading
+import time
+from observability.log import logger
+
+# Um worker que morre antes disso conta como falha de inicialização
+MIN_HEALTHY_UPTIME = 5.0
+MAX_RESTART_DELAY = 30.0
+
+
+def create_listener(server_address, reuse_port=False, backlog=128, listen=True):
+    """
+    Abre o socket de escuta
+
+    Args:
+        server_address (tuple): Endereço (host, porta)
+        reuse_port (bool): Liga SO_REUSEPORT, para que vários processos abram
+            a mesma porta e o kernel distribua as conexões entre eles
+        backlog (int): Conexões aguardando accept
+        listen (bool): False só reserva o endereço; com SO_REUSEPORT, um socket
+            que escuta recebe sua parte das conexões mesmo sem ninguém aceitá-las
+    Returns:
+        socket.socket: Socket aberto na porta
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(server_address)
+        if listen:
+            sock.listen(backlog)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def notify_ready(ready_fd):
+    """
+    Avisa o supervisor que o worker já está aceitando conexões
+    """
+    if ready_fd is None:
+        return
+    try:
+        os.write(ready_fd, b'1')
+    finally:
+        os.close(ready_fd)
+
+
+class _Worker:
+    __slots__ = ('slot', 'process', 'started')
+
+    def __init__(self, slot, process):
+        self.slot = slot
+        self.process = process
+        self.started = time.monotonic()
+
+
+class ProcessSupervisor:
+    """
+    Mantém `processes` workers vivos e os reinicia quando preciso
+
+    Cada worker é um novo interpretador (subprocess) que importa a aplicação
+    do zero: nada criado na importação do supervisor (pool do banco, conexões
+    SQLite, threads de fundo) atravessa para os workers, e um reinício carrega
+    o código atual do disco.
+
+    Sinais:
+    - SIGTERM/SIGINT: encerra os workers com SIGTERM (cada um conclui as
+      requisições em andamento) e sai
+    - SIGHUP: reinício gradual, um worker por vez; o antigo só recebe SIGTERM
+      depois que o novo avisa que está pronto, então a porta nunca fica sem
+      quem atenda
+    """
+
+    def __init__(self, command, processes, listener=None, graceful_timeout=30,
+                 ready_timeout=30, restart_delay=1.0):
+        """
+        Args:
+            command (callable): command(slot, ready_fd, listen_fd) → argv do worker
+            processes (int): Número de workers
+            listener (socket.socket): Socket herdado pelos workers; None quando
+                cada worker abre o seu com SO_REUSEPORT
+            graceful_timeout (float): Espera pelo fim de um worker antes do SIGKILL
+            ready_timeout (float): Espera pelo aviso de pronto de um worker novo
+            restart_delay (float): Espera inicial antes de recriar um worker que
+                falhou logo ao iniciar; dobra a cada falha seguida
+        """
+        self.command = command
+        self.processes = processes
+        self.listener = listener
+        self.graceful_timeout = graceful_timeout
+        self.ready_timeout = ready_timeout
+        self.restart_delay = restart_delay
+        self.restarts = 0
+
+        self._workers = {}
+        # slot → (instante do próximo início, falhas seguidas)
+        self._backoff = {}
+        self._stopping = False
+        self._reload = False
+        self._wake = threading.Event()
+
+    def run(self):
+        """
+        Inicia os workers e os supervisiona até SIGTERM/SIGINT
+        """
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_reload)
+
+        for slot in range(self.processes):
+            self._start(slot)
+        logger.info("Supervisor iniciado", pid=os.getpid(), processes=self.processes,
+                    workers=[worker.process.pid for worker in self._workers.values()])
+
+        while not self._stopping:
+            self._wake.wait(0.5)
+            self._wake.clear()
+            if self._stopping:
+                break
+            self._reap()
+            if self._reload:
+                self._reload = False
+                self._rolling_restart()
+
+        self._stop_all()
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
+        self._wake.set()
+
+    def _request_reload(self, signum, frame):
+        self._reload = True
+        self._wake.set()
+
+    def _start(self, slot):
+        """
+        Inicia o worker do slot e espera o aviso de pronto
+
+        Returns:
+            bool: Se o worker ficou pronto dentro de ready_timeout
+        """
+        ready_read, ready_write = os.pipe()
+        listen_fd = self.listener.fileno() if self.listener is not None else None
+        pass_fds = (ready_write,) if listen_fd is None else (ready_write, listen_fd)
+        try:
+            process = subprocess.Popen(self.command(slot, ready_write, listen_fd), pass_fds=pass_fds)
+        finally:
+            os.close(ready_write)
+
+        self._workers[slot] = _Worker(slot, process)
+        try:
+            readable, _, _ = select.select([ready_read], [], [], self.ready_timeout)
+            ready = bool(readable) and os.read(ready_read, 1) == b'1'
+        finally:
+            os.close(ready_read)
+        if not ready:
+            logger.error("Worker não ficou pronto", slot=slot, pid=process.pid,
+                         exit_code=process.poll())
+        return ready
+
+    def _reap(self):
+        """
+        Recria os workers que saíram, com espera crescente se falham ao iniciar
+        """
+        now = time.monotonic()
+        for slot, worker in list(self._workers.items()):
+            exit_code = worker.process.poll()
+            if exit_code is None:
+                continue
+            del self._workers[slot]
+
+            uptime = now - worker.started
+            failures = self._backoff.get(slot, (0, 0))[1] + 1 if uptime < MIN_HEALTHY_UPTIME else 0
+            delay = min(self.restart_delay * 2 ** (failures - 1), MAX_RESTART_DELAY) if failures else 0
+            self._backoff[slot] = (now + delay, failures)
+            logger.warning("Worker encerrado inesperadamente", slot=slot, pid=worker.process.pid,
+                           exit_code=exit_code, uptime=round(uptime, 1), restart_in=delay)
+
+        for slot, (due, failures) in list(self._backoff.items()):
+            if slot in self._workers or due > now:
+                continue
+            self.restarts += 1
+            self._start(slot)
+            if not failures:
+                del self._backoff[slot]
+
+    def _rolling_restart(self):
+        logger.info("Reinício gradual dos workers", processes=len(self._workers))
+        for slot in sorted(self._workers):
+            if self._stopping:
+                return
+            old = self._workers[slot]
+            if not self._start(slot):
+                # O novo não subiu: mantém o antigo e interrompe o reinício
+                self._terminate([self._workers[slot]])
+                self._workers[slot] = old
+                logger.error("Reinício gradual interrompido", slot=slot)
+                return
+            self._terminate([old])
+            self.restarts += 1
+        logger.info("Reinício gradual concluído",
+                    workers=[worker.process.pid for worker in self._workers.values()])
+
+    def _terminate(self, workers):
+        """
+        SIGTERM e espera até graceful_timeout; quem não sair recebe SIGKILL
+        """
+        for worker in workers:
+            if worker.process.poll() is None:
+                worker.process.terminate()
+        deadline = time.monotonic() + self.graceful_timeout
+        for worker in workers:
+            try:
+                worker.process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                logger.warning("Worker não encerrou a tempo; forçando", pid=worker.process.pid)
+                worker.process.kill()
+                worker.process.wait()
+
+    def _stop_all(self):
+        logger.info("Encerrando workers", processes=len(self._workers))
+        self._terminate(list(self._workers.values()))
+        self._workers.clear()
+        if self.listener is not None:
+            self.listener.close()
@@ -0,0 +1,204 @@
+"""
+Roteador de requisições
+Resolve método + caminho em uma árvore de segmentos montada no registro das rotas,
+com parâmetros tipados, 404/405 compartilhados e middlewares por rota
+"""
+
+import time
+
+# Conversores de parâmetros: (validação do segmento, conversão do valor)
+CONVERTERS = {
+    'int': (lambda segment: segment.isascii() and segment.isdigit(), int),
+    'str': (bool, str)
+}
+
+
+class Route:
+    """
+    Rota registrada: padrão, handler e a cadeia de middlewares já composta
+    """
+    __slots__ = ('method', 'pattern', 'handler', 'middleware', 'call')
+
+    def __init__(self, method, pattern, handler, middleware):
+        self.method = method
+        self.pattern = pattern
+        self.handler = handler
+        self.middleware = tuple(middleware)
+        self.call = None
+
+
+class _Node:
+    __slots__ = ('static', 'param', 'routes')
+
+    def __init__(self):
+        # Segmentos fixos têm prioridade sobre o parâmetro do mesmo nível
+        self.static = {}
+        # (nome, validação, conversão, nó filho) ou None
+        self.param = None
+        # Método HTTP -> Route
+        self.routes = {}
+
+
+class Router:
+    """
+    Tabela de rotas em árvore de segmentos
+
+    Padrões como '/tasks/<int:task_id>/complete' são quebrados em segmentos no
+    registro; a resolução percorre um dict por segmento, sem regex por requisição.
+    O handler recebe a requisição e os parâmetros convertidos como argumentos
+    nomeados e devolve (status_code, response_body, headers).
+
+    Um middleware é uma função middleware(request, call_next) que devolve a mesma
+    tupla; pode medir, responder direto (cache, auth) ou alterar a resposta.
+    Os globais (use) envolvem os da rota, e a cadeia é composta uma única vez.
+    """
+
+    def __init__(self, error_response):
+        """
+        Args:
+            error_response (callable): error_response(status_code, message)
+                monta as respostas de 404 e 405
+        """
+        self._root = _Node()
+        # Caminhos sem parâmetros resolvem com uma única busca em dict
+        self._static_paths = {}
+        self._routes = []
+        self._middleware = []
+        self._error_response = error_response
+
+    def add(self, method, pattern, handler, middleware=()):
+        """
+        Registra uma rota
+
+        Args:
+            method (str): Método HTTP
+            pattern (str): Caminho com parâmetros no formato <tipo:nome> ou <nome>
+            handler (callable): handler(request, **parâmetros)
+            middleware (iterable): Middlewares aplicados só a esta rota
+        Returns:
+            Route: A rota registrada
+        """
+        node = self._root
+        has_params = False
+        for segment in self._split(pattern):
+            if segment.startswith('<') and segment.endswith('>'):
+                converter, _, name = segment[1:-1].rpartition(':')
+                if (converter or 'str') not in CONVERTERS:
+                    raise ValueError(f"Conversor de rota desconhecido: {converter}")
+                validate, convert = CONVERTERS[converter or 'str']
+                if node.param is None:
+                    node.param = (name, validate, convert, _Node())
+                elif node.param[:3] != (name, validate, convert):
+                    raise ValueError(f"Parâmetro conflitante em {pattern}")
+                node = node.param[3]
+                has_params = True
+            else:
+                node = node.static.setdefault(segment, _Node())
+
+        if method in node.routes:
+            raise ValueError(f"Rota duplicada: {method} {pattern}")
+        route = Route(method, pattern, handler, middleware)
+        self._compose(route)
+        node.routes[method] = route
+        if not has_params:
+            self._static_paths['/' + '/'.join(self._split(pattern))] = node
+        self._routes.append(route)
+        return route
+
+    def route(self, method, pattern, middleware=()):
+        """
+        Decorador equivalente a add()
+        """
+        def decorator(handler):
+            self.add(method, pattern, handler, middleware)
+            return handler
+        return decorator
+
+    def use(self, middleware):
+        """
+        Adiciona um middleware aplicado a todas as rotas
+        """
+        self._middleware.append(middleware)
+        for route in self._routes:
+            self._compose(route)
+
+    def resolve(self, method, path):
+        """
+        Encontra a rota para o método e caminho
+
+        Returns:
+            tuple: (Route ou None, parâmetros, métodos aceitos no caminho)
+        """
+        params = {}
+        node = self._static_paths.get(path)
+        if node is None:
+            node = self._match(path, params)
+            if node is None:
+                return None, params, ()
+
+        route = node.routes.get(method)
+        return route, params, tuple(node.routes) if route is None else ()
+
+    def _match(self, path, params):
+        node = self._root
+        for segment in self._split(path):
+            child = node.static.get(segment)
+            if child is None:
+                if node.param is None:
+                    return None
+                name, validate, convert, child = node.param
+                if not validate(segment):
+                    return None
+                params[name] = convert(segment)
+            node = child
+        return node
+
+    def dispatch(self, request):
+        """
+        Resolve e executa a rota da requisição
+
+        Returns:
+            tuple: (status_code, response_body, headers)
+        """
+        route, params, allowed = self.resolve(request.method, request.path)
+        if route is None:
+            if allowed:
+                status_code, response_body, headers = self._error_response(405, 'Método não permitido')
+                return status_code, response_body, dict(headers, Allow=', '.join(allowed))
+            return self._error_response(404, 'Rota não encontrada')
+
+        request.route = route
+        request.params = params
+        return route.call(request)
+
+    def _compose(self, route):
+        handler = route.handler
+
+        def call(request):
+            return handler(request, **request.params)
+
+        for middleware in reversed(self._middleware + list(route.middleware)):
+            call = self._wrap(middleware, call)
+        route.call = call
+
+    @staticmethod
+    def _wrap(middleware, call_next):
+        def call(request):
+            return middleware(request, call_next)
+        return call
+
+    @staticmethod
+    def _split(path):
+        # '/tasks/1/' e '/tasks/1' resolvem para a mesma rota
+        segments = path.strip('/').split('/')
+        return segments if '' not in segments else [segment for segment in segments if segment]
+
+
+def timing_middleware(request, call_next):
+    """
+    Informa o tempo gasto no handler no header Server-Timing
+    """
+    started = time.perf_counter()
+    status_code, response_body, headers = call_next(request)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return status_code, response_body, dict(headers, **{'Server-Timing': f'app;dur={elapsed_ms:.2f}'})
@@ -0,0 +1,186 @@
+"""
+Servidor HTTP com pool de workers limitado
+Atende várias requisições em paralelo sem criar uma thread por conexão
+"""
+
+import json
+import queue
+import socket
+import threading
+import time
+from http.server import HTTPServer
+
+# Sinal enviado aos workers para que encerrem após drenar a fila
+_STOP = object()
+# Tempo máximo gasto com uma conexão rejeitada (ler a requisição, responder 503
+# e esperar o cliente fechar) e bytes lidos dela no máximo
+REJECT_TIMEOUT = 1.0
+REJECT_MAX_BYTES = 1024 * 1024
+
+
+class BoundedThreadPoolHTTPServer(HTTPServer):
+    """
+    HTTPServer que entrega as conexões aceitas para um número fixo de workers
+
+    As conexões aguardam em uma fila limitada. Quando a fila está cheia o
+    servidor responde 503 com Retry-After em vez de acumular conexões, e no
+    encerramento as requisições já aceitas são concluídas antes de parar.
+
+    Uma conexão keep-alive ocupa seu worker enquanto estiver aberta, então o
+    handler a fecha ao fim da resposta quando há conexões na fila (waiting).
+    O 503 é escrito por uma thread própria, que lê a requisição antes de
+    responder e espera o cliente fechar: fechar o socket com dados não lidos
+    faria o kernel enviar RST, e o cliente veria a conexão resetada em vez
+    da resposta.
+    """
+
+    def __init__(self, server_address, handler_class, workers=8, queue_size=64,
+                 retry_after=1, drain_timeout=30, sock=None):
+        """
+        Args:
+            server_address (tuple): Endereço (host, porta)
+            handler_class (type): Classe que trata cada requisição
+            workers (int): Número de threads que atendem requisições
+            queue_size (int): Conexões que podem aguardar por um worker
+            retry_after (int): Segundos sugeridos ao cliente no 503
+            drain_timeout (float): Tempo máximo para drenar a fila ao parar
+            sock (socket.socket): Socket já escutando (modo multiprocesso);
+                quando informado, server_address é ignorado
+        """
+        super().__init__(server_address, handler_class, bind_and_activate=sock is None)
+        if sock is not None:
+            self.socket.close()
+            self.socket = sock
+            self.server_address = sock.getsockname()
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self.drain_timeout = drain_timeout
+        self.rejected_requests = 0
+        self._requests = queue.Queue(maxsize=queue_size)
+        self._rejected = queue.Queue(maxsize=max(1, queue_size))
+        self._threads = []
+        self._start_workers()
+        self._reject_thread = threading.Thread(target=self._reject_loop, name='http-reject', daemon=True)
+        self._reject_thread.start()
+
+    @property
+    def waiting(self):
+        """
+        Se há conexões na fila esperando por um worker
+        """
+        return not self._requests.empty()
+
+    def _start_workers(self):
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f'http-worker-{index}',
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker_loop(self):
+        while True:
+            item = self._requests.get()
+            if item is _STOP:
+                return
+
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def process_request(self, request, client_address):
+        """
+        Enfileira a conexão para um worker ou rejeita com 503 se a fila estiver cheia
+        """
+        try:
+            self._requests.put_nowait((request, client_address))
+        except queue.Full:
+            self.rejected_requests += 1
+            try:
+                self._rejected.put_nowait(request)
+            except queue.Full:
+                # Nem o 503 dá conta: fecha sem responder
+                self.shutdown_request(request)
+
+    def _reject_loop(self):
+        while True:
+            request = self._rejected.get()
+            if request is _STOP:
+                return
+            try:
+                self._send_overloaded(request)
+            finally:
+                self.shutdown_request(request)
+
+    def _send_overloaded(self, request):
+        """
+        Responde 503 sem ocupar um worker
+
+        Lê o cabeçalho da requisição, escreve a resposta, encerra a escrita
+        e lê o que o cliente ainda mandar até ele fechar, tudo limitado por
+        REJECT_TIMEOUT e REJECT_MAX_BYTES.
+        """
+        body = json.dumps({
+            'success': False,
+            'message': 'Servidor sobrecarregado, tente novamente em instantes'
+        }, ensure_ascii=False).encode('utf-8')
+
+        head = (
+            'HTTP/1.1 503 Service Unavailable\r\n'
+            'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Retry-After: {self.retry_after}\r\n'
+            'Access-Control-Allow-Origin: *\r\n'
+            'Connection: close\r\n'
+            '\r\n'
+        ).encode('latin-1')
+
+        deadline = time.monotonic() + REJECT_TIMEOUT
+        received = b''
+        try:
+            while b'\r\n\r\n' not in received and len(received) < REJECT_MAX_BYTES:
+                request.settimeout(max(0.01, deadline - time.monotonic()))
+                chunk = request.recv(65536)
+                if not chunk:
+                    break
+                received += chunk
+            request.sendall(head + body)
+            request.shutdown(socket.SHUT_WR)
+            drained = len(received)
+            while drained < REJECT_MAX_BYTES and time.monotonic() < deadline:
+                request.settimeout(max(0.01, deadline - time.monotonic()))
+                chunk = request.recv(65536)
+                if not chunk:
+                    break
+                drained += len(chunk)
+        except OSError:
+            pass
+
+    def server_close(self):
+        """
+        Para de aceitar conexões e aguarda os workers concluírem a fila
+        """
+        super().server_close()
+
+        deadline = time.monotonic() + self.drain_timeout
+        for _ in self._threads:
+            try:
+                self._requests.put(_STOP, timeout=max(0, deadline - time.monotonic()))
+            except queue.Full:
+                break
+
+        for thread in self._threads:
+            thread.join(max(0, deadline - time.monotonic()))
+
+        try:
+            self._rejected.put(_STOP, timeout=max(0, deadline - time.monotonic()))
+        except queue.Full:
+            return
+        self._reject_thread.join(max(0, deadline - time.monotonic()))
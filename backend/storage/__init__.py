@@ -0,0 +1 @@
+# Pacote storage 
\ No newline at end of file
@@ -0,0 +1,244 @@
+"""
+Interface de armazenamento das tarefas
+Task fala só com esta interface; cada backend (MySQL, SQLite, memória) a implementa
+"""
+
+# Colunas que podem ser alteradas por update_fields
+UPDATABLE_COLUMNS = frozenset(('title', 'description', 'status', 'due_date'))
+
+SELECT_COLUMNS = 'id, title, description, status, created_at, due_date, updated_at'
+
+
+class StorageBackend:
+    """
+    Operações de persistência das tarefas
+
+    Linhas são tuplas na ordem de TASK_COLUMNS (id, title, description, status,
+    created_at, due_date, updated_at). Métodos de escrita confirmam a alteração
+    antes de retornar; as operações em lote são atômicas.
+
+    Escritas em tarefas existentes devolvem o estado anterior (status,
+    vencimento) lido na própria escrita, atomicamente com ela, para que os
+    contadores de task_stats mudem pela diferença sem uma leitura à parte.
+    """
+
+    name = 'base'
+    # Backends sem busca full-text própria usam o índice invertido de models.search_index
+    supports_search = False
+
+    def get_table_version(self):
+        """
+        Returns:
+            tuple: (versão, data da última escrita) ou None se indisponível
+        """
+        raise NotImplementedError
+
+    def get_row(self, task_id):
+        """
+        Returns:
+            tuple: Linha da tarefa ou None
+        """
+        raise NotImplementedError
+
+    def list_rows(self, limit, after=None, status=None, due_from=None, due_to=None):
+        """
+        Linhas ordenadas por (created_at DESC, id DESC), a partir do cursor
+
+        Args:
+            limit (int): Máximo de linhas
+            after (tuple): (created_at, id) da última linha já entregue
+            status (str): Filtra pelo status
+            due_from (datetime): Vencimento a partir desta data (inclusive)
+            due_to (datetime): Vencimento antes desta data (exclusive)
+        Returns:
+            list: Linhas da página
+        """
+        raise NotImplementedError
+
+    def stream_rows(self, after=None, status=None, due_from=None, due_to=None, batch_size=500):
+        """
+        Como list_rows sem limite, em lotes, sem carregar tudo em memória
+
+        Yields:
+            list: Lote de linhas
+        """
+        raise NotImplementedError
+
+    def insert(self, title, description, status, due_date):
+        """
+        Returns:
+            int: ID gerado
+        """
+        raise NotImplementedError
+
+    def update(self, task_id, title, description, status, due_date):
+        """
+        Returns:
+            tuple: (status, vencimento) anteriores ou None se a tarefa não existir
+        """
+        raise NotImplementedError
+
+    def update_fields(self, task_id, fields):
+        """
+        Altera só as colunas informadas (já validadas contra UPDATABLE_COLUMNS)
+
+        Returns:
+            tuple: (linha atualizada, (status, vencimento) anteriores) ou None
+                se a tarefa não existir
+        """
+        raise NotImplementedError
+
+    def delete(self, task_id):
+        """
+        Returns:
+            tuple: (status, vencimento) da tarefa removida ou None se não existia
+        """
+        raise NotImplementedError
+
+    def insert_many(self, rows):
+        """
+        Insere várias tarefas em uma única transação
+
+        Args:
+            rows (list): Tuplas (title, description, status, due_date)
+        Returns:
+            list: IDs gerados, na ordem das linhas
+        """
+        raise NotImplementedError
+
+    def complete_many(self, task_ids):
+        """
+        Marca várias tarefas como concluídas em uma única transação
+
+        Returns:
+            dict: ID → (status, vencimento) anteriores, só das que existiam
+        """
+        raise NotImplementedError
+
+    def delete_many(self, task_ids):
+        """
+        Remove várias tarefas em uma única transação
+
+        Returns:
+            dict: ID → (status, vencimento) das removidas, só das que existiam
+        """
+        raise NotImplementedError
+
+    def write_batch(self, inserts, updates, deletes):
+        """
+        Aplica escritas de várias tarefas em uma única transação (um commit)
+
+        Args:
+            inserts (list): Tuplas (title, description, status, due_date)
+            updates (dict): ID → colunas a alterar, como em update_fields
+            deletes (set): IDs a remover, depois das alterações
+        Returns:
+            tuple: (IDs inseridos na ordem de inserts, dict ID → resultado de
+                update_fields, dict ID → estado anterior das removidas)
+        """
+        raise NotImplementedError
+
+    def search(self, query, limit, offset=0):
+        """
+        Busca textual em título e descrição, das tarefas mais relevantes para as menos
+
+        Args:
+            query (str): Texto buscado
+            limit (int): Máximo de resultados
+            offset (int): Resultados a pular
+        Returns:
+            list: Pares (linha, pontuação)
+        """
+        raise NotImplementedError
+
+    def count_by_status_and_due_day(self):
+        """
+        Contagem de tarefas agrupada por status e dia de vencimento (GROUP BY)
+
+        Returns:
+            list: Tuplas (status, dia de vencimento como date ou None, quantidade)
+        """
+        raise NotImplementedError
+
+    def stats(self):
+        """
+        Returns:
+            dict: Estado do backend para o /health
+        """
+        return {'backend': self.name}
+
+    def close(self):
+        pass
+
+
+def build_list_filters(after, status, due_from, due_to, placeholder='%s'):
+    """
+    Monta a cláusula WHERE da listagem para os backends SQL
+
+    Returns:
+        tuple: (cláusula WHERE, lista de parâmetros)
+    """
+    conditions = []
+    params = []
+
+    if status:
+        conditions.append(f"status = {placeholder}")
+        params.append(status)
+    if due_from:
+        conditions.append(f"due_date >= {placeholder}")
+        params.append(due_from)
+    if due_to:
+        conditions.append(f"due_date < {placeholder}")
+        params.append(due_to)
+    if after:
+        created_at, task_id = after
+        conditions.append(f"(created_at < {placeholder} OR "
+                          f"(created_at = {placeholder} AND id < {placeholder}))")
+        params.extend([created_at, created_at, task_id])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+class InstrumentedStorage:
+    """
+    Envolve um backend medindo cada operação no span 'query'
+
+    Só é instalado com as métricas ativas, então sem elas as chamadas vão
+    direto ao backend, sem custo extra.
+    """
+
+    # Operações que devolvem geradores: cada lote entregue é medido
+    _STREAMING = frozenset(('stream_rows',))
+
+    def __init__(self, backend, span):
+        """
+        Args:
+            backend (StorageBackend): Backend real
+            span (callable): span(nome) de observability.metrics
+        """
+        self.backend = backend
+        self._span = span
+
+    def __getattr__(self, name):
+        attribute = getattr(self.backend, name)
+        if not callable(attribute) or name.startswith('_') or name in ('stats', 'close'):
+            return attribute
+        if name in self._STREAMING:
+            return lambda *args, **kwargs: self._stream(attribute(*args, **kwargs))
+
+        def measured(*args, **kwargs):
+            with self._span('query'):
+                return attribute(*args, **kwargs)
+        return measured
+
+    def _stream(self, batches):
+        try:
+            while True:
+                with self._span('query'):
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                yield batch
+        finally:
+            batches.close()
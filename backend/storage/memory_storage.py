@@ -0,0 +1,161 @@
+"""
+Armazenamento das tarefas em memória do processo
+Para testes e benchmarks: mesma semântica dos backends SQL, sem persistência
+"""
+
+import bisect
+import threading
+from collections import Counter
+from datetime import datetime
+from storage.base import StorageBackend
+
+
+def _now():
+    # Mesma resolução de segundos das colunas TIMESTAMP
+    return datetime.now().replace(microsecond=0)
+
+
+class MemoryStorage(StorageBackend):
+    """
+    Backend em memória
+
+    As linhas ficam em um dict por ID e a ordem da listagem em uma lista
+    ordenada de (created_at, id), percorrida de trás para frente; o cursor
+    da paginação vira uma busca binária.
+    """
+
+    name = 'memory'
+
+    def __init__(self):
+        self._rows = {}
+        self._order = []
+        self._next_id = 1
+        self._version = 0
+        self._version_updated_at = _now()
+        self._lock = threading.RLock()
+
+    def _bump_version(self):
+        self._version += 1
+        self._version_updated_at = _now()
+
+    def get_table_version(self):
+        with self._lock:
+            return self._version, self._version_updated_at
+
+    def get_row(self, task_id):
+        return self._rows.get(task_id)
+
+    def list_rows(self, limit, after=None, status=None, due_from=None, due_to=None):
+        rows = []
+        with self._lock:
+            index = bisect.bisect_left(self._order, after) if after else len(self._order)
+            while index > 0 and len(rows) < limit:
+                index -= 1
+                row = self._rows[self._order[index][1]]
+                if status and row[3] != status:
+                    continue
+                if due_from and (row[5] is None or row[5] < due_from):
+                    continue
+                if due_to and (row[5] is None or row[5] >= due_to):
+                    continue
+                rows.append(row)
+        return rows
+
+    def stream_rows(self, after=None, status=None, due_from=None, due_to=None, batch_size=500):
+        # Lote a lote pelo cursor, sem segurar o lock durante o consumo
+        while True:
+            rows = self.list_rows(batch_size, after, status, due_from, due_to)
+            if not rows:
+                break
+            yield rows
+            last = rows[-1]
+            after = (last[4], last[0])
+
+    def _insert(self, title, description, status, due_date):
+        task_id = self._next_id
+        self._next_id += 1
+        now = _now()
+        self._rows[task_id] = (task_id, title, description, status, now, due_date, now)
+        bisect.insort(self._order, (now, task_id))
+        return task_id
+
+    def insert(self, title, description, status, due_date):
+        with self._lock:
+            task_id = self._insert(title, description, status, due_date)
+            self._bump_version()
+        return task_id
+
+    def update(self, task_id, title, description, status, due_date):
+        result = self.update_fields(task_id, {
+            'title': title, 'description': description, 'status': status, 'due_date': due_date
+        })
+        return result[1] if result else None
+
+    def update_fields(self, task_id, fields):
+        with self._lock:
+            previous = self._rows.get(task_id)
+            if previous is None:
+                return None
+            row = (task_id,
+                   fields.get('title', previous[1]),
+                   fields.get('description', previous[2]),
+                   fields.get('status', previous[3]),
+                   previous[4],
+                   fields.get('due_date', previous[5]),
+                   _now())
+            self._rows[task_id] = row
+            self._bump_version()
+        return row, (previous[3], previous[5])
+
+    def delete(self, task_id):
+        return self.delete_many([task_id]).get(task_id)
+
+    def insert_many(self, rows):
+        with self._lock:
+            ids = [self._insert(*row) for row in rows]
+            if ids:
+                self._bump_version()
+        return ids
+
+    def write_batch(self, inserts, updates, deletes):
+        with self._lock:
+            ids = self.insert_many(inserts)
+            updated = {task_id: self.update_fields(task_id, fields) for task_id, fields in updates.items()}
+            deleted = self.delete_many(list(deletes))
+        return ids, updated, deleted
+
+    def complete_many(self, task_ids):
+        found = {}
+        with self._lock:
+            for task_id in task_ids:
+                if task_id in self._rows and task_id not in found:
+                    found[task_id] = self.update_fields(task_id, {'status': 'concluída'})[1]
+        return found
+
+    def delete_many(self, task_ids):
+        found = {}
+        with self._lock:
+            for task_id in task_ids:
+                row = self._rows.pop(task_id, None)
+                if row is None:
+                    continue
+                index = bisect.bisect_left(self._order, (row[4], task_id))
+                del self._order[index]
+                found[task_id] = (row[3], row[5])
+            if found:
+                self._bump_version()
+        return found
+
+    def count_by_status_and_due_day(self):
+        with self._lock:
+            counts = Counter((row[3], row[5].date() if row[5] else None) for row in self._rows.values())
+        return [(status, due_day, count) for (status, due_day), count in counts.items()]
+
+    def stats(self):
+        with self._lock:
+            return {'backend': self.name, 'tasks': len(self._rows), 'version': self._version}
+
+    def close(self):
+        with self._lock:
+            self._rows.clear()
+            self._order.clear()
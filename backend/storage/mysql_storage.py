@@ -0,0 +1,250 @@
+"""
+Armazenamento das tarefas no MySQL
+Usa o pool e os formatos de query preparados de database.connection
+"""
+
+from database.connection import db
+from database.queries import FETCH_ALL, FETCH_ONE
+from storage.base import StorageBackend, SELECT_COLUMNS, build_list_filters
+
+_INSERT_QUERY = """
+    INSERT INTO tasks (title, description, status, due_date)
+    VALUES (%s, %s, %s, %s)
+"""
+_DELETE_MANY_QUERY = "DELETE FROM tasks WHERE id IN ({})"
+_UPDATE_QUERY = """
+    UPDATE tasks
+    SET title = %s, description = %s, status = %s, due_date = %s
+    WHERE id = %s
+"""
+_SELECT_BY_ID_QUERY = f"""
+    SELECT {SELECT_COLUMNS}
+    FROM tasks
+    WHERE id = %s
+"""
+# Trava a linha até o fim da transação: o estado lido é o que a escrita altera
+_SELECT_STATE_QUERY = "SELECT status, due_date FROM tasks WHERE id = %s FOR UPDATE"
+# A versão da tabela (ETags de GET /tasks) sobe uma vez por escrita ou por
+# transação em lote, como último comando antes do commit: a linha de
+# table_versions fica travada só durante o commit
+_BUMP_VERSION_QUERY = "UPDATE table_versions SET version = version + 1 WHERE table_name = 'tasks'"
+# ROW_COUNT() é o número de linhas do comando anterior (encontradas, com FOUND_ROWS)
+_BUMP_VERSION_IF_WRITTEN_QUERY = _BUMP_VERSION_QUERY + " AND ROW_COUNT() > 0"
+
+
+class MySQLStorage(StorageBackend):
+    """
+    Backend MySQL: conexões do pool, cursores preparados e transações InnoDB
+    """
+
+    name = 'mysql'
+    # Índice FULLTEXT ft_tasks_title_description (schema.sql)
+    supports_search = True
+
+    def __init__(self, chunk_size=1000):
+        """
+        Args:
+            chunk_size (int): Linhas por INSERT/UPDATE/DELETE nas operações em lote
+        """
+        self.chunk_size = chunk_size
+
+    def get_table_version(self):
+        return db.execute_named('tasks.table_version')
+
+    def get_row(self, task_id):
+        return db.execute_named('tasks.select_by_id', (task_id,))
+
+    def list_rows(self, limit, after=None, status=None, due_from=None, due_to=None):
+        where, params = build_list_filters(after, status, due_from, due_to)
+        query = f"""
+            SELECT {SELECT_COLUMNS}
+            FROM tasks
+            {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s
+        """
+        params.append(limit)
+        return db.execute_query(query, tuple(params), dictionary=False)
+
+    def stream_rows(self, after=None, status=None, due_from=None, due_to=None, batch_size=500):
+        where, params = build_list_filters(after, status, due_from, due_to)
+        query = f"""
+            SELECT {SELECT_COLUMNS}
+            FROM tasks
+            {where}
+            ORDER BY created_at DESC, id DESC
+        """
+        yield from db.stream_query(query, tuple(params), batch_size, dictionary=False)
+
+    def insert(self, title, description, status, due_date):
+        # O INSERT e o incremento da versão seguem na mesma ida ao banco
+        result, _ = db.execute_statements([
+            (_INSERT_QUERY, (title, description, status, due_date)),
+            (_BUMP_VERSION_QUERY, ())
+        ], atomic=True)
+        return result.lastrowid
+
+    def update(self, task_id, title, description, status, due_date):
+        previous, _, _ = db.execute_statements([
+            (_SELECT_STATE_QUERY, (task_id,)),
+            (_UPDATE_QUERY, (title, description, status, due_date, task_id)),
+            (_BUMP_VERSION_IF_WRITTEN_QUERY, ())
+        ], atomic=True, dictionary=False)
+        return previous[0] if previous else None
+
+    def update_fields(self, task_id, fields):
+        return self._update_fields(task_id, fields, versioned=True)
+
+    def _update_fields(self, task_id, fields, versioned=False):
+        """
+        Args:
+            versioned (bool): Incrementa a versão da tabela na mesma transação;
+                False quando quem chama o faz uma vez para o lote
+        """
+        columns = sorted(fields)
+        assignments = ', '.join(f"{column} = %s" for column in columns)
+        params = tuple(fields[column] for column in columns) + (task_id,)
+
+        # Estado anterior, UPDATE e linha atualizada em uma transação e uma ida ao banco
+        statements = [
+            (_SELECT_STATE_QUERY, (task_id,)),
+            (f"UPDATE tasks SET {assignments} WHERE id = %s", params)
+        ]
+        if versioned:
+            statements.append((_BUMP_VERSION_IF_WRITTEN_QUERY, ()))
+        statements.append((_SELECT_BY_ID_QUERY, (task_id,)))
+        results = db.execute_statements(statements, atomic=True, dictionary=False)
+        previous, rows = results[0], results[-1]
+        if not previous or not rows:
+            return None
+        return rows[0], previous[0]
+
+    def delete(self, task_id):
+        previous, _, _ = db.execute_statements([
+            (_SELECT_STATE_QUERY, (task_id,)),
+            ("DELETE FROM tasks WHERE id = %s", (task_id,)),
+            (_BUMP_VERSION_IF_WRITTEN_QUERY, ())
+        ], atomic=True, dictionary=False)
+        return previous[0] if previous else None
+
+    def insert_many(self, rows):
+        with db.transaction():
+            ids = self._insert_rows(rows)
+            self._bump_version(ids)
+        return ids
+
+    def _insert_rows(self, rows):
+        """
+        Cada bloco de chunk_size linhas vira um INSERT com várias linhas.
+        O InnoDB reserva de uma vez os IDs de um INSERT com número de linhas
+        conhecido, então o ID de cada linha é derivado do primeiro gerado.
+        Os IDs avançam de auto_increment_increment em auto_increment_increment,
+        que é maior que 1 em replicação multi-primário (Group Replication).
+        """
+        ids = []
+        with db.transaction():
+            step = db.execute_named('tasks.auto_increment_increment')[0]
+            for start in range(0, len(rows), self.chunk_size):
+                chunk = rows[start:start + self.chunk_size]
+                _, first_id = db.execute_many(_INSERT_QUERY, chunk)
+                ids.extend(range(first_id, first_id + len(chunk) * step, step))
+        return ids
+
+    def write_batch(self, inserts, updates, deletes):
+        # Um único commit e um único incremento da versão para o lote
+        with db.transaction():
+            ids = self._insert_rows(inserts) if inserts else []
+            updated = {task_id: self._update_fields(task_id, fields) for task_id, fields in updates.items()}
+            deleted = self._bulk_write(list(deletes), _DELETE_MANY_QUERY) if deletes else {}
+            changed = ids or deleted or any(result is not None for result in updated.values())
+            self._bump_version(changed)
+        return ids, updated, deleted
+
+    def complete_many(self, task_ids):
+        with db.transaction():
+            found = self._bulk_write(task_ids, "UPDATE tasks SET status = 'concluída' WHERE id IN ({})")
+            self._bump_version(found)
+        return found
+
+    def delete_many(self, task_ids):
+        with db.transaction():
+            found = self._bulk_write(task_ids, _DELETE_MANY_QUERY)
+            self._bump_version(found)
+        return found
+
+    def _bulk_write(self, task_ids, write_query):
+        """
+        Aplica um UPDATE/DELETE por blocos de IDs dentro de uma transação,
+        travando antes as linhas existentes para saber quais foram afetadas
+        e em que estado estavam
+
+        Returns:
+            dict: ID → (status, vencimento) anteriores das linhas afetadas
+        """
+        found = {}
+        with db.transaction():
+            for start in range(0, len(task_ids), self.chunk_size):
+                chunk = task_ids[start:start + self.chunk_size]
+                placeholders = ', '.join(['%s'] * len(chunk))
+
+                rows = db.execute_query(
+                    f"SELECT id, status, due_date FROM tasks WHERE id IN ({placeholders}) FOR UPDATE",
+                    tuple(chunk), dictionary=False
+                )
+                if not rows:
+                    continue
+
+                placeholders = ', '.join(['%s'] * len(rows))
+                db.execute_query(write_query.format(placeholders), tuple(row[0] for row in rows))
+                found.update((task_id, (status, due_date)) for task_id, status, due_date in rows)
+        return found
+
+    @staticmethod
+    def _bump_version(changed):
+        """
+        Incrementa a versão da tabela dentro da transação aberta, se algo mudou
+        """
+        if changed:
+            db.execute_named('tasks.bump_version')
+
+    def search(self, query, limit, offset=0):
+        rows = db.execute_named('tasks.search', (query, query, limit, offset))
+        return [(row[:-1], row[-1]) for row in rows]
+
+    def count_by_status_and_due_day(self):
+        return db.execute_named('tasks.count_by_status_due_day')
+
+    def stats(self):
+        return {
+            'backend': self.name,
+            'database_pool': db.get_pool_stats(),
+            'queries': db.get_query_stats()
+        }
+
+    def close(self):
+        db.close_connection()
+
+
+# Queries de formato fixo: preparadas uma vez por conexão e medidas por nome
+db.register_query('tasks.select_by_id', _SELECT_BY_ID_QUERY, fetch=FETCH_ONE)
+db.register_query('tasks.auto_increment_increment', "SELECT @@SESSION.auto_increment_increment",
+                  fetch=FETCH_ONE)
+db.register_query('tasks.bump_version', _BUMP_VERSION_QUERY)
+db.register_query('tasks.search', f"""
+    SELECT {SELECT_COLUMNS},
+           MATCH(title, description) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score
+    FROM tasks
+    WHERE MATCH(title, description) AGAINST (%s IN NATURAL LANGUAGE MODE)
+    ORDER BY score DESC, id DESC
+    LIMIT %s OFFSET %s
+""", fetch=FETCH_ALL)
+db.register_query('tasks.count_by_status_due_day', """
+    SELECT status, DATE(due_date) AS due_day, COUNT(*)
+    FROM tasks
+    GROUP BY status, due_day
+""", fetch=FETCH_ALL)
+db.register_query('tasks.table_version', """
+    SELECT version, updated_at
+    FROM table_versions
+    WHERE table_name = 'tasks'
+""", fetch=FETCH_ONE)
@@ -0,0 +1,423 @@
+"""
+Armazenamento das tarefas em SQLite embutido
+Para nós de borda e desenvolvimento local: sem ida à rede, cada leitura é uma
+busca em B-tree no próprio processo
+"""
+
+import sqlite3
+import threading
+from datetime import date, datetime
+from models.search_index import tokenize
+from storage.base import StorageBackend, SELECT_COLUMNS, build_list_filters
+
+# Mesmo formato de datetime('now', 'localtime'), para que datas gravadas pelo
+# banco e pela aplicação se comparem corretamente como texto
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('TIMESTAMP', lambda value: datetime.fromisoformat(value.decode()))
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        description TEXT,
+        status TEXT NOT NULL DEFAULT 'pendente' CHECK (status IN ('pendente', 'concluída')),
+        created_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+        due_date TIMESTAMP,
+        updated_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime'))
+    );
+    CREATE INDEX IF NOT EXISTS idx_tasks_created_id ON tasks (created_at, id);
+    CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks (status, created_at, id);
+    CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+    CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks (status, due_date);
+
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime'))
+    ) WITHOUT ROWID;
+    INSERT OR IGNORE INTO table_versions (table_name) VALUES ('tasks');
+"""
+
+# Índice FTS5 sobre o conteúdo de tasks (sem duplicar o texto), mantido por triggers
+_SEARCH_SCHEMA = """
+    CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, description,
+        content = 'tasks', content_rowid = 'id',
+        tokenize = 'unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END;
+    CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END;
+    CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END;
+    INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild');
+"""
+
+_SELECT_BY_ID_QUERY = f"SELECT {SELECT_COLUMNS} FROM tasks WHERE id = ?"
+_INSERT_QUERY = "INSERT INTO tasks (title, description, status, due_date) VALUES (?, ?, ?, ?)"
+_BUMP_VERSION_QUERY = """
+    UPDATE table_versions SET version = version + 1, updated_at = datetime('now', 'localtime')
+    WHERE table_name = 'tasks'
+"""
+_INSERT_MANY_QUERY = "INSERT INTO tasks (title, description, status, due_date) VALUES {} RETURNING id"
+_DELETE_MANY_QUERY = "DELETE FROM tasks WHERE id IN ({})"
+_SELECT_STATE_QUERY = "SELECT status, due_date FROM tasks WHERE id = ?"
+# updated_at é gravado pelos próprios UPDATEs (o MySQL faz isso com ON UPDATE),
+# assim o RETURNING de update_fields já devolve a linha final
+_UPDATE_QUERY = """
+    UPDATE tasks
+    SET title = ?, description = ?, status = ?, due_date = ?,
+        updated_at = datetime('now', 'localtime')
+    WHERE id = ?
+"""
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Backend SQLite em modo WAL
+
+    Cada thread usa sua própria conexão: no WAL leitores não bloqueiam o
+    escritor nem uns aos outros, e as escritas são serializadas pelo próprio
+    SQLite (BEGIN IMMEDIATE + busy_timeout) em vez de um lock na aplicação.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path, synchronous='NORMAL', cache_size_kb=16384,
+                 mmap_size=256 * 1024 * 1024, busy_timeout=5000,
+                 cached_statements=256, chunk_size=500):
+        """
+        Args:
+            path (str): Arquivo do banco (criado se não existir)
+            synchronous (str): NORMAL no WAL só perde as últimas transações em
+                queda de energia, nunca corrompe; FULL faz fsync a cada commit
+            cache_size_kb (int): Cache de páginas por conexão
+            mmap_size (int): Bytes do arquivo lidos por mmap, sem cópia extra
+            busy_timeout (int): Milissegundos esperando o lock de escrita
+            cached_statements (int): Statements compilados guardados por conexão
+            chunk_size (int): IDs (ou linhas, no insert_many) por statement nas
+                operações em lote
+        Raises:
+            RuntimeError: Se o SQLite for anterior à 3.35 (sem RETURNING)
+        """
+        if sqlite3.sqlite_version_info < (3, 35):
+            raise RuntimeError(f"SQLite 3.35 ou superior é necessário (encontrado {sqlite3.sqlite_version})")
+
+        self.path = path
+        self.synchronous = synchronous.upper()
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self.chunk_size = chunk_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+        connection = self._connection()
+        # O modo WAL fica gravado no arquivo; basta ativar uma vez
+        self.journal_mode = connection.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        connection.executescript(_SCHEMA)
+        self.supports_search = self._create_search_index(connection)
+
+    @staticmethod
+    def _create_search_index(connection):
+        """
+        Cria o índice FTS5 se ainda não existir (o rebuild indexa as tarefas
+        já gravadas)
+
+        Returns:
+            bool: False se o SQLite foi compilado sem FTS5
+        """
+        exists = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            connection.executescript(f"BEGIN IMMEDIATE; {_SEARCH_SCHEMA} COMMIT;")
+        except sqlite3.OperationalError:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            return False
+        return True
+
+    def _connect(self):
+        connection = sqlite3.connect(
+            self.path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            # Sem transações implícitas: cada statement confirma sozinho e os
+            # lotes abrem BEGIN IMMEDIATE explicitamente
+            isolation_level=None,
+            check_same_thread=False,
+            timeout=self.busy_timeout / 1000,
+            cached_statements=self.cached_statements
+        )
+        connection.execute(f"PRAGMA synchronous = {self.synchronous}")
+        connection.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+        connection.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        connection.execute("PRAGMA temp_store = MEMORY")
+        connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        return connection
+
+    def _connection(self):
+        """
+        Returns:
+            sqlite3.Connection: Conexão da thread atual, aberta na primeira chamada
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _write_transaction(self, work):
+        """
+        Executa work(connection) em uma transação de escrita
+
+        BEGIN IMMEDIATE reserva o lock de escrita logo no início, então a
+        transação nunca falha no meio por disputa com outro escritor.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(connection)
+            connection.execute("COMMIT")
+            return result
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def get_table_version(self):
+        return self._connection().execute(
+            "SELECT version, updated_at FROM table_versions WHERE table_name = 'tasks'"
+        ).fetchone()
+
+    def get_row(self, task_id):
+        return self._connection().execute(_SELECT_BY_ID_QUERY, (task_id,)).fetchone()
+
+    def list_rows(self, limit, after=None, status=None, due_from=None, due_to=None):
+        where, params = build_list_filters(after, status, due_from, due_to, placeholder='?')
+        params.append(limit)
+        return self._connection().execute(
+            f"SELECT {SELECT_COLUMNS} FROM tasks {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            params
+        ).fetchall()
+
+    def stream_rows(self, after=None, status=None, due_from=None, due_to=None, batch_size=500):
+        """
+        Usa uma conexão própria: o gerador pode ser consumido por outras
+        threads (motor asyncio) e, no WAL, lê um snapshot estável enquanto as
+        escritas continuam
+        """
+        where, params = build_list_filters(after, status, due_from, due_to, placeholder='?')
+        connection = self._connect()
+        try:
+            cursor = connection.execute(
+                f"SELECT {SELECT_COLUMNS} FROM tasks {where} ORDER BY created_at DESC, id DESC",
+                params
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            connection.close()
+
+    def insert(self, title, description, status, due_date):
+        def work(connection):
+            task_id = connection.execute(_INSERT_QUERY, (title, description, status, due_date)).lastrowid
+            self._bump_version(connection, True)
+            return task_id
+        return self._write_transaction(work)
+
+    def update(self, task_id, title, description, status, due_date):
+        def work(connection):
+            previous = connection.execute(_SELECT_STATE_QUERY, (task_id,)).fetchone()
+            if previous is not None:
+                connection.execute(_UPDATE_QUERY, (title, description, status, due_date, task_id))
+                self._bump_version(connection, True)
+            return previous
+        return self._write_transaction(work)
+
+    def update_fields(self, task_id, fields):
+        def work(connection):
+            result = self._update_fields(connection, task_id, fields)
+            self._bump_version(connection, result)
+            return result
+        return self._write_transaction(work)
+
+    @staticmethod
+    def _update_fields(connection, task_id, fields):
+        # O RETURNING só enxerga a linha nova: o estado anterior é lido antes,
+        # na mesma transação (BEGIN IMMEDIATE já reservou a escrita)
+        previous = connection.execute(_SELECT_STATE_QUERY, (task_id,)).fetchone()
+        if previous is None:
+            return None
+        columns = sorted(fields)
+        assignments = ''.join(f"{column} = ?, " for column in columns)
+        params = [fields[column] for column in columns]
+        params.append(task_id)
+        # O RETURNING precisa ser lido até o fim para o statement concluir
+        rows = connection.execute(
+            f"UPDATE tasks SET {assignments}updated_at = datetime('now', 'localtime') "
+            f"WHERE id = ? RETURNING {SELECT_COLUMNS}",
+            params
+        ).fetchall()
+        return rows[0], previous
+
+    def delete(self, task_id):
+        def work(connection):
+            rows = connection.execute(
+                "DELETE FROM tasks WHERE id = ? RETURNING status, due_date", (task_id,)
+            ).fetchall()
+            self._bump_version(connection, rows)
+            return rows[0] if rows else None
+        return self._write_transaction(work)
+
+    def insert_many(self, rows):
+        # O commit único no final evita um fsync por linha
+        def work(connection):
+            ids = self._insert_rows(connection, rows)
+            self._bump_version(connection, ids)
+            return ids
+        return self._write_transaction(work)
+
+    def _insert_rows(self, connection, rows):
+        """
+        Um INSERT de várias linhas por bloco de chunk_size; os triggers do FTS5
+        custam bem menos por linha assim do que com um INSERT por linha
+
+        Returns:
+            list: IDs na ordem das linhas
+        """
+        ids = []
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start:start + self.chunk_size]
+            query = _INSERT_MANY_QUERY.format(', '.join(['(?, ?, ?, ?)'] * len(chunk)))
+            # A ordem do RETURNING não é garantida, mas cada linha recebe o maior
+            # rowid + 1: os IDs crescem na ordem das linhas do VALUES
+            ids.extend(sorted(row[0] for row in connection.execute(
+                query, [value for row in chunk for value in row]
+            )))
+        return ids
+
+    def write_batch(self, inserts, updates, deletes):
+        def work(connection):
+            ids = self._insert_rows(connection, inserts)
+            updated = {task_id: self._update_fields(connection, task_id, fields)
+                       for task_id, fields in updates.items()}
+            deleted = self._bulk_apply(connection, list(deletes), _DELETE_MANY_QUERY)
+            changed = ids or deleted or any(result is not None for result in updated.values())
+            self._bump_version(connection, changed)
+            return ids, updated, deleted
+        return self._write_transaction(work)
+
+    def complete_many(self, task_ids):
+        return self._bulk_write(
+            task_ids,
+            "UPDATE tasks SET status = 'concluída', updated_at = datetime('now', 'localtime') "
+            "WHERE id IN ({})"
+        )
+
+    def delete_many(self, task_ids):
+        return self._bulk_write(task_ids, _DELETE_MANY_QUERY)
+
+    def _bulk_write(self, task_ids, write_query):
+        """
+        Aplica o UPDATE/DELETE por blocos de IDs em uma única transação
+        """
+        def work(connection):
+            found = self._bulk_apply(connection, task_ids, write_query)
+            self._bump_version(connection, found)
+            return found
+        return self._write_transaction(work)
+
+    def _bulk_apply(self, connection, task_ids, write_query):
+        """
+        Returns:
+            dict: ID → (status, vencimento) anteriores das linhas afetadas,
+                lidos na mesma transação antes da escrita
+        """
+        found = {}
+        for start in range(0, len(task_ids), self.chunk_size):
+            chunk = task_ids[start:start + self.chunk_size]
+            placeholders = ', '.join('?' * len(chunk))
+            rows = connection.execute(
+                f"SELECT id, status, due_date FROM tasks WHERE id IN ({placeholders})", chunk
+            ).fetchall()
+            if rows:
+                connection.execute(write_query.format(', '.join('?' * len(rows))), [row[0] for row in rows])
+                found.update((task_id, (status, due_date)) for task_id, status, due_date in rows)
+        return found
+
+    @staticmethod
+    def _bump_version(connection, changed):
+        """
+        Incrementa a versão da tabela uma vez na transação, se algo mudou
+        """
+        if changed:
+            connection.execute(_BUMP_VERSION_QUERY)
+
+    def search(self, query, limit, offset=0):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Cada termo entre aspas: o texto do usuário nunca vira sintaxe do FTS5
+        expression = ' OR '.join(f'"{term}"' for term in terms)
+        rows = self._connection().execute(
+            f"""
+            SELECT {', '.join('tasks.' + column for column in SELECT_COLUMNS.split(', '))},
+                   -bm25(tasks_fts, 2.0, 1.0) AS score
+            FROM tasks_fts
+            JOIN tasks ON tasks.id = tasks_fts.rowid
+            WHERE tasks_fts MATCH ?
+            ORDER BY score DESC, tasks.id DESC
+            LIMIT ? OFFSET ?
+            """,
+            (expression, limit, offset)
+        ).fetchall()
+        return [(row[:-1], row[-1]) for row in rows]
+
+    def count_by_status_and_due_day(self):
+        rows = self._connection().execute(
+            "SELECT status, DATE(due_date) AS due_day, COUNT(*) FROM tasks GROUP BY status, due_day"
+        ).fetchall()
+        # DATE() devolve texto: a coluna calculada não passa pelos conversores
+        return [(status, date.fromisoformat(due_day) if due_day else None, count)
+                for status, due_day, count in rows]
+
+    def stats(self):
+        with self._lock:
+            connections = len(self._connections)
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'sqlite_version': sqlite3.sqlite_version,
+            'journal_mode': self.journal_mode,
+            'synchronous': self.synchronous,
+            'full_text_search': self.supports_search,
+            'connections': connections
+        }
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                # Atualiza as estatísticas do planejador antes de fechar
+                connection.execute("PRAGMA optimize")
+                connection.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
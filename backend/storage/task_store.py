@@ -0,0 +1,79 @@
+"""
+Backend de armazenamento das tarefas escolhido pelo .env
+O módulo do MySQL só é importado quando selecionado, então os backends
+embutidos funcionam sem o mysql.connector instalado
+"""
+
+import os
+from pathlib import Path
+from config import load_env_file
+from observability.metrics import metrics, span
+from storage.base import InstrumentedStorage
+from storage.write_behind import WriteBehindStorage
+
+STORAGE_BACKENDS = ('mysql', 'sqlite', 'memory')
+
+
+def get_storage_config():
+    load_env_file()
+
+    path = Path(os.getenv('SQLITE_PATH', 'agenda_tarefas.db'))
+    if not path.is_absolute():
+        # Relativo à pasta backend/, como o .env
+        path = Path(__file__).parent.parent / path
+
+    return {
+        'backend': os.getenv('STORAGE_BACKEND', 'mysql').lower(),
+        'sqlite': {
+            'path': str(path),
+            'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+            'cache_size_kb': int(os.getenv('SQLITE_CACHE_SIZE_KB', '16384')),
+            'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+            'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000'))
+        },
+        'write_behind': os.getenv('WRITE_BEHIND_ENABLED', 'false').lower() in ('1', 'true', 'yes'),
+        'write_behind_options': {
+            'durability': os.getenv('WRITE_BEHIND_DURABILITY', 'commit').lower(),
+            'batch_size': int(os.getenv('WRITE_BEHIND_BATCH_SIZE', '256')),
+            'flush_interval': float(os.getenv('WRITE_BEHIND_FLUSH_INTERVAL', '0.005')),
+            'write_timeout': float(os.getenv('WRITE_BEHIND_TIMEOUT', '30'))
+        }
+    }
+
+
+def create_storage(backend=None):
+    """
+    Cria o backend de armazenamento, medido pelas métricas quando ativas e
+    com as escritas agrupadas quando WRITE_BEHIND_ENABLED
+
+    Args:
+        backend (str): mysql, sqlite ou memory (padrão: STORAGE_BACKEND do .env)
+    Returns:
+        StorageBackend: Backend pronto para uso
+    Raises:
+        ValueError: Se o backend não existir
+    """
+    config = get_storage_config()
+    backend = (backend or config['backend']).lower()
+
+    if backend == 'mysql':
+        from storage.mysql_storage import MySQLStorage
+        storage = MySQLStorage()
+    elif backend == 'sqlite':
+        from storage.sqlite_storage import SQLiteStorage
+        storage = SQLiteStorage(**config['sqlite'])
+    elif backend == 'memory':
+        from storage.memory_storage import MemoryStorage
+        storage = MemoryStorage()
+    else:
+        raise ValueError(f"Backend de armazenamento inválido: {backend} "
+                         f"(use {', '.join(STORAGE_BACKENDS)})")
+
+    if metrics.enabled:
+        storage = InstrumentedStorage(storage, span)
+    if config['write_behind']:
+        storage = WriteBehindStorage(storage, **config['write_behind_options'])
+    return storage
+
+
+task_store = create_storage()
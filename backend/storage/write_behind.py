@@ -0,0 +1,390 @@
+"""
+Escrita adiada (write-behind) das tarefas
+As escritas individuais entram em uma fila e uma thread as grava em lotes,
+uma transação por lote: o custo do commit (fsync) é dividido pelo lote
+"""
+
+import atexit
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from observability.log import logger
+
+DURABILITY_MODES = ('commit', 'enqueue')
+
+# Posição de cada coluna alterável na linha (ordem de TASK_COLUMNS)
+_COLUMN_INDEX = {'title': 1, 'description': 2, 'status': 3, 'due_date': 5}
+
+
+class WriteBehindStorage:
+    """
+    Envolve um StorageBackend agrupando insert, update, update_fields e delete
+
+    Alterações seguidas da mesma tarefa na fila viram um único UPDATE. O lote
+    é gravado quando junta batch_size escritas ou quando a mais antiga espera
+    flush_interval segundos.
+
+    Durabilidade:
+    - 'commit': quem escreve espera o commit do lote; nada muda para quem lê
+    - 'enqueue': alterações e remoções respondem ao entrar na fila, com a
+      linha resultante calculada na hora. get_row já enxerga a fila, mas
+      listagens e buscas só depois da gravação, e escritas na fila se perdem
+      se o processo morrer antes dela. Inserções sempre esperam o commit,
+      porque o ID vem do banco.
+
+    As operações em lote (insert_many, complete_many, delete_many) já são
+    uma transação: esvaziam a fila e seguem direto para o backend.
+
+    Quando várias alterações da mesma tarefa viram um único UPDATE, só a
+    primeira recebe o estado anterior real; as seguintes recebem o estado
+    final como anterior, para que task_stats conte a diferença uma única vez.
+    """
+
+    def __init__(self, backend, durability='commit', batch_size=256, flush_interval=0.005,
+                 write_timeout=30):
+        """
+        Args:
+            backend (StorageBackend): Backend real
+            durability (str): 'commit' ou 'enqueue'
+            batch_size (int): Escritas na fila que disparam a gravação imediata
+            flush_interval (float): Espera máxima, em segundos, de uma escrita na fila
+            write_timeout (float): Espera máxima, em segundos, de quem aguarda o
+                commit; uma thread de gravação travada não segura requisições para sempre
+        Raises:
+            ValueError: Se a durabilidade for desconhecida
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Durabilidade inválida: {durability} (use {', '.join(DURABILITY_MODES)})")
+
+        self.backend = backend
+        self.durability = durability
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.write_timeout = write_timeout
+
+        self._lock = threading.Lock()
+        self._drained = threading.Condition(self._lock)
+        # Fila ficou não vazia / lote completo (ou flush pedido)
+        self._wake = threading.Event()
+        self._full = threading.Event()
+        self._inserts = []
+        # ID → [colunas acumuladas, futures de quem espera]
+        self._updates = {}
+        # ID → futures de quem espera
+        self._deletes = {}
+        self._first_enqueued = None
+        self._applying = False
+        self._stopping = False
+        # Modo enqueue: ID → (sequência, linha ou None se removida) ainda não gravada
+        self._overlay = {}
+        self._sequence = 0
+        self._commit_hooks = []
+        self._counters = {
+            'batches': 0,
+            'writes': 0,
+            'coalesced': 0,
+            'failed': 0,
+            'fallbacks': 0
+        }
+
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def on_commit(self, hook):
+        """
+        Registra hook(task_ids), chamado depois de cada lote com os IDs das
+        alterações e remoções que ninguém esperava (modo enqueue)
+
+        Quem respondeu ao entrar na fila invalidou o cache antes do commit;
+        uma leitura do backend feita nesse intervalo pode ter guardado o dado
+        antigo. O gancho roda também se o lote falhar, já que a sobreposição
+        em que a resposta se baseou deixa de existir.
+        """
+        with self._lock:
+            self._commit_hooks.append(hook)
+        return hook
+
+    def __getattr__(self, name):
+        # Leituras e o restante da interface seguem direto para o backend
+        return getattr(self.backend, name)
+
+    @property
+    def _pending(self):
+        return len(self._inserts) + len(self._updates) + len(self._deletes)
+
+    def get_row(self, task_id):
+        if self._overlay:
+            with self._lock:
+                entry = self._overlay.get(task_id)
+            if entry is not None:
+                return entry[1]
+        return self.backend.get_row(task_id)
+
+    def insert(self, title, description, status, due_date):
+        future = Future()
+        with self._lock:
+            self._inserts.append(((title, description, status, due_date), future))
+            self._enqueued()
+        return self._wait(future)
+
+    def update(self, task_id, title, description, status, due_date):
+        result = self.update_fields(task_id, {
+            'title': title, 'description': description, 'status': status, 'due_date': due_date
+        })
+        return result[1] if result else None
+
+    def update_fields(self, task_id, fields):
+        if self.durability == 'enqueue':
+            return self._update_on_enqueue(task_id, fields)
+
+        future = Future()
+        with self._lock:
+            if task_id in self._deletes:
+                # Já há uma remoção na fila, que será gravada antes
+                return None
+            self._queue_update(task_id, fields, future)
+        return self._wait(future)
+
+    def _update_on_enqueue(self, task_id, fields):
+        stored = self.get_row(task_id)
+        with self._lock:
+            entry = self._overlay.get(task_id)
+            # Outra escrita pode ter entrado na fila durante a leitura
+            row = entry[1] if entry is not None else stored
+            if row is None or task_id in self._deletes:
+                return None
+            previous = (row[3], row[5])
+            values = list(row)
+            for column, value in fields.items():
+                values[_COLUMN_INDEX[column]] = value
+            # Mesma resolução de segundos das colunas TIMESTAMP
+            values[6] = datetime.now().replace(microsecond=0)
+            row = tuple(values)
+            self._set_overlay(task_id, row)
+            self._queue_update(task_id, fields, None)
+        return row, previous
+
+    def _queue_update(self, task_id, fields, future):
+        pending = self._updates.get(task_id)
+        if pending is None:
+            pending = self._updates[task_id] = [{}, []]
+            self._enqueued()
+        else:
+            self._counters['coalesced'] += 1
+        pending[0].update(fields)
+        if future is not None:
+            pending[1].append(future)
+
+    def delete(self, task_id):
+        if self.durability == 'enqueue':
+            return self._delete_on_enqueue(task_id)
+
+        future = Future()
+        with self._lock:
+            if task_id in self._deletes:
+                return None
+            self._deletes[task_id] = [future]
+            self._enqueued()
+        return self._wait(future)
+
+    def _delete_on_enqueue(self, task_id):
+        stored = self.get_row(task_id)
+        with self._lock:
+            entry = self._overlay.get(task_id)
+            row = entry[1] if entry is not None else stored
+            if row is None or task_id in self._deletes:
+                return None
+            self._set_overlay(task_id, None)
+            self._deletes[task_id] = []
+            self._enqueued()
+        return row[3], row[5]
+
+    def _wait(self, future):
+        """
+        Espera o commit da escrita por até write_timeout segundos
+
+        Raises:
+            TimeoutError: Se o lote não foi gravado a tempo; a escrita continua
+                na fila e ainda pode ser gravada depois
+        """
+        try:
+            return future.result(timeout=self.write_timeout)
+        except FutureTimeoutError:
+            raise TimeoutError(f"Escrita adiada sem commit após {self.write_timeout}s") from None
+
+    def _set_overlay(self, task_id, row):
+        self._sequence += 1
+        self._overlay[task_id] = (self._sequence, row)
+
+    def _enqueued(self):
+        """
+        Chamado com o lock após cada escrita nova na fila
+        """
+        pending = self._pending
+        if pending == 1:
+            self._first_enqueued = time.monotonic()
+            self._wake.set()
+        if pending >= self.batch_size:
+            self._full.set()
+
+    def insert_many(self, rows):
+        self.flush()
+        return self.backend.insert_many(rows)
+
+    def complete_many(self, task_ids):
+        self.flush()
+        return self.backend.complete_many(task_ids)
+
+    def delete_many(self, task_ids):
+        self.flush()
+        return self.backend.delete_many(task_ids)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                waiting = self._pending
+                started = self._first_enqueued
+            if waiting and waiting < self.batch_size and not self._stopping:
+                # Espera o lote encher ou o intervalo vencer desde a primeira escrita
+                self._full.wait(max(0.0, started + self.flush_interval - time.monotonic()))
+            self._full.clear()
+
+            batch = self._take()
+            if batch is not None:
+                self._apply(*batch)
+            elif self._stopping:
+                return
+
+    def _take(self):
+        with self._lock:
+            if not self._pending:
+                return None
+            batch = (self._inserts, self._updates, self._deletes, dict(self._overlay))
+            self._inserts, self._updates, self._deletes = [], {}, {}
+            self._first_enqueued = None
+            self._applying = True
+            return batch
+
+    def _apply(self, inserts, updates, deletes, overlay):
+        try:
+            try:
+                ids, updated, deleted = self.backend.write_batch(
+                    [row for row, _ in inserts],
+                    {task_id: fields for task_id, (fields, _) in updates.items()},
+                    set(deletes)
+                )
+            except Exception as e:
+                # Uma escrita inválida não pode derrubar as outras do lote
+                logger.warning("Lote de escritas falhou; gravando uma a uma",
+                               writes=len(inserts) + len(updates) + len(deletes), error=str(e))
+                with self._lock:
+                    self._counters['fallbacks'] += 1
+                self._apply_each(inserts, updates, deletes)
+            else:
+                for (_, future), task_id in zip(inserts, ids):
+                    future.set_result(task_id)
+                for task_id, (_, futures) in updates.items():
+                    self._resolve_update(futures, updated.get(task_id))
+                for task_id, futures in deletes.items():
+                    for future in futures:
+                        future.set_result(deleted.get(task_id))
+        finally:
+            with self._lock:
+                # Só sai da sobreposição o que não foi alterado de novo enquanto gravava
+                for task_id, entry in overlay.items():
+                    if self._overlay.get(task_id) is entry and task_id not in self._updates \
+                            and task_id not in self._deletes:
+                        del self._overlay[task_id]
+                self._counters['batches'] += 1
+                self._counters['writes'] += len(inserts) + len(updates) + len(deletes)
+                self._applying = False
+                self._drained.notify_all()
+                hooks = list(self._commit_hooks)
+            unawaited = [task_id for task_id, (_, futures) in updates.items() if not futures]
+            unawaited.extend(task_id for task_id, futures in deletes.items() if not futures)
+            if unawaited:
+                for hook in hooks:
+                    try:
+                        hook(unawaited)
+                    except Exception as e:
+                        logger.error("Erro no gancho de commit da escrita adiada", error=str(e))
+
+    def _apply_each(self, inserts, updates, deletes):
+        operations = [([future], 'insert', row) for row, future in inserts]
+        operations.extend(
+            (futures, 'update_fields', (task_id, fields))
+            for task_id, (fields, futures) in updates.items()
+        )
+        operations.extend((futures, 'delete', (task_id,)) for task_id, futures in deletes.items())
+
+        for futures, operation, args in operations:
+            try:
+                result = getattr(self.backend, operation)(*args)
+            except Exception as e:
+                with self._lock:
+                    self._counters['failed'] += 1
+                if not futures:
+                    # Modo enqueue: ninguém espera pela resposta, então só o log registra
+                    logger.error("Escrita adiada perdida", operation=operation,
+                                 args=repr(args), error=str(e))
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            if operation == 'update_fields':
+                self._resolve_update(futures, result)
+            else:
+                for future in futures:
+                    future.set_result(result)
+
+    @staticmethod
+    def _resolve_update(futures, result):
+        """
+        Responde às alterações coalescidas em um UPDATE, na ordem em que entraram
+        """
+        for index, future in enumerate(futures):
+            if index and result is not None:
+                row = result[0]
+                future.set_result((row, (row[3], row[5])))
+            else:
+                future.set_result(result)
+
+    def flush(self, timeout=30):
+        """
+        Grava tudo o que está na fila e espera o commit
+
+        Returns:
+            bool: False se o tempo acabou antes
+        """
+        with self._lock:
+            if not self._pending and not self._applying:
+                return True
+        self._full.set()
+        self._wake.set()
+        with self._drained:
+            return self._drained.wait_for(lambda: not self._pending and not self._applying, timeout)
+
+    def close(self):
+        """
+        Grava a fila, encerra a thread e fecha o backend
+        """
+        if not self._stopping:
+            self.flush()
+            self._stopping = True
+            self._wake.set()
+            self._full.set()
+            self._thread.join(timeout=5)
+        self.backend.close()
+
+    def stats(self):
+        stats = self.backend.stats()
+        with self._lock:
+            write_behind = dict(self._counters)
+            write_behind['queued'] = self._pending
+        write_behind['durability'] = self.durability
+        write_behind['batch_size'] = self.batch_size
+        stats['write_behind'] = write_behind
+        return stats
@@ -0,0 +1,120 @@
+"""
+Importa e exporta tarefas direto no banco configurado no .env, sem passar pelo servidor
+
+Uso (a partir de backend/):
+    python task_transfer.py import tarefas.csv
+    python task_transfer.py import - --format ndjson < tarefas.ndjson
+    python task_transfer.py export tarefas.csv --status pendente
+    python task_transfer.py export - --format ndjson > tarefas.ndjson
+
+O formato vem da extensão do arquivo (.csv, .ndjson ou .jsonl) ou de --format.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from controllers.task_controller import STREAM_BATCH_SIZE, VALID_STATUSES
+from controllers.transfer_controller import (
+    IMPORT_BATCH_SIZE, TRANSFER_FORMATS, export_rows, import_records, parse_records
+)
+from models.task import Task
+from observability.log import logger
+from storage.task_store import task_store
+
+
+def _format_for(path, file_format):
+    if file_format:
+        return file_format
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return 'csv'
+    if suffix in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    raise SystemExit(f"Não foi possível deduzir o formato de {path}; use --format "
+                     f"({', '.join(TRANSFER_FORMATS)})")
+
+
+def _print_progress(report):
+    rate = report['processed'] / report['seconds'] if report['seconds'] else 0
+    print(f"\r{report['processed']} linhas lidas | {report['imported']} importadas | "
+          f"{report['failed']} com erro | {rate:,.0f} linhas/s", end='', file=sys.stderr, flush=True)
+
+
+def run_import(path, file_format, batch_size):
+    file_format = _format_for(path, file_format)
+    stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+    try:
+        report = import_records(parse_records(stream, file_format), batch_size, _print_progress)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+    _print_progress(report)
+    print(file=sys.stderr)
+    for error in report['errors']:
+        print(f"Linha {error['line']}: {error['message']}", file=sys.stderr)
+    if report['failed'] > len(report['errors']):
+        print(f"... e mais {report['failed'] - len(report['errors'])} linhas com erro", file=sys.stderr)
+    if report['aborted']:
+        print(f"Importação interrompida: {report['aborted']['message']}", file=sys.stderr)
+    print(f"{report['imported']} de {report['processed']} tarefas importadas em "
+          f"{report['seconds']}s", file=sys.stderr)
+    return 1 if report['failed'] or report['aborted'] else 0
+
+
+def run_export(path, file_format, status, due_from, due_to):
+    file_format = _format_for(path, file_format) if path != '-' else (file_format or 'ndjson')
+    batches = Task.stream_rows(status=status, due_from=due_from, due_to=due_to,
+                               batch_size=STREAM_BATCH_SIZE)
+    output = sys.stdout.buffer if path == '-' else open(path, 'wb')
+    exported = 0
+
+    def counted(batches):
+        nonlocal exported
+        for rows in batches:
+            exported += len(rows)
+            yield rows
+
+    try:
+        for chunk in export_rows(file_format, counted(batches)):
+            output.write(chunk)
+    finally:
+        if output is sys.stdout.buffer:
+            output.flush()
+        else:
+            output.close()
+    print(f"{exported} tarefas exportadas", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Importação e exportação de tarefas (CSV e NDJSON)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help='Importa tarefas de um arquivo')
+    importer.add_argument('path', help="Arquivo de entrada ('-' para a entrada padrão)")
+    importer.add_argument('--format', choices=TRANSFER_FORMATS)
+    importer.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+                          help=f'Tarefas por transação (padrão: {IMPORT_BATCH_SIZE})')
+
+    exporter = commands.add_parser('export', help='Exporta tarefas para um arquivo')
+    exporter.add_argument('path', help="Arquivo de saída ('-' para a saída padrão)")
+    exporter.add_argument('--format', choices=TRANSFER_FORMATS)
+    exporter.add_argument('--status', choices=VALID_STATUSES)
+    exporter.add_argument('--due-from', type=datetime.fromisoformat)
+    exporter.add_argument('--due-to', type=datetime.fromisoformat)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == 'import':
+            return run_import(args.path, args.format, max(1, args.batch_size))
+        return run_export(args.path, args.format, args.status, args.due_from, args.due_to)
+    finally:
+        # Grava a fila da escrita adiada e o que restar do log
+        task_store.close()
+        logger.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
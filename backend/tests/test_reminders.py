@@ -0,0 +1,66 @@
+"""
+Testes do agendador de lembretes (ReminderScheduler)
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+from reminders.scheduler import OVERDUE, PENDING, ReminderScheduler
+from reminders.sinks import QueueSink
+
+
+def _rows(*due_dates):
+    return [(task_id, f'tarefa {task_id}', '', PENDING, None, due_date)
+            for task_id, due_date in enumerate(due_dates, 1)]
+
+
+class ReminderSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.sink = QueueSink()
+        self.scheduler = ReminderScheduler(self.sink, lead_time=0)
+        self.addCleanup(self.scheduler.close)
+
+    def test_fires_overdue_for_loaded_and_scheduled_tasks(self):
+        soon = datetime.now() + timedelta(milliseconds=50)
+        self.scheduler.start(lambda due_from: iter([_rows(soon)]))
+        self.scheduler.schedule(2, 'nova', PENDING, soon)
+
+        fired = {self.sink.get(timeout=2)['task_id'], self.sink.get(timeout=2)['task_id']}
+        self.assertEqual(fired, {1, 2})
+        self.assertEqual(self.scheduler.stats()['fired'][OVERDUE], 2)
+
+    def test_failed_load_leaves_the_scheduler_stopped_and_closable(self):
+        def load_rows(due_from):
+            yield _rows(datetime.now() + timedelta(hours=1))
+            raise RuntimeError('banco fora')
+
+        with self.assertRaises(RuntimeError):
+            self.scheduler.start(load_rows)
+
+        self.assertFalse(self.scheduler.running)
+        self.assertEqual(self.scheduler.stats()['timers'], 0)
+        self.assertIsNone(self.scheduler._removed_while_loading)
+        # Escritas seguintes não são acompanhadas por um agendador parado
+        self.scheduler.schedule(7, 'depois', PENDING, datetime.now() + timedelta(hours=1))
+        self.assertEqual(self.scheduler.stats()['timers'], 0)
+        self.scheduler.close()
+
+    def test_close_during_load_does_not_start_the_thread(self):
+        def load_rows(due_from):
+            yield _rows(datetime.now() + timedelta(hours=1))
+            # Ctrl+C chega enquanto a carga ainda está em andamento
+            self.scheduler.close()
+            yield _rows(datetime.now() + timedelta(hours=2))
+
+        self.scheduler.start(load_rows)
+        self.assertFalse(self.scheduler.running)
+        self.assertIsNone(self.scheduler._thread)
+        self.assertEqual(self.scheduler.stats()['timers'], 0)
+
+    def test_close_before_start(self):
+        self.scheduler.close()
+        self.assertFalse(self.scheduler.running)
+
+
+if __name__ == '__main__':
+    unittest.main()
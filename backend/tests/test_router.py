@@ -0,0 +1,67 @@
+"""
+Testes do roteador em árvore de segmentos
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from serving.router import Router
+
+
+def _error(status_code, message):
+    return status_code, message, {}
+
+
+def _request(method, path):
+    return SimpleNamespace(method=method, path=path, route=None, params=None)
+
+
+class RouterTests(unittest.TestCase):
+    def setUp(self):
+        self.router = Router(_error)
+        self.router.add('GET', '/tasks', lambda request: (200, 'lista', {}))
+        self.router.add('GET', '/tasks/stats', lambda request: (200, 'stats', {}))
+        self.router.add('GET', '/tasks/<int:task_id>', lambda request, task_id: (200, task_id, {}))
+        self.router.add('DELETE', '/tasks/<int:task_id>', lambda request, task_id: (204, task_id, {}))
+        self.router.add('GET', '/tags/<name>', lambda request, name: (200, name, {}))
+
+    def test_static_and_typed_parameters(self):
+        self.assertEqual(self.router.dispatch(_request('GET', '/tasks')), (200, 'lista', {}))
+        self.assertEqual(self.router.dispatch(_request('GET', '/tasks/42')), (200, 42, {}))
+        self.assertEqual(self.router.dispatch(_request('GET', '/tags/casa')), (200, 'casa', {}))
+
+    def test_static_segment_wins_over_parameter(self):
+        self.assertEqual(self.router.dispatch(_request('GET', '/tasks/stats'))[1], 'stats')
+
+    def test_trailing_slash_resolves_to_the_same_route(self):
+        self.assertEqual(self.router.dispatch(_request('GET', '/tasks/7/'))[1], 7)
+
+    def test_invalid_int_parameter_is_not_found(self):
+        for path in ('/tasks/abc', '/tasks/-1', '/tasks/１２', '/tasks/1/2'):
+            with self.subTest(path=path):
+                self.assertEqual(self.router.dispatch(_request('GET', path))[0], 404)
+
+    def test_wrong_method_is_405_with_allow(self):
+        status_code, _, headers = self.router.dispatch(_request('POST', '/tasks/1'))
+        self.assertEqual(status_code, 405)
+        self.assertEqual(set(headers['Allow'].split(', ')), {'GET', 'DELETE'})
+
+    def test_middleware_order_global_then_route(self):
+        calls = []
+
+        def middleware(name):
+            def wrapper(request, call_next):
+                calls.append(name)
+                return call_next(request)
+            return wrapper
+
+        self.router.add('GET', '/ping', lambda request: (200, 'pong', {}), middleware=[middleware('rota')])
+        self.router.use(middleware('global'))
+        request = _request('GET', '/ping')
+        self.assertEqual(self.router.dispatch(request)[1], 'pong')
+        self.assertEqual(calls, ['global', 'rota'])
+        self.assertEqual(request.route.pattern, '/ping')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Testes das escritas de Task sobre o backend memory
+"""
+
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault('STORAGE_BACKEND', 'memory')
+os.environ.setdefault('WRITE_BEHIND_ENABLED', 'false')
+
+import models.task as task_module
+from models.task import Task
+from storage.memory_storage import MemoryStorage
+
+
+class TaskWriteTests(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStorage()
+        patcher = mock.patch.object(task_module, 'task_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        task_module.task_cache.clear()
+
+    def test_failed_bookkeeping_does_not_fail_a_committed_write(self):
+        failing = mock.Mock(side_effect=RuntimeError('falha no índice'))
+        with mock.patch.object(task_module.search_index, 'add', failing), \
+                mock.patch.object(task_module.search_index, 'remove', failing):
+            task = Task(title='salva', description='d')
+            self.assertTrue(task.save())
+            self.assertIsNotNone(Task.update_fields(task.id, {'title': 'editada'}))
+            self.assertTrue(Task.save_many([Task(title='lote')]))
+            self.assertTrue(Task.delete_by_id(task.id))
+
+        self.assertEqual(self.store.stats()['tasks'], 1)
+        self.assertEqual(failing.call_count, 4)
+
+    def test_search_without_shared_index_sees_writes_from_other_processes(self):
+        self.assertFalse(self.store.supports_search)
+        with mock.patch.object(task_module.search_index, 'enabled', False):
+            # Escrita de outro processo: vai direto ao banco, sem passar por Task
+            self.store.insert('Reunião de equipe', '', 'pendente', None)
+            tasks, _ = Task.search('reuniao', 10)
+            self.assertEqual([task.title for task in tasks], ['Reunião de equipe'])
+            self.store.insert('Reunião com cliente', '', 'pendente', None)
+            tasks, _ = Task.search('reuniao', 10)
+            self.assertEqual(len(tasks), 2)
+
+    def test_failed_write_is_reported(self):
+        with mock.patch.object(self.store, 'insert', side_effect=RuntimeError('banco fora')):
+            task = Task(title='perdida')
+            self.assertFalse(task.save())
+        self.assertEqual(self.store.stats()['tasks'], 0)
+
+
+class TaskPaginationTests(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStorage()
+        patcher = mock.patch.object(task_module, 'task_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        task_module.task_cache.clear()
+
+    def pages(self, limit, **filters):
+        after, pages = None, []
+        while True:
+            tasks, has_more = Task.get_page(limit, after, **filters)
+            pages.append([task.id for task in tasks])
+            if not has_more:
+                return pages
+            after = (tasks[-1].created_at, tasks[-1].id)
+
+    def test_cursor_walks_every_task_once_newest_first(self):
+        ids = [self.store.insert(f'tarefa {index}', '', 'pendente', None) for index in range(5)]
+        # Criadas no mesmo segundo: o ID desempata a ordem
+        self.assertEqual(self.pages(2), [ids[4:2:-1], ids[2:0:-1], ids[:1]])
+
+    def test_filter_and_writes_between_pages(self):
+        ids = [self.store.insert(f'tarefa {index}', '', 'pendente', None) for index in range(4)]
+        self.store.complete_many([ids[1]])
+        self.assertEqual(self.pages(10, status='pendente'), [[ids[3], ids[2], ids[0]]])
+
+        tasks, _ = Task.get_page(10, status='pendente')
+        self.assertEqual(len(tasks), 3)
+        Task.update_fields(ids[0], {'status': 'concluída'})
+        tasks, _ = Task.get_page(10, status='pendente')
+        self.assertEqual([task.id for task in tasks], [ids[3], ids[2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Testes do cache de tarefas (TaskCache sobre LRUCacheBackend)
+"""
+
+import unittest
+
+from cache.backends import LRUCacheBackend
+from cache.task_cache import TaskCache
+
+ROW = (1, 'tarefa', '', 'pendente', None, None, None)
+
+
+class TaskCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = TaskCache(LRUCacheBackend(max_entries=100), ttl=60)
+
+    def test_task_round_trip_and_invalidation(self):
+        self.cache.set_task(1, ROW, self.cache.read_token())
+        self.assertEqual(self.cache.get_task(1), ROW)
+        self.cache.invalidate_task(1)
+        self.assertIsNone(self.cache.get_task(1))
+
+    def test_read_started_before_a_write_is_not_stored(self):
+        token = self.cache.read_token()
+        self.cache.invalidate_task(1)
+        self.cache.set_task(1, ROW, token)
+        self.cache.set_page(('p',), [ROW], token)
+        self.assertIsNone(self.cache.get_task(1))
+        self.assertIsNone(self.cache.get_page(('p',)))
+
+    def test_any_write_invalidates_every_page(self):
+        self.cache.set_page((10, None), [ROW], self.cache.read_token())
+        self.cache.set_page((20, None), [ROW], self.cache.read_token())
+        self.assertEqual(self.cache.get_page((10, None)), [ROW])
+        self.cache.invalidate_tasks([99])
+        self.assertIsNone(self.cache.get_page((10, None)))
+        self.assertIsNone(self.cache.get_page((20, None)))
+
+    def test_disabled_cache_stores_nothing(self):
+        self.cache.enabled = False
+        self.cache.set_task(1, ROW, self.cache.read_token())
+        self.assertIsNone(self.cache.get_task(1))
+
+
+class LRUCacheBackendTests(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        backend = LRUCacheBackend(max_entries=2)
+        backend.set('a', 1, 60)
+        backend.set('b', 2, 60)
+        backend.get('a')
+        backend.set('c', 3, 60)
+        self.assertEqual(backend.get('a'), (True, 1))
+        self.assertEqual(backend.get('b'), (False, None))
+        self.assertEqual(backend.get('c'), (True, 3))
+
+    def test_expired_entry_is_a_miss(self):
+        backend = LRUCacheBackend()
+        backend.set('a', 1, -1)
+        self.assertEqual(backend.get('a'), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
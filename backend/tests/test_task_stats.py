@@ -0,0 +1,97 @@
+"""
+Testes das estatísticas de tarefas (TaskStats) sobre o backend memory
+"""
+
+import json
+import os
+import unittest
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault('STORAGE_BACKEND', 'memory')
+os.environ.setdefault('WRITE_BEHIND_ENABLED', 'false')
+
+from controllers.task_controller import TaskController
+from models.task_stats import COMPLETED, PENDING, TaskStats
+from storage.memory_storage import MemoryStorage
+
+
+class TaskStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStorage()
+        self.stats = TaskStats(reconcile_interval=3600)
+        self.now = datetime.now().replace(microsecond=0)
+
+    def tearDown(self):
+        self.store.close()
+
+    def load(self):
+        self.stats.ensure_loaded(
+            self.store.count_by_status_and_due_day,
+            lambda due_from, due_to: (
+                row[5]
+                for rows in self.store.stream_rows(status=PENDING, due_from=due_from, due_to=due_to)
+                for row in rows
+            )
+        )
+
+    def insert(self, due_date, status=PENDING):
+        self.store.insert('tarefa', '', status, due_date)
+        self.stats.apply(None, (status, due_date))
+
+    def test_overdue_counts_by_due_time_within_today(self):
+        self.load()
+        self.insert(self.now - timedelta(days=2))
+        self.insert(self.now - timedelta(seconds=1))
+        self.insert(self.now + timedelta(seconds=30))
+        self.insert(None)
+
+        stats = self.stats.snapshot(self.now)
+        self.assertEqual(stats['overdue'], 2)
+        self.assertEqual(stats['due_today'], 1)
+        self.assertEqual(stats['pending_without_due_date'], 1)
+
+        stats = self.stats.snapshot(self.now + timedelta(minutes=1))
+        self.assertEqual(stats['overdue'], 3)
+        self.assertEqual(stats['due_today'], 0)
+
+    def test_completing_a_task_removes_it_from_today(self):
+        self.load()
+        due_date = self.now + timedelta(seconds=30)
+        self.insert(due_date)
+        self.stats.apply((PENDING, due_date), (COMPLETED, due_date))
+
+        stats = self.stats.snapshot(self.now)
+        self.assertEqual(stats['due_today'], 0)
+        self.assertEqual(stats['by_status'], {PENDING: 0, COMPLETED: 1})
+
+    def test_timezone_aware_due_dates_are_counted_as_local_time(self):
+        self.load()
+        aware = (self.now + timedelta(seconds=30)).astimezone(timezone.utc)
+        self.insert(aware)
+        self.insert(self.now + timedelta(seconds=60))
+
+        stats = self.stats.snapshot(self.now)
+        self.assertEqual(stats['total'], 2)
+        self.assertEqual(stats['due_today'], 2)
+        self.stats.apply((PENDING, aware), None)
+        self.assertEqual(self.stats.snapshot(self.now)['due_today'], 1)
+
+
+class TaskStatsControllerTests(unittest.TestCase):
+    def test_utc_due_date_does_not_break_creation_or_stats(self):
+        self.assertEqual(TaskController.get_task_stats()[0], 200)
+        due_date = (datetime.now(timezone.utc) + timedelta(seconds=30)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        status_code, body, _ = TaskController.create_task({'title': 'UTC', 'due_date': due_date})
+        self.assertEqual(status_code, 201, body)
+        task_id = json.loads(body)['data']['id']
+        status_code, body, _ = TaskController.update_task(task_id, {'due_date': due_date})
+        self.assertEqual(status_code, 200, body)
+
+        status_code, body, _ = TaskController.get_task_stats()
+        self.assertEqual(status_code, 200, body)
+        TaskController.delete_task(task_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
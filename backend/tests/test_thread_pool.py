@@ -0,0 +1,111 @@
+"""
+Testes do servidor com pool de workers (BoundedThreadPoolHTTPServer)
+"""
+
+import os
+import socket
+import threading
+import time
+import unittest
+
+os.environ.setdefault('STORAGE_BACKEND', 'memory')
+os.environ.setdefault('WRITE_BEHIND_ENABLED', 'false')
+
+from server import TaskAPIHandler
+from serving.thread_pool import BoundedThreadPoolHTTPServer
+
+REQUEST = b'GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n'
+
+
+class _GatedApplication:
+    """
+    Segura cada requisição até o teste liberar
+    """
+
+    def __init__(self, application):
+        self.application = application
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def handle(self, request):
+        self.entered.set()
+        self.release.wait(5)
+        return self.application.handle(request)
+
+    def __getattr__(self, name):
+        return getattr(self.application, name)
+
+
+class ThreadPoolServerTests(unittest.TestCase):
+    def setUp(self):
+        self.gate = _GatedApplication(TaskAPIHandler.application)
+        handler = type('GatedHandler', (TaskAPIHandler,), {'application': self.gate})
+        self.server = BoundedThreadPoolHTTPServer(('127.0.0.1', 0), handler, workers=1,
+                                                  queue_size=1, drain_timeout=2)
+        self.address = self.server.server_address
+        thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05},
+                                  daemon=True)
+        thread.start()
+        self.addCleanup(self._stop, thread)
+
+    def _stop(self, thread):
+        self.gate.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+        thread.join(5)
+
+    def connect(self):
+        connection = socket.create_connection(self.address, timeout=5)
+        self.addCleanup(connection.close)
+        return connection
+
+    def read_response(self, connection):
+        data = b''
+        while b'\r\n\r\n' not in data:
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+    def wait_until(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_keep_alive_connection_is_closed_when_others_are_waiting(self):
+        first = self.connect()
+        first.sendall(REQUEST)
+        self.assertTrue(self.gate.entered.wait(5))
+
+        second = self.connect()
+        self.wait_until(lambda: self.server.waiting)
+        second.sendall(REQUEST)
+        self.gate.release.set()
+
+        self.assertIn(b'Connection: close', self.read_response(first))
+        self.assertTrue(self.read_response(second).startswith(b'HTTP/1.1 200'))
+
+    def test_rejected_connection_receives_the_503(self):
+        busy = self.connect()
+        busy.sendall(REQUEST)
+        self.assertTrue(self.gate.entered.wait(5))
+        queued = self.connect()
+        self.wait_until(lambda: self.server.waiting)
+
+        rejected = self.connect()
+        rejected.sendall(REQUEST)
+        response = self.read_response(rejected)
+        self.assertTrue(response.startswith(b'HTTP/1.1 503'), response)
+        self.assertIn(b'Retry-After: ', response)
+        self.assertEqual(self.server.rejected_requests, 1)
+
+        queued.sendall(REQUEST)
+        self.gate.release.set()
+        self.assertTrue(self.read_response(busy).startswith(b'HTTP/1.1 200'))
+        self.assertTrue(self.read_response(queued).startswith(b'HTTP/1.1 200'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+"""
+Testes da escrita adiada (WriteBehindStorage) sobre os backends memory e sqlite
+
+Rodar a partir de backend/:
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Antes de importar models.task, que cria o task_store na importação
+os.environ.setdefault('STORAGE_BACKEND', 'memory')
+os.environ.setdefault('WRITE_BEHIND_ENABLED', 'false')
+
+import models.task as task_module
+from cache.task_cache import task_cache
+from models.task import Task
+from storage.memory_storage import MemoryStorage
+from storage.sqlite_storage import SQLiteStorage
+from storage.write_behind import WriteBehindStorage
+
+# Lotes só saem no flush(): nenhum teste depende do relógio da thread de fundo
+FLUSH_INTERVAL = 60
+BATCH_SIZE = 1000
+
+
+class WriteBehindTests:
+    """
+    Casos comuns; cada subclasse informa o backend em create_backend()
+    """
+
+    def create_backend(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.backend = self.create_backend()
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        if not self.stores:
+            self.backend.close()
+
+    def wrap(self, durability):
+        store = WriteBehindStorage(self.backend, durability=durability,
+                                   batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL)
+        self.stores.append(store)
+        return store
+
+    def insert(self, title='tarefa', status='pendente'):
+        return self.backend.insert(title, 'descrição', status, None)
+
+    def wait_queued(self, store, queued):
+        deadline = time.monotonic() + 5
+        while store.stats()['write_behind']['queued'] < queued:
+            self.assertLess(time.monotonic(), deadline, 'escritas não entraram na fila')
+            time.sleep(0.01)
+
+    def test_updates_to_the_same_task_are_coalesced(self):
+        task_id = self.insert()
+        store = self.wrap('commit')
+        results = {}
+
+        def update(name, fields):
+            results[name] = store.update_fields(task_id, fields)
+
+        first = threading.Thread(target=update, args=('title', {'title': 'novo título'}))
+        first.start()
+        self.wait_queued(store, 1)
+        second = threading.Thread(target=update, args=('status', {'status': 'concluída'}))
+        second.start()
+        deadline = time.monotonic() + 5
+        while store.stats()['write_behind']['coalesced'] < 1:
+            self.assertLess(time.monotonic(), deadline, 'alteração não foi coalescida')
+            time.sleep(0.01)
+
+        self.assertTrue(store.flush(timeout=5))
+        first.join(5)
+        second.join(5)
+
+        counters = store.stats()['write_behind']
+        self.assertEqual(counters['batches'], 1)
+        self.assertEqual(counters['writes'], 1)
+        row = self.backend.get_row(task_id)
+        self.assertEqual((row[1], row[3]), ('novo título', 'concluída'))
+        # Só a primeira alteração recebe o estado anterior real
+        first_row, first_previous = results['title']
+        second_row, second_previous = results['status']
+        self.assertEqual(first_previous, ('pendente', None))
+        self.assertEqual(second_previous, ('concluída', None))
+        self.assertEqual(first_row, second_row)
+
+    def test_delete_after_update_removes_the_task(self):
+        task_id = self.insert()
+        store = self.wrap('enqueue')
+
+        row, previous = store.update_fields(task_id, {'title': 'editada'})
+        self.assertEqual(row[1], 'editada')
+        self.assertEqual(previous, ('pendente', None))
+        self.assertEqual(store.delete(task_id), ('pendente', None))
+        self.assertIsNone(store.get_row(task_id))
+        # A tarefa já removida na fila não aceita outra escrita
+        self.assertIsNone(store.update_fields(task_id, {'title': 'de novo'}))
+        self.assertIsNone(store.delete(task_id))
+
+        self.assertTrue(store.flush(timeout=5))
+        self.assertIsNone(self.backend.get_row(task_id))
+        self.assertIsNone(store.get_row(task_id))
+        self.assertEqual(store.stats()['write_behind']['failed'], 0)
+
+    def test_failed_batch_falls_back_to_single_writes(self):
+        updated_id = self.insert()
+        deleted_id = self.insert()
+        store = self.wrap('enqueue')
+
+        store.update_fields(updated_id, {'title': 'editada'})
+        store.delete(deleted_id)
+        with mock.patch.object(self.backend, 'write_batch',
+                               side_effect=RuntimeError('lote recusado')):
+            self.assertTrue(store.flush(timeout=5))
+
+        counters = store.stats()['write_behind']
+        self.assertEqual(counters['fallbacks'], 1)
+        self.assertEqual(counters['failed'], 0)
+        self.assertEqual(self.backend.get_row(updated_id)[1], 'editada')
+        self.assertIsNone(self.backend.get_row(deleted_id))
+
+    def test_waiting_for_a_stalled_writer_times_out(self):
+        task_id = self.insert()
+        store = WriteBehindStorage(self.backend, durability='commit', batch_size=1,
+                                   flush_interval=0, write_timeout=0.2)
+        self.stores.append(store)
+        release = threading.Event()
+        write_batch = self.backend.write_batch
+
+        def stalled(*args):
+            release.wait(5)
+            return write_batch(*args)
+
+        with mock.patch.object(self.backend, 'write_batch', side_effect=stalled):
+            with self.assertRaises(TimeoutError):
+                store.update_fields(task_id, {'title': 'atrasada'})
+            release.set()
+            self.assertTrue(store.flush(timeout=5))
+        # A escrita seguiu na fila e foi gravada depois do timeout
+        self.assertEqual(self.backend.get_row(task_id)[1], 'atrasada')
+
+    def test_cache_and_list_are_consistent_after_flush(self):
+        task_id = self.insert('original')
+        store = self.wrap('enqueue')
+        store.on_commit(task_cache.invalidate_tasks)
+        task_cache.clear()
+
+        def titles():
+            tasks, _ = Task.get_page(10)
+            return [task.title for task in tasks]
+
+        with mock.patch.object(task_module, 'task_store', store):
+            self.assertEqual(titles(), ['original'])
+
+            Task.update_fields(task_id, {'title': 'editada'})
+            # A tarefa vem da sobreposição; a listagem lida do backend antes
+            # do commit ainda é a antiga e acaba em cache
+            self.assertEqual(Task.get_by_id(task_id).title, 'editada')
+            self.assertEqual(titles(), ['original'])
+
+            self.assertTrue(store.flush(timeout=5))
+            self.assertEqual(titles(), ['editada'])
+            self.assertEqual(Task.get_by_id(task_id).title, 'editada')
+
+            self.assertTrue(Task.delete_by_id(task_id))
+            self.assertIsNone(Task.get_by_id(task_id))
+            self.assertTrue(store.flush(timeout=5))
+            self.assertEqual(titles(), [])
+            self.assertIsNone(Task.get_by_id(task_id))
+
+
+class MemoryWriteBehindTests(WriteBehindTests, unittest.TestCase):
+    def create_backend(self):
+        return MemoryStorage()
+
+
+class SQLiteWriteBehindTests(WriteBehindTests, unittest.TestCase):
+    def create_backend(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        return SQLiteStorage(os.path.join(self.directory.name, 'tarefas.db'))
+
+    def test_invalid_write_fails_alone(self):
+        valid_id = self.insert()
+        invalid_id = self.insert()
+        store = self.wrap('enqueue')
+
+        store.update_fields(valid_id, {'title': 'editada'})
+        # Viola o CHECK de status: derruba o lote, não as outras escritas
+        store.update_fields(invalid_id, {'status': 'inexistente'})
+        self.assertTrue(store.flush(timeout=5))
+
+        counters = store.stats()['write_behind']
+        self.assertEqual(counters['fallbacks'], 1)
+        self.assertEqual(counters['failed'], 1)
+        self.assertEqual(self.backend.get_row(valid_id)[1], 'editada')
+        self.assertEqual(self.backend.get_row(invalid_id)[3], 'pendente')
+        # A sobreposição da escrita perdida deixa de valer
+        self.assertEqual(store.get_row(invalid_id)[3], 'pendente')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,10 +3,28 @@ import TaskList from './components/TaskList';
 import TaskForm from './components/TaskForm';
 import './App.css';
 
+// Aplica um evento de GET /tasks/changes à lista carregada
+const applyChanges = (current, { data, deleted }) => {
+  const removed = new Set(deleted);
+  const changed = new Map(data.map(task => [task.id, task]));
+  const known = new Set(current.map(task => task.id));
+  const oldest = current.length ? current[current.length - 1].created_at : null;
+  // Tarefas desconhecidas mais antigas que a lista são de páginas ainda não carregadas
+  const created = data
+    .filter(task => !known.has(task.id) && (!oldest || task.created_at >= oldest))
+    .sort((a, b) => (a.created_at < b.created_at ? 1 : -1));
+  const updated = current
+    .filter(task => !removed.has(task.id))
+    .map(task => changed.get(task.id) || task);
+  return [...created, ...updated];
+};
+
 function App() {
   const [tasks, setTasks] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   // Buscar tarefas da API
   const fetchTasks = async () => {
@@ -17,6 +35,7 @@ function App() {
       
       if (data.success) {
         setTasks(data.data);
+        setNextCursor(data.pagination ? data.pagination.next_cursor : null);
       } else {
         setError(data.message);
       }
@@ -27,11 +46,48 @@ function App() {
     }
   };
 
+  // Buscar a próxima página de tarefas
+  const fetchMoreTasks = async () => {
+    if (!nextCursor) return;
+
+    try {
+      setLoadingMore(true);
+      const response = await fetch(`http://localhost:8000/tasks?cursor=${encodeURIComponent(nextCursor)}`);
+      const data = await response.json();
+
+      if (data.success) {
+        setTasks([...tasks, ...data.data]);
+        setNextCursor(data.pagination.next_cursor);
+      } else {
+        setError(data.message);
+      }
+    } catch (err) {
+      setError('Erro ao carregar tarefas. Verifique se o backend está rodando.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Carregar tarefas ao montar o componente
   useEffect(() => {
     fetchTasks();
   }, []);
 
+  // Receber as alterações feitas em outras abas sem recarregar a lista
+  useEffect(() => {
+    const source = new EventSource('http://localhost:8000/tasks/changes');
+    let loaded = false;
+    source.addEventListener('changes', (event) => {
+      setTasks(current => applyChanges(current, JSON.parse(event.data)));
+    });
+    // O primeiro reset só informa a versão; os seguintes pedem recarga
+    source.addEventListener('reset', () => {
+      if (loaded) fetchTasks();
+      loaded = true;
+    });
+    return () => source.close();
+  }, []);
+
   // Adicionar nova tarefa
   const addTask = async (taskData) => {
     try {
@@ -46,7 +102,7 @@ function App() {
       const data = await response.json();
       
       if (data.success) {
-        setTasks([data.data, ...tasks]);
+        setTasks(current => [data.data, ...current.filter(task => task.id !== data.data.id)]);
         return { success: true, message: 'Tarefa criada com sucesso!' };
       } else {
         return { success: false, message: data.message };
@@ -165,6 +221,14 @@ function App() {
               onDeleteTask={deleteTask}
             />
           )}
+
+          {!loading && !error && nextCursor && (
+            <div className="load-more">
+              <button onClick={fetchMoreTasks} className="load-more-btn" disabled={loadingMore}>
+                {loadingMore ? 'Carregando...' : 'Carregar mais tarefas'}
+              </button>
+            </div>
+          )}
         </div>
       </main>
 
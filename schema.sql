@@ -13,9 +13,37 @@ CREATE TABLE IF NOT EXISTS tasks (
     status ENUM('pendente', 'concluída') DEFAULT 'pendente',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     due_date DATETIME,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    -- Índices da listagem paginada por cursor (ORDER BY created_at DESC, id DESC)
+    INDEX idx_tasks_created_id (created_at, id),
+    INDEX idx_tasks_status_created (status, created_at, id),
+    -- Índices dos filtros por intervalo de vencimento
+    INDEX idx_tasks_due_date (due_date),
+    INDEX idx_tasks_status_due (status, due_date),
+    -- Busca textual de GET /tasks/search (MATCH ... AGAINST)
+    FULLTEXT INDEX ft_tasks_title_description (title, description)
+);
+
+-- Para bancos criados antes dos índices acima, execute:
+-- ALTER TABLE tasks
+--     ADD INDEX idx_tasks_created_id (created_at, id),
+--     ADD INDEX idx_tasks_status_created (status, created_at, id),
+--     ADD INDEX idx_tasks_due_date (due_date),
+--     ADD INDEX idx_tasks_status_due (status, due_date),
+--     ADD FULLTEXT INDEX ft_tasks_title_description (title, description);
+
+-- Versão da tabela de tarefas, usada nas ETags de GET /tasks
+-- A aplicação incrementa o contador uma vez por escrita (ou por transação em
+-- lote), como último comando antes do commit, então saber se a listagem mudou
+-- custa uma leitura pela chave primária em vez de percorrer as tarefas
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
 
+INSERT IGNORE INTO table_versions (table_name) VALUES ('tasks');
+
 -- Inserir alguns dados de exemplo
 INSERT INTO tasks (title, description, status, due_date) VALUES
 ('Estudar React', 'Aprender os conceitos básicos do React JS', 'pendente', '2024-01-15 18:00:00'),